@@ -12,16 +12,13 @@ import re
 import json
 import subprocess
 import os
-import glob
-import tempfile
-import shutil
 import sys
 import asyncio
 from datetime import datetime
 from typing import List, Tuple, Optional
 from pathlib import Path
 from typing import Any, List, Optional, Tuple
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 # Note: Simplified to use only yt-dlp for reliable transcript extraction
 # youtube-transcript-api removed due to cloud server blocking issues
 from pathlib import Path
@@ -32,6 +29,18 @@ from src.youtube_transcript_server import resources
 from src.youtube_transcript_server import prompts
 # Import shared extraction functions
 from src.youtube_transcript_server import extraction
+from src.youtube_transcript_server.engines import get_engine, fetch_video_bundle
+from src.youtube_transcript_server.singleflight import coalesce
+from src.youtube_transcript_server.batch import iter_batch, parse_batch_urls
+# Shared extraction core: subtitle parser registry and deduplication
+from src.youtube_transcript_server.parsers import parse_subtitle_content, parse_subtitle_cues
+from src.youtube_transcript_server.dedup import deduplicate_transcript_lines, deduplicate_vtt_cues
+from src.youtube_transcript_server.cues import format_seconds, format_timestamp, parse_time, render_lines
+from src.youtube_transcript_server.pipeline import TranscriptPipeline, cues_in_range, pipeline_for
+from src.youtube_transcript_server.quality import quality_sidecar_path, save_quality_sidecar
+from src.youtube_transcript_server.search import (
+    DEFAULT_TOP_K, fuzzy_highlight_pattern, highlight_pattern, rank_passages
+)
 
 # Initialize FastMCP server
 mcp = FastMCP(
@@ -66,77 +75,14 @@ def check_ytdlp_available() -> bool:
         return False
 
 
-def deduplicate_transcript_lines(lines: List[str]) -> List[str]:
-    """Remove duplicate consecutive text while preserving timestamps.
-    
-    This fixes the common issue where YouTube auto-captions repeat the same text
-    across multiple timestamps as speech continues.
-    """
-    if not lines:
-        return lines
-    
-    deduplicated = []
-    last_clean_text = ""
-    last_words = set()
-    
-    for line in lines:
-        # Extract timestamp and text
-        if line.startswith('[') and ']' in line:
-            timestamp_end = line.find(']') + 1
-            timestamp = line[:timestamp_end]
-            text = line[timestamp_end:].strip()
-        else:
-            timestamp = ""
-            text = line.strip()
-        
-        if not text or text in ['[Music]', '[Applause]', '[Laughter]']:
-            continue
-            
-        # Clean text for comparison (remove extra spaces, normalize)
-        clean_text = ' '.join(text.split()).lower()
-        
-        # Skip if this is an exact duplicate of the last line
-        if clean_text == last_clean_text:
-            continue
-            
-        # Skip if this text is completely contained in the last text
-        # and last text is not a special caption
-        if last_clean_text and clean_text in last_clean_text and last_clean_text not in ['[Music]', '[Applause]', '[Laughter]']:
-            continue
-            
-        # Skip if the last text is completely contained in this text
-        # but this text is much longer (likely an extension)
-        if last_clean_text and last_clean_text in clean_text:
-            if len(clean_text) > len(last_clean_text) * 1.2:
-                # Replace the last entry with this longer version
-                if deduplicated:
-                    deduplicated[-1] = line
-                    last_clean_text = clean_text
-                    last_words = set(clean_text.split())
-                    continue
-        
-        # Advanced duplicate detection: check word overlap
-        current_words = set(clean_text.split())
-        if last_words and len(current_words) > 3:
-            # Calculate overlap percentage
-            overlap = len(current_words.intersection(last_words))
-            overlap_percentage = overlap / min(len(current_words), len(last_words))
-            
-            # If more than 80% word overlap and similar length, skip
-            if (overlap_percentage > 0.8 and 
-                abs(len(current_words) - len(last_words)) <= 2):
-                continue
-        
-        deduplicated.append(line)
-        last_clean_text = clean_text
-        last_words = current_words
-    
-    return deduplicated
-
+@coalesce(lambda video_url, language="en": ("vtt", extract_video_id(video_url), language))
+async def extract_transcript_ytdlp(video_url: str, language: str = "en") -> dict:
+    """Extract transcript using yt-dlp (reliable method that works on all environments).
 
-def extract_transcript_ytdlp(video_url: str, language: str = "en") -> dict:
-    """Extract transcript using yt-dlp (reliable method that works on all environments)."""
-    if not check_ytdlp_available():
+    Concurrent calls for the same video and language share one extraction.
+    """
+    engine = get_engine()
+    if not await engine.available():
         return {
             'method': 'yt-dlp',
             'success': False,
@@ -145,148 +91,38 @@ def extract_transcript_ytdlp(video_url: str, language: str = "en") -> dict:
             'available_languages': []
         }
     
-    temp_dir = None
     try:
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp(prefix="ytdlp_mcp_")
-        
-        # Download subtitles
-        cmd = [
-            'yt-dlp',
-            '--write-auto-subs',
-            '--write-subs', 
-            '--sub-lang', language,
-            '--sub-format', 'vtt',
-            '--skip-download',
-            '--output', f'{temp_dir}/%(title)s.%(ext)s',
-            video_url
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        
-        if result.returncode != 0:
-            # Try auto-generated subtitles only
-            cmd_auto = [
-                'yt-dlp',
-                '--write-auto-subs',
-                '--sub-lang', 'en',
-                '--sub-format', 'vtt',
-                '--skip-download',
-                '--output', f'{temp_dir}/%(title)s.%(ext)s',
-                video_url
-            ]
-            result = subprocess.run(cmd_auto, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode != 0:
-                return {
-                    'method': 'yt-dlp',
-                    'success': False,
-                    'error': f"yt-dlp failed: {result.stderr}",
-                    'lines': [],
-                    'available_languages': []
-                }
-        
-        # Find VTT files
-        vtt_files = glob.glob(f'{temp_dir}/*.{language}.vtt') or glob.glob(f'{temp_dir}/*.en.vtt')
-        
-        if not vtt_files:
-            return {
-                'method': 'yt-dlp',
-                'success': False,
-                'error': f"No VTT files found for language '{language}'",
-                'lines': [],
-                'available_languages': []
-            }
-        
-        vtt_file = vtt_files[0]
-        
-        # Read and parse VTT content
-        with open(vtt_file, 'r', encoding='utf-8') as f:
-            vtt_content = f.read()
-        
-        # Parse VTT content - EXACT SAME LOGIC AS youtube_to_mcp.py
-        lines = vtt_content.split('\n')
-        transcript_lines = []
-        
-        current_timestamp = None
-        current_text_lines = []
+        video_id = extract_video_id(video_url)
+        dedup_mode = "rolling" if settings.rolling_dedup else "standard"
+        cached = resources.get_cached_lines_result(video_id, language, "vtt", dedup_mode)
+        if cached is not None:
+            return cached
         
-        for line in lines:
-            line = line.strip()
-            
-            # Skip empty lines and VTT headers
-            if not line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-                # If we hit an empty line and have accumulated text, process the cue
-                if not line and current_timestamp and current_text_lines:
-                    # Join all text lines for this timestamp
-                    combined_text = ' '.join(current_text_lines)
-                    clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                    if clean_text:
-                        transcript_lines.append(f"{current_timestamp} {clean_text}")
-                    current_timestamp = None
-                    current_text_lines = []
-                continue
-            
-            # Check if line contains timestamp
-            if '-->' in line:
-                # Process any accumulated text from previous cue
-                if current_timestamp and current_text_lines:
-                    combined_text = ' '.join(current_text_lines)
-                    clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                    if clean_text:
-                        transcript_lines.append(f"{current_timestamp} {clean_text}")
-                
-                # Extract start time for our format
-                time_parts = line.split(' --> ')[0]
-                try:
-                    # Parse timestamp properly: HH:MM:SS.mmm format
-                    time_clean = time_parts.split('.')[0].split(':')
-                    if len(time_clean) >= 3:
-                        hours = int(time_clean[0])
-                        minutes = int(time_clean[1]) + (hours * 60)  # Convert hours to minutes
-                        seconds = int(time_clean[2])
-                        current_timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                    else:
-                        current_timestamp = "[00:00]"
-                except (ValueError, IndexError):
-                    current_timestamp = "[00:00]"
-                
-                current_text_lines = []
-                continue
-            
-            # Accumulate text lines for current timestamp
-            if current_timestamp:
-                current_text_lines.append(line)
+        # Fetch metadata and VTT subtitles in one pass (English is used when the language is missing)
+        bundle = await fetch_video_bundle(video_url, language, formats=['vtt'])
         
-        # Process any remaining cue at the end of file
-        if current_timestamp and current_text_lines:
-            combined_text = ' '.join(current_text_lines)
-            clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-            if clean_text:
-                transcript_lines.append(f"{current_timestamp} {clean_text}")
+        # Parse VTT content into cues - EXACT SAME LOGIC AS youtube_to_mcp.py
+        cues = parse_subtitle_cues(bundle['subtitles']['content'], 'vtt')
         
         # Apply deduplication to clean up the transcript
-        transcript_lines = deduplicate_transcript_lines(transcript_lines)
-        
-        # Try to detect available languages from the downloaded files
-        all_vtt_files = glob.glob(f'{temp_dir}/*.vtt')
-        available_languages = []
-        for vtt_file_path in all_vtt_files:
-            filename = os.path.basename(vtt_file_path)
-            if '.' in filename:
-                parts = filename.split('.')
-                if len(parts) >= 3:  # title.lang.vtt
-                    lang_part = parts[-2]
-                    available_languages.append(f"{lang_part} (auto)" if 'auto' in filename else lang_part)
+        cues = deduplicate_vtt_cues(cues, aggressive=True, rolling=settings.rolling_dedup)
         
-        return {
+        info = bundle['info']
+        # Later stages are memoized on the pipeline, which stays on the cache entry
+        pipeline = TranscriptPipeline(cues)
+        result = {
             'method': 'yt-dlp',
             'success': True,
             'language': language,
-            'lines': transcript_lines,
-            'line_count': len(transcript_lines),
-            'available_languages': list(set(available_languages)) if available_languages else ['en (auto)']
+            'cues': pipeline.raw,
+            'lines': pipeline.lines(),
+            'pipeline': pipeline,
+            'line_count': len(cues),
+            'available_languages': bundle['available_languages'] or ['en (auto)'],
+            'info': {key: info.get(key) for key in ('title', 'duration', 'duration_string', 'uploader')}
         }
+        resources.cache_transcript_lines(video_id, result, language, "vtt", dedup_mode)
+        return result
         
     except subprocess.TimeoutExpired:
         return {
@@ -304,13 +140,51 @@ def extract_transcript_ytdlp(video_url: str, language: str = "en") -> dict:
             'lines': [],
             'available_languages': []
         }
-    finally:
-        # Clean up
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
+
+
+async def get_transcript_result(video_url: str, video_id: str) -> dict:
+    """Get the cues of a transcript for tools that only read them (search, slicing).
+
+    Any cached variant of the transcript will do; yt-dlp only runs if none is cached.
+    """
+    result = resources.find_cached_lines_result(video_id)
+    if result is None:
+        result = await extract_transcript_ytdlp(video_url)
+    return result
+
+
+async def get_transcript_range(video_id: str, start: str, end: str) -> dict:
+    """Slice a transcript to the cues between two times (seconds, MM:SS or HH:MM:SS).
+
+    Raises:
+        ValueError: For invalid or empty ranges, untimed transcripts and failed extractions
+    """
+    start_seconds, end_seconds = parse_time(start), parse_time(end)
+    if end_seconds <= start_seconds:
+        raise ValueError(f"Range end ({end}) must be after its start ({start})")
+    
+    result = await get_transcript_result(f"https://www.youtube.com/watch?v={video_id}", video_id)
+    if not result['success']:
+        raise ValueError(f"Cannot load transcript: {result['error']}")
+    
+    pipeline = pipeline_for(result)
+    cues = cues_in_range(pipeline, int(start_seconds * 1000), int(end_seconds * 1000))
+    last = pipeline.raw[-1] if len(pipeline) else None
+    transcript_end = (last.end_ms or last.start_ms) / 1000 if last is not None else 0.0
+    length = end_seconds - start_seconds
+    next_range = f"{format_seconds(end_seconds)}-{format_seconds(end_seconds + length)}"
+    return {
+        "video_id": video_id,
+        "start": format_timestamp(start_seconds),
+        "end": format_timestamp(end_seconds),
+        "start_seconds": start_seconds,
+        "end_seconds": end_seconds,
+        "line_count": len(cues),
+        "total_lines": len(pipeline),
+        "transcript_end": format_timestamp(transcript_end),
+        "lines": render_lines(cues),
+        "next_range": f"transcripts://{video_id}/range/{next_range}" if end_seconds < transcript_end else None
+    }
 
 
 # ============================================================================
@@ -337,15 +211,18 @@ async def create_mcp_resource_from_transcript_v2(video_url: str, resource_name:
         if not resource_name:
             resource_name = f"transcript_{video_id}_enhanced"
         
-        resource_path = f"resources/transcripts/{resource_name}.md"
+        resource_path = settings.resource_dir / f"{resource_name}.md"
         os.makedirs(os.path.dirname(resource_path), exist_ok=True)
         
         # Save comprehensive markdown content
         with open(resource_path, 'w', encoding='utf-8') as f:
             f.write(result['markdown_content'])
         
-        # Add to cache and analysis history
-        resources.add_to_cache(video_id, result['plain_text'], result.get('language', 'en'))
+        # Store the quality report next to it so quality lookups don't need the transcript
+        save_quality_sidecar(quality_sidecar_path(resource_path.parent, video_id, extraction.QUALITY_REPORT_SCHEMA),
+                             extraction.build_quality_report(result), extraction.QUALITY_REPORT_SCHEMA)
+        
+        # Add to analysis history (the extraction pipeline already cached the transcript)
         resources.add_analysis_to_history("enhanced_mcp_resource_creation", video_url, resource_name)
         
         metadata = result.get('metadata', {})
@@ -384,22 +261,26 @@ async def get_transcript_quality_analysis(video_url: str) -> str:
         video_url: YouTube video URL
     """
     try:
-        result = await extraction.extract_enhanced_transcript(video_url, quality_analysis=True)
-        
-        if not result['success']:
-            return f"❌ Quality analysis failed: {result.get('error', 'Unknown error')}"
+        # Already-extracted videos are answered from the stored report
+        report = extraction.get_stored_quality_report(extract_video_id(video_url))
+        if report is None:
+            result = await extraction.extract_enhanced_transcript(video_url, quality_analysis=True)
+            
+            if not result['success']:
+                return f"❌ Quality analysis failed: {result.get('error', 'Unknown error')}"
+            
+            report = extraction.build_quality_report(result)
         
-        quality = result.get('quality_metrics', {})
-        metadata = result.get('metadata', {})
+        quality = report.get('quality_metrics', {})
         
         # Add to analysis history
         resources.add_analysis_to_history("quality_analysis", video_url, f"Score: {quality.get('quality_score', 0)}%")
         
         return f"""📊 Transcript Quality Analysis
 
-**Video:** {metadata.get('title', 'Unknown Title')}
-**Video ID:** {result['video_id']}
-**Extraction Method:** {result['method']}
+**Video:** {report.get('title', 'Unknown Title')}
+**Video ID:** {report['video_id']}
+**Extraction Method:** {report['method']}
 
 ## Quality Metrics
 
@@ -418,9 +299,9 @@ async def get_transcript_quality_analysis(video_url: str) -> str:
 
 ## Transcript Formats Available
 
-- **Raw Transcript:** {result['line_count']} timestamped lines
-- **Deduplicated:** {result['deduplicated_count']} lines  
-- **Plain Text Script:** {len(result['plain_text'])} characters
+- **Raw Transcript:** {report['line_count']} timestamped lines
+- **Deduplicated:** {report['deduplicated_count']} lines  
+- **Plain Text Script:** {report['plain_text_length']} characters
 
 ## Quality Assessment
 
@@ -440,6 +321,16 @@ async def get_transcript_quality_analysis(video_url: str) -> str:
 # TOOLS - Enhanced with caching and resource integration
 # ============================================================================
 
+def _format_transcript_response(video_id: str, video_url: str, result: dict) -> str:
+    """Format a successful extraction for display."""
+    full_transcript = "\n".join(result['lines'])
+    
+    response = f"Transcript for {video_url} (Language: {result['language']}):\n"
+    response += f"Available languages: {', '.join(result['available_languages'])}\n\n"
+    response += full_transcript
+    return response
+
+
 @mcp.tool()
 async def get_youtube_transcript(video_url: str, language: str = "en") -> str:
     """Get the transcript of a YouTube video.
@@ -455,20 +346,12 @@ async def get_youtube_transcript(video_url: str, language: str = "en") -> str:
         resources.add_analysis_to_history("transcript_extraction", video_url)
 
         # Use yt-dlp for reliable transcript extraction
-        result = extract_transcript_ytdlp(video_url, language)
+        result = await extract_transcript_ytdlp(video_url, language)
         
         if not result['success']:
             return f"❌ No transcript available for this video.\n\nPossible reasons:\n- Video has no captions/subtitles\n- Transcripts are disabled by the creator\n- Video is private/restricted\n- Geo-blocking restrictions\n\nError details: {result['error']}"
         
-        # Format the transcript for display
-        full_transcript = "\n".join(result['lines'])
-        
-        # Cache the transcript
-        resources.add_to_cache(video_id, full_transcript, result['language'])
-        
-        response = f"Transcript for {video_url} (Language: {result['language']}):\n"
-        response += f"Available languages: {', '.join(result['available_languages'])}\n\n"
-        response += full_transcript
+        response = _format_transcript_response(video_id, video_url, result)
         
         # Apply smart truncation for Claude Desktop's display limits
         return smart_truncate_output(response, video_url)
@@ -478,13 +361,21 @@ async def get_youtube_transcript(video_url: str, language: str = "en") -> str:
 
 
 @mcp.tool()
-async def search_transcript(video_url: str, query: str, context_lines: int = 2) -> str:
+async def search_transcript(video_url: str, query: str, context_lines: int = 2, top_k: int = DEFAULT_TOP_K,
+                            fuzzy: bool = False) -> str:
     """Search for specific content within a YouTube video transcript.
 
+    Matches are ranked by relevance (BM25 over each match's context window);
+    overlapping context windows are merged into one passage. Fuzzy mode also
+    finds misspelled words, as auto-generated captions often contain, and
+    ranks passages by similarity instead.
+
     Args:
         video_url: YouTube video URL
         query: Text to search for in the transcript
         context_lines: Number of lines before/after match to include (default: 2)
+        top_k: Maximum number of passages to return, most relevant first (default: 10)
+        fuzzy: Also match words within one or two edits of the query words (default: False)
     """
     try: 
         video_id = extract_video_id(video_url)
@@ -492,46 +383,84 @@ async def search_transcript(video_url: str, query: str, context_lines: int = 2)
         # Add to analysis history
         resources.add_analysis_to_history("transcript_search", video_url, query)
         
-        # Get transcript using yt-dlp
-        result = extract_transcript_ytdlp(video_url)
-        
+        result = await get_transcript_result(video_url, video_id)
         if not result['success']:
             return f"❌ Cannot search transcript: {result['error']}"
         
-        # Search for matches in the formatted transcript lines
-        matches = []
-        query_lower = query.lower()
-        transcript_lines = result['lines']
-        
-        for i, line in enumerate(transcript_lines):
-            if query_lower in line.lower():
-                # Get context lines
-                start_idx = max(0, i - context_lines)
-                end_idx = min(len(transcript_lines), i + context_lines + 1)
-                
-                context_lines_list = transcript_lines[start_idx:end_idx]
-                
-                # Highlight the match in the matching line
-                for j, context_line in enumerate(context_lines_list):
-                    if j == i - start_idx:  # This is the matching line
-                        # Case-insensitive replacement while preserving original case
-                        import re
-                        pattern = re.compile(re.escape(query), re.IGNORECASE)
-                        context_lines_list[j] = pattern.sub(f"**{query}**", context_line)
-                
-                matches.append("\n".join(context_lines_list))
-        
-        if matches:
-            response = f"Found {len(matches)} matches for '{query}' in {video_url}:\n\n"
-            response += "\n\n---\n\n".join(matches)
+        # Passages are ranked from the transcript's token index (built once per cached transcript)
+        pipeline = pipeline_for(result)
+        cues = pipeline.raw
+        match_count, passages = rank_passages(pipeline, query, context_lines, top_k, fuzzy=fuzzy)
+        # Case-insensitive highlighting that preserves the original case
+        pattern = fuzzy_highlight_pattern(pipeline, query) if fuzzy else highlight_pattern(query)
+        score_label = "similarity" if fuzzy else "relevance"
+        
+        sections = []
+        for passage in passages:
+            lines = render_lines(cues[passage['start']:passage['end']])
+            
+            # Highlight the matches in the matching lines
+            for i, score in zip(passage['matches'], passage['scores']):
+                j = i - passage['start']
+                lines[j] = pattern.sub(lambda match: f"**{match.group(0)}**", lines[j])
+                if fuzzy:
+                    lines[j] += f" _(similarity {score:.2f})_"
+            
+            count = len(passage['matches'])
+            heading = (f"### {cues[passage['matches'][0]].timestamp or 'Match'} "
+                       f"({score_label} {passage['score']:.2f}, {count} match{'es' if count != 1 else ''})")
+            sections.append(heading + "\n" + "\n".join(lines))
+        
+        if sections:
+            response = f"Found {match_count} matches for '{query}' in {video_url}"
+            response += f" (top {len(sections)} passage{'s' if len(sections) != 1 else ''} by {score_label}):\n\n"
+            response += "\n\n---\n\n".join(sections)
             return response
         else:
-            return f"No matches found for '{query}' in the video transcript."
+            hint = "" if fuzzy else " Try fuzzy=True to also find misspelled captions."
+            return f"No matches found for '{query}' in the video transcript.{hint}"
             
     except Exception as e:
         return f"Error searching transcript: {str(e)}"
 
 
+@mcp.tool()
+async def get_transcript_segment(video_url: str, start: str, end: str) -> str:
+    """Get the part of a YouTube video transcript between two times.
+
+    Use this to read long videos in exact slices instead of a truncated full
+    transcript. Slices are cut from the cached transcript.
+
+    Args:
+        video_url: YouTube video URL
+        start: Range start - seconds ("90"), MM:SS ("1:30") or HH:MM:SS
+        end: Range end (exclusive), in the same formats
+    """
+    try:
+        video_id = extract_video_id(video_url)
+        resources.add_analysis_to_history("transcript_segment", video_url, f"{start}-{end}")
+        
+        segment = await get_transcript_range(video_id, start, end)
+        header = f"Transcript segment {segment['start']}-{segment['end']} of {video_url}"
+        if not segment['lines']:
+            return (f"{header}: no lines in this range "
+                    f"(the transcript ends at {segment['transcript_end']}).")
+        
+        response = f"{header} ({segment['line_count']} of {segment['total_lines']} lines):\n\n"
+        response += "\n".join(segment['lines'])
+        if segment['next_range']:
+            next_start = segment['end_seconds']
+            next_end = next_start + (next_start - segment['start_seconds'])
+            response += (f"\n\nNext: get_transcript_segment(video_url, "
+                         f"\"{format_seconds(next_start)}\", \"{format_seconds(next_end)}\")")
+        return smart_truncate_output(response, video_url)
+        
+    except ValueError as e:
+        return f"❌ Invalid transcript segment request: {str(e)}"
+    except Exception as e:
+        return f"Error getting transcript segment: {str(e)}"
+
+
 # Include all the existing tools with enhanced tracking...
 @mcp.tool()
 async def get_youtube_transcript_ytdlp(video_url: str, language: str = "en") -> str:
@@ -550,37 +479,40 @@ async def get_youtube_transcript_ytdlp(video_url: str, language: str = "en") ->
         # Add to analysis history
         resources.add_analysis_to_history("transcript_extraction_ytdlp", video_url)
         
-        # Create temporary directory for downloads
-        temp_dir = tempfile.mkdtemp(prefix="ytdlp_enhanced_")
-        
-        try:
+        dedup_mode = "rolling" if settings.rolling_dedup else "standard"
+        cached = resources.get_cached_lines_result(video_id, language, "best", dedup_mode)
+        if cached is not None:
+            actual_format = cached['format']
+            transcript_lines = cached['lines']
+        else:
             # Use new fallback system: srv1 → json3 → ttml → vtt
-            subtitle_file, actual_format = download_subtitles_with_fallback(video_url, language, temp_dir)
+            subtitles = await get_engine().fetch_subtitles(video_url, language)
+            actual_format = subtitles['format']
             
             # Parse using the appropriate parser
-            transcript_lines = parse_subtitle_file(subtitle_file, actual_format)
+            cues = parse_subtitle_cues(subtitles['content'], actual_format)
             
             # Apply deduplication (mainly for VTT fallback)
             if actual_format == 'vtt':
-                transcript_lines = deduplicate_transcript_lines(transcript_lines)
+                cues = deduplicate_vtt_cues(cues, aggressive=True, rolling=settings.rolling_dedup)
             
+            pipeline = TranscriptPipeline(cues)
+            transcript_lines = pipeline.lines()
             if transcript_lines:
-                full_transcript = "\n".join(transcript_lines)
-                
-                # Cache the transcript
-                resources.add_to_cache(video_id, full_transcript, language)
-                
-                result = f"Transcript for {video_url} (via yt-dlp, Format: {actual_format.upper()}, Language: {language}):\n\n{full_transcript}"
-                
-                # Apply smart truncation for Claude Desktop's display limits
-                return smart_truncate_output(result, video_url)
-            else:
-                return f"❌ Could not parse transcript content from {actual_format.upper()} file"
-                
-        finally:
-            # Clean up temporary directory
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+                resources.cache_transcript_lines(
+                    video_id, {'format': actual_format, 'cues': cues, 'lines': transcript_lines, 'pipeline': pipeline},
+                    language, "best", dedup_mode
+                )
+        
+        if transcript_lines:
+            full_transcript = "\n".join(transcript_lines)
+            
+            result = f"Transcript for {video_url} (via yt-dlp, Format: {actual_format.upper()}, Language: {language}):\n\n{full_transcript}"
+            
+            # Apply smart truncation for Claude Desktop's display limits
+            return smart_truncate_output(result, video_url)
+        else:
+            return f"❌ Could not parse transcript content from {actual_format.upper()} file"
             
     except subprocess.TimeoutExpired:
         return f"❌ yt-dlp timed out while extracting subtitles"
@@ -930,6 +862,18 @@ async def get_transcript_sample_resource(video_id: str) -> dict:
     return await resources.get_transcript_sample(video_id)
 
 
+@mcp.resource("transcripts://{video_id}/range/{start}-{end}")
+async def get_transcript_range_resource(video_id: str, start: str, end: str) -> dict:
+    """Get the transcript lines between two times (seconds, MM:SS or HH:MM:SS)."""
+    try:
+        return await get_transcript_range(video_id, start, end)
+    except ValueError as e:
+        return {
+            "error": str(e),
+            "video_id": video_id
+        }
+
+
 @mcp.resource("analytics://history")
 async def get_analysis_history_resource() -> dict:
     """Get recent analysis history."""
@@ -1089,62 +1033,70 @@ async def get_supported_languages() -> str:
 # ============================================================================
 
 @mcp.tool()
-async def batch_extract_transcripts(video_urls: str, output_format: str = "mcp_resources") -> str:
+async def batch_extract_transcripts(video_urls: str, output_format: str = "mcp_resources", ctx: Context = None) -> str:
     """Extract transcripts from multiple YouTube videos and save as MCP resources.
 
+    Videos are processed concurrently (``BATCH_MAX_WORKERS`` at a time, each
+    limited to ``BATCH_VIDEO_TIMEOUT`` seconds) and listed in completion order.
+
     Args:
         video_urls: Comma-separated list of YouTube video URLs
         output_format: Output format - 'mcp_resources', 'markdown', 'json'
     """
     try:
-        urls = [url.strip() for url in video_urls.split(',') if url.strip()]
+        urls = parse_batch_urls(video_urls)
         
         if not urls:
             return "❌ No valid URLs provided"
         
-        if len(urls) > 10:
-            return "❌ Maximum of 10 videos allowed per batch"
+        if len(urls) > settings.batch_max_urls:
+            return f"❌ Maximum of {settings.batch_max_urls} videos allowed per batch"
+        
+        async def extract_one(video_url: str) -> Tuple[bool, str]:
+            video_id = extract_video_id(video_url)
+            
+            # Try both methods
+            transcript = await get_youtube_transcript(video_url)
+            
+            if "❌" in transcript:
+                # Fallback to yt-dlp
+                transcript = await get_youtube_transcript_ytdlp(video_url)
+            
+            if "❌" in transcript:
+                return False, f"❌ {video_id}: {transcript[:100]}..."
+            
+            # Save as MCP resource
+            if output_format == "mcp_resources":
+                resource_path = f"resources/transcripts/{video_id}.md"
+                os.makedirs(os.path.dirname(resource_path), exist_ok=True)
+                
+                with open(resource_path, 'w', encoding='utf-8') as f:
+                    f.write(f"# Transcript: {video_id}\n\n")
+                    f.write(f"**URL:** {video_url}\n\n")
+                    f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+                    f.write("## Transcript\n\n")
+                    f.write(transcript)
+                
+                return True, f"✅ {video_id}: Saved to {resource_path}"
+            return True, f"✅ {video_id}: Extracted successfully"
         
         results = []
         success_count = 0
+        started = datetime.now()
         
-        for i, video_url in enumerate(urls, 1):
-            try:
-                video_id = extract_video_id(video_url)
-                print(f"Processing video {i}/{len(urls)}: {video_id}")
-                
-                # Try both methods
-                transcript = await get_youtube_transcript(video_url)
-                
-                if "❌" in transcript:
-                    # Fallback to yt-dlp
-                    transcript = await get_youtube_transcript_ytdlp(video_url)
-                
-                if "❌" not in transcript:
-                    # Save as MCP resource
-                    if output_format == "mcp_resources":
-                        resource_path = f"resources/transcripts/{video_id}.md"
-                        os.makedirs(os.path.dirname(resource_path), exist_ok=True)
-                        
-                        with open(resource_path, 'w', encoding='utf-8') as f:
-                            f.write(f"# Transcript: {video_id}\n\n")
-                            f.write(f"**URL:** {video_url}\n\n")
-                            f.write(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                            f.write("## Transcript\n\n")
-                            f.write(transcript)
-                        
-                        results.append(f"✅ {video_id}: Saved to {resource_path}")
-                        success_count += 1
-                    else:
-                        results.append(f"✅ {video_id}: Extracted successfully")
-                        success_count += 1
-                else:
-                    results.append(f"❌ {video_id}: {transcript[:100]}...")
-                    
-            except Exception as e:
-                results.append(f"❌ {video_url}: Error - {str(e)}")
+        async for outcome in iter_batch(urls, extract_one):
+            if outcome['success']:
+                succeeded, line = outcome['result']
+                success_count += succeeded
+            else:
+                line = f"❌ {outcome['item']}: Error - {outcome['error']}"
+            results.append(line)
+            
+            if ctx is not None:
+                await ctx.report_progress(len(results), len(urls), line)
         
-        summary = f"Batch processing complete: {success_count}/{len(urls)} successful\n\n"
+        elapsed = (datetime.now() - started).total_seconds()
+        summary = f"Batch processing complete: {success_count}/{len(urls)} successful in {elapsed:.1f}s\n\n"
         summary += "\n".join(results)
         
         # Add to analysis history
@@ -1167,10 +1119,14 @@ async def create_mcp_resource_from_transcript(video_url: str, resource_name: str
     try:
         video_id = extract_video_id(video_url)
         
-        # Extract transcript using best available method
-        transcript = await get_youtube_transcript(video_url)
+        # Extract transcript and metadata in a single pass
+        result = await extract_transcript_ytdlp(video_url)
+        info = None
         
-        if "❌" in transcript:
+        if result['success']:
+            transcript = _format_transcript_response(video_id, video_url, result)
+            info = result['info']
+        else:
             # Fallback to yt-dlp
             transcript = await get_youtube_transcript_ytdlp(video_url)
             
@@ -1184,18 +1140,13 @@ async def create_mcp_resource_from_transcript(video_url: str, resource_name: str
         resource_path = f"resources/transcripts/{resource_name}.md"
         os.makedirs(os.path.dirname(resource_path), exist_ok=True)
         
-        # Get video metadata
+        # Get video metadata (already known unless the fallback was used)
         try:
-            import subprocess
-            cmd = ['yt-dlp', '--get-title', '--get-duration', '--get-uploader', video_url]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                title = lines[0] if len(lines) > 0 else "Unknown Title"
-                duration = lines[1] if len(lines) > 1 else "Unknown Duration"
-                uploader = lines[2] if len(lines) > 2 else "Unknown Uploader"
-            else:
-                title = duration = uploader = "Unknown"
+            if info is None:
+                info = await get_engine().extract_info(video_url, timeout=10)
+            title = info.get('title') or "Unknown Title"
+            duration = info.get('duration_string') or "Unknown Duration"
+            uploader = info.get('uploader') or "Unknown Uploader"
         except:
             title = duration = uploader = "Unknown"
         
@@ -1229,8 +1180,7 @@ async def create_mcp_resource_from_transcript(video_url: str, resource_name: str
         with open(resource_path, 'w', encoding='utf-8') as f:
             f.write(content)
         
-        # Add to cache and analysis history
-        resources.add_to_cache(video_id, transcript, "en")
+        # Add to analysis history (extraction already cached the transcript)
         resources.add_analysis_to_history("mcp_resource_creation", video_url, resource_name)
         
         return f"""✅ MCP Resource Created Successfully!
@@ -1480,87 +1430,103 @@ async def get_enhanced_video_metadata(video_url: str) -> str:
 
 
 @mcp.tool()
-async def batch_extract_transcripts_enhanced(video_urls: str, output_format: str = "comprehensive") -> str:
+async def batch_extract_transcripts_enhanced(video_urls: str, output_format: str = "comprehensive", ctx: Context = None) -> str:
     """Extract transcripts from multiple videos using enhanced pipeline with quality analysis.
 
+    Videos are processed concurrently (``BATCH_MAX_WORKERS`` at a time, each
+    limited to ``BATCH_VIDEO_TIMEOUT`` seconds) and listed in completion order.
+
     Args:
         video_urls: Comma-separated list of YouTube video URLs
         output_format: Output format - 'comprehensive', 'plain_text', 'quality_only'
     """
     try:
-        urls = [url.strip() for url in video_urls.split(',') if url.strip()]
+        urls = parse_batch_urls(video_urls)
         
         if not urls:
             return "❌ No valid URLs provided"
         
-        if len(urls) > 10:
-            return "❌ Maximum of 10 videos allowed per batch"
+        if len(urls) > settings.batch_max_urls:
+            return f"❌ Maximum of {settings.batch_max_urls} videos allowed per batch"
+        
+        async def extract_one(video_url: str) -> Tuple[str, dict, Optional[str]]:
+            video_id = extract_video_id(video_url)
+            
+            # Use enhanced extraction pipeline
+            result = await extraction.extract_enhanced_transcript(video_url)
+            resource_path = None
+            
+            if result['success'] and output_format == "comprehensive":
+                # Save comprehensive resource
+                resource_path = f"resources/transcripts/{video_id}_enhanced.md"
+                os.makedirs(os.path.dirname(resource_path), exist_ok=True)
+                
+                with open(resource_path, 'w', encoding='utf-8') as f:
+                    f.write(result['markdown_content'])
+                    
+            elif result['success'] and output_format == "plain_text":
+                # Save clean plain text version
+                resource_path = f"resources/transcripts/{video_id}_plain.txt"
+                os.makedirs(os.path.dirname(resource_path), exist_ok=True)
+                title = result.get('metadata', {}).get('title', f'Video {video_id}')
+                
+                with open(resource_path, 'w', encoding='utf-8') as f:
+                    f.write(f"# {title}\n\n")
+                    f.write(f"Video ID: {video_id}\n")
+                    f.write(f"URL: {video_url}\n\n")
+                    f.write(result['plain_text'])
+            
+            return video_id, result, resource_path
         
         results = []
         success_count = 0
         quality_summary = []
+        completed = 0
         
-        for i, video_url in enumerate(urls, 1):
-            try:
-                video_id = extract_video_id(video_url)
+        async for outcome in iter_batch(urls, extract_one):
+            completed += 1
+            if ctx is not None:
+                await ctx.report_progress(completed, len(urls))
+            
+            if not outcome['success']:
+                results.append(f"❌ {outcome['item']}: Error - {outcome['error']}")
+                continue
+            
+            video_id, result, resource_path = outcome['result']
+            if not result['success']:
+                results.append(f"❌ {video_id}: {result.get('error', 'Unknown error')}")
+                continue
+            
+            metadata = result.get('metadata', {})
+            quality_metrics = result.get('quality_metrics', {})
+            title = metadata.get('title', f'Video {video_id}')
+            
+            if output_format == "comprehensive":
+                results.append(f"✅ {video_id}: {title[:50]}{'...' if len(title) > 50 else ''}")
+                results.append(f"   - Quality: {quality_metrics.get('quality_score', 'N/A')}% ({quality_metrics.get('quality_rating', 'Unknown')})")
+                results.append(f"   - Size: {len(result['markdown_content'])} chars")
+                results.append(f"   - File: {resource_path}")
                 
-                # Use enhanced extraction pipeline
-                result = await extraction.extract_enhanced_transcript(video_url)
+            elif output_format == "plain_text":
+                results.append(f"✅ {video_id}: Plain text saved ({len(result['plain_text'])} chars)")
                 
-                if result['success']:
-                    metadata = result.get('metadata', {})
-                    quality_metrics = result.get('quality_metrics', {})
-                    title = metadata.get('title', f'Video {video_id}')
-                    
-                    # Save comprehensive resource
-                    if output_format == "comprehensive":
-                        resource_path = f"resources/transcripts/{video_id}_enhanced.md"
-                        os.makedirs(os.path.dirname(resource_path), exist_ok=True)
-                        
-                        with open(resource_path, 'w', encoding='utf-8') as f:
-                            f.write(result['markdown_content'])
-                        
-                        results.append(f"✅ {video_id}: {title[:50]}{'...' if len(title) > 50 else ''}")
-                        results.append(f"   - Quality: {quality_metrics.get('quality_score', 'N/A')}% ({quality_metrics.get('quality_rating', 'Unknown')})")
-                        results.append(f"   - Size: {len(result['markdown_content'])} chars")
-                        results.append(f"   - File: {resource_path}")
-                        
-                    elif output_format == "plain_text":
-                        # Save clean plain text version
-                        resource_path = f"resources/transcripts/{video_id}_plain.txt"
-                        os.makedirs(os.path.dirname(resource_path), exist_ok=True)
-                        
-                        with open(resource_path, 'w', encoding='utf-8') as f:
-                            f.write(f"# {title}\n\n")
-                            f.write(f"Video ID: {video_id}\n")
-                            f.write(f"URL: {video_url}\n\n")
-                            f.write(result['plain_text'])
-                        
-                        results.append(f"✅ {video_id}: Plain text saved ({len(result['plain_text'])} chars)")
-                        
-                    elif output_format == "quality_only":
-                        # Just analyze quality without saving
-                        results.append(f"✅ {video_id}: {title[:40]}{'...' if len(title) > 40 else ''}")
-                        results.append(f"   - Quality: {quality_metrics.get('quality_score', 'N/A')}% ({quality_metrics.get('quality_rating', 'Unknown')})")
-                        results.append(f"   - Lines: {quality_metrics.get('total_lines', 0)} → {result.get('deduplicated_count', 0)} (after dedup)")
-                        results.append(f"   - Duplicates: {quality_metrics.get('exact_duplicates', 0)} exact + {quality_metrics.get('partial_duplicates', 0)} partial")
-                    
-                    success_count += 1
-                    
-                    # Track quality metrics for summary
-                    quality_summary.append({
-                        'video_id': video_id,
-                        'title': title,
-                        'quality_score': quality_metrics.get('quality_score', 0),
-                        'total_lines': quality_metrics.get('total_lines', 0),
-                        'deduplicated_lines': result.get('deduplicated_count', 0)
-                    })
-                    
-                else:
-                    results.append(f"❌ {video_id}: {result.get('error', 'Unknown error')}")
-                    
-            except Exception as e:
-                results.append(f"❌ {video_url}: Error - {str(e)}")
+            elif output_format == "quality_only":
+                # Just analyze quality without saving
+                results.append(f"✅ {video_id}: {title[:40]}{'...' if len(title) > 40 else ''}")
+                results.append(f"   - Quality: {quality_metrics.get('quality_score', 'N/A')}% ({quality_metrics.get('quality_rating', 'Unknown')})")
+                results.append(f"   - Lines: {quality_metrics.get('total_lines', 0)} → {result.get('deduplicated_count', 0)} (after dedup)")
+                results.append(f"   - Duplicates: {quality_metrics.get('exact_duplicates', 0)} exact + {quality_metrics.get('partial_duplicates', 0)} partial")
+            
+            success_count += 1
+            
+            # Track quality metrics for summary
+            quality_summary.append({
+                'video_id': video_id,
+                'title': title,
+                'quality_score': quality_metrics.get('quality_score', 0),
+                'total_lines': quality_metrics.get('total_lines', 0),
+                'deduplicated_lines': result.get('deduplicated_count', 0)
+            })
         
         # Create comprehensive summary
         summary = f"# Enhanced Batch Processing Complete\n\n"
@@ -1653,22 +1619,27 @@ async def get_transcript_quality_resource(video_id: str) -> dict:
         # Build URL from video ID for enhanced extraction
         video_url = f"https://www.youtube.com/watch?v={video_id}"
         
-        # Use enhanced extraction pipeline
-        result = await extraction.extract_enhanced_transcript(video_url)
-        
-        if not result['success']:
-            return {
-                "error": f"Failed to analyze transcript quality: {result.get('error', 'Unknown error')}",
-                "video_id": video_id
-            }
+        # Stored reports avoid re-extracting videos that were already analyzed
+        report = extraction.get_stored_quality_report(video_id)
+        if report is None:
+            result = await extraction.extract_enhanced_transcript(video_url)
+            
+            if not result['success']:
+                return {
+                    "error": f"Failed to analyze transcript quality: {result.get('error', 'Unknown error')}",
+                    "video_id": video_id
+                }
+            
+            report = extraction.build_quality_report(result)
         
-        quality_metrics = result.get('quality_metrics', {})
+        quality_metrics = report.get('quality_metrics', {})
         
         return {
             "video_id": video_id,
             "video_url": video_url,
-            "extraction_method": result['method'],
-            "language": result.get('language', 'en'),
+            "extraction_method": report['method'],
+            "language": report.get('language', 'en'),
+            "scoring_version": quality_metrics.get('scoring_version'),
             "quality_analysis": {
                 "total_lines": quality_metrics.get('total_lines', 0),
                 "text_lines": quality_metrics.get('text_lines', 0),
@@ -1914,180 +1885,3 @@ async def resource_transcripts_metadata_rich(video_id: str) -> dict:
 async def resource_transcripts_quality_report() -> dict:
     """Tool mirror of transcripts://quality_report resource."""
     return await get_quality_report_resource()
-
-
-# SRV1 and JSON3 parser functions
-def parse_srv1_content(srv1_file_path: str) -> List[str]:
-    """Parse SRV1 (XML) subtitle file and return timestamped transcript lines."""
-    import xml.etree.ElementTree as ET
-    
-    with open(srv1_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    transcript_lines = []
-    
-    try:
-        root = ET.fromstring(content)
-        for text_elem in root.findall('text'):
-            start_time = float(text_elem.get('start', 0))
-            text = text_elem.text
-            
-            if text and text.strip():
-                # Format timestamp
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                
-                # Clean and format text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    except ET.ParseError as e:
-        print(f"Error parsing SRV1 XML content: {e}")
-    
-    return transcript_lines
-
-
-def parse_json3_content(json3_file_path: str) -> List[str]:
-    """Parse JSON3 subtitle file and return timestamped transcript lines."""
-    import json
-    
-    with open(json3_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    transcript_lines = []
-    
-    for event in data.get('events', []):
-        if 'segs' in event:
-            start_time = event.get('tStartMs', 0) / 1000
-            text_parts = []
-            
-            for seg in event['segs']:
-                if 'utf8' in seg and seg['utf8'] != '\n':
-                    text_parts.append(seg['utf8'])
-            
-            text = ''.join(text_parts).strip()
-            if text:
-                # Format timestamp
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                
-                # Clean text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    return transcript_lines
-
-
-def download_subtitles_with_fallback(video_url: str, language: str = "en", temp_dir: Optional[str] = None) -> Tuple[str, str]:
-    """Download subtitles with format fallback chain: srv1 → json3 → ttml → vtt."""
-    formats = ['srv1', 'json3', 'ttml', 'vtt']  # Order by quality
-    
-    for fmt in formats:
-        cmd = [
-            'yt-dlp',
-            '--write-auto-subs',
-            '--write-subs', 
-            '--sub-lang', language,
-            '--sub-format', fmt,
-            '--skip-download',
-            '--output', f'{temp_dir}/%(title)s.%(ext)s',
-            video_url
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                # Check if files were actually created
-                subtitle_files = glob.glob(f'{temp_dir}/*.{language}.{fmt}') or glob.glob(f'{temp_dir}/*.en.{fmt}')
-                if subtitle_files:
-                    return subtitle_files[0], fmt
-        except subprocess.TimeoutExpired:
-            continue
-        except Exception:
-            continue
-    
-    raise Exception("No subtitle formats available")
-
-
-def parse_subtitle_file(file_path: str, format_type: str) -> List[str]:
-    """Parse subtitle file based on format type."""
-    if format_type == 'srv1':
-        return parse_srv1_content(file_path)
-    elif format_type == 'json3':
-        return parse_json3_content(file_path)
-    elif format_type == 'ttml':
-        # For now, fallback to VTT parsing logic for TTML
-        return parse_vtt_content_legacy(file_path)
-    elif format_type == 'vtt':
-        return parse_vtt_content_legacy(file_path)
-    else:
-        raise ValueError(f"Unsupported subtitle format: {format_type}")
-
-
-def parse_vtt_content_legacy(vtt_file_path: str) -> List[str]:
-    """Legacy VTT parser for fallback compatibility."""
-    with open(vtt_file_path, 'r', encoding='utf-8') as f:
-        vtt_content = f.read()
-    
-    lines = vtt_content.split('\n')
-    transcript_lines = []
-    
-    current_timestamp = None
-    current_text_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines and VTT headers
-        if not line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-            if not line and current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-                current_timestamp = None
-                current_text_lines = []
-            continue
-        
-        # Check if line contains timestamp
-        if '-->' in line:
-            if current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-            
-            # Extract start time
-            time_parts = line.split(' --> ')[0]
-            try:
-                time_clean = time_parts.split('.')[0].split(':')
-                if len(time_clean) >= 3:
-                    hours = int(time_clean[0])
-                    minutes = int(time_clean[1]) + (hours * 60)
-                    seconds = int(time_clean[2])
-                    current_timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                else:
-                    current_timestamp = "[00:00]"
-            except (ValueError, IndexError):
-                current_timestamp = "[00:00]"
-            
-            current_text_lines = []
-            continue
-        
-        # Accumulate text lines
-        if current_timestamp:
-            current_text_lines.append(line)
-    
-    # Process final cue
-    if current_timestamp and current_text_lines:
-        combined_text = ' '.join(current_text_lines)
-        clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-        if clean_text:
-            transcript_lines.append(f"{current_timestamp} {clean_text}")
-    
-    return transcript_lines
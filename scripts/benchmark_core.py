@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared extraction core (subtitle parsers and deduplication).
+
+Both MCP servers and scripts/youtube_to_mcp.py use the same parser registry
+and dedup code, so this one benchmark covers every entry point. It runs
+offline on synthetic auto-caption style subtitles, or on a real subtitle file.
+
+Usage:
+    uv run python scripts/benchmark_core.py [--cues 10000] [--runs 5]
+    uv run python scripts/benchmark_core.py --file video.en.srv1 --format srv1
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Allow running from the scripts directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.parsers import clean_caption_text, iter_subtitle_cues, parse_subtitle_cues, supported_formats
+from src.youtube_transcript_server.dedup import deduplicate_cues, deduplicate_rolling_cues
+from src.youtube_transcript_server.cues import render_lines
+
+WORDS = "so today we are going to talk about how transcripts work and why captions repeat".split()
+
+
+def synthetic_phrases(cues: int):
+    """Yield (start_seconds, text) pairs with rolling auto-caption overlap."""
+    for i in range(cues):
+        words = [WORDS[(i + j) % len(WORDS)] for j in range(6)]
+        yield i * 2.0, ' '.join(words)
+
+
+def vtt_timestamp(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def make_srv1(cues: int) -> str:
+    body = ''.join(f'<text start="{start}" dur="2.0">{text}</text>\n' for start, text in synthetic_phrases(cues))
+    return f'<?xml version="1.0" encoding="utf-8" ?>\n<transcript>\n{body}</transcript>'
+
+
+def make_json3(cues: int) -> str:
+    events = [{'tStartMs': int(start * 1000), 'dDurationMs': 2000, 'segs': [{'utf8': text}]}
+              for start, text in synthetic_phrases(cues)]
+    return json.dumps({'events': events})
+
+
+def make_vtt(cues: int) -> str:
+    blocks = [f"{vtt_timestamp(start)} --> {vtt_timestamp(start + 2)}\n{text}\n"
+              for start, text in synthetic_phrases(cues)]
+    return "WEBVTT\nKind: captions\nLanguage: en\n\n" + '\n'.join(blocks)
+
+
+def make_ttml(cues: int) -> str:
+    body = ''.join(f'<p begin="{vtt_timestamp(start)}" end="{vtt_timestamp(start + 2)}"><span>{text}</span></p>\n'
+                   for start, text in synthetic_phrases(cues))
+    return ('<?xml version="1.0" encoding="utf-8" ?>\n<tt xmlns="http://www.w3.org/ns/ttml" xml:lang="en">'
+            f'<body><div>\n{body}</div></body></tt>')
+
+
+GENERATORS = {'srv1': make_srv1, 'json3': make_json3, 'ttml': make_ttml, 'vtt': make_vtt}
+
+
+def time_call(func, runs: int) -> float:
+    """Get the median wall time of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def peak_parse_memory(format_type: str, content: str) -> float:
+    """Get the peak memory in KB of streaming through the cues without keeping them."""
+    tracemalloc.start()
+    for _ in iter_subtitle_cues(content, format_type):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def benchmark(format_type: str, content: str, runs: int):
+    cues = parse_subtitle_cues(content, format_type)
+    parse_ms = time_call(lambda: parse_subtitle_cues(content, format_type), runs)
+    dedup_ms = time_call(lambda: deduplicate_cues(cues), runs)
+    aggressive_ms = time_call(lambda: deduplicate_cues(cues, aggressive=True), runs)
+    rolling_ms = time_call(lambda: deduplicate_rolling_cues(cues), runs)
+    rolling_count = len(deduplicate_rolling_cues(cues))
+    render_ms = time_call(lambda: render_lines(cues), runs)
+    peak_kb = peak_parse_memory(format_type, content)
+
+    print(f"⚙️  {format_type:<6} {len(content) / 1024:8.0f} KB  {len(cues):6d} cues  "
+          f"parse {parse_ms:8.2f}ms  dedup {dedup_ms:8.2f}ms  aggressive dedup {aggressive_ms:8.2f}ms  "
+          f"rolling dedup {rolling_ms:8.2f}ms ({rolling_count} cues)  "
+          f"render {render_ms:8.2f}ms  streaming peak {peak_kb:6.0f} KB")
+
+
+def legacy_clean(text: str) -> str:
+    """Cue cleaning as it was before the fast path (regex and unescape on every cue)."""
+    return html.unescape(re.sub(r'<[^>]+>', '', text)).strip()
+
+
+def benchmark_cleaning(cues: int, runs: int):
+    """Time cue text cleaning on plain and marked-up synthetic cues."""
+    plain = [text for _, text in synthetic_phrases(cues)]
+    marked = [f"<c>{text}</c> &amp; more" for text in plain]
+
+    for label, texts in (("plain", plain), ("markup", marked)):
+        fast_ms = time_call(lambda: [clean_caption_text(text) for text in texts], runs)
+        legacy_ms = time_call(lambda: [legacy_clean(text) for text in texts], runs)
+        print(f"🧹 clean  {label:<6} {len(texts):6d} cues  "
+              f"fast path {fast_ms:8.2f}ms  regex+unescape {legacy_ms:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared subtitle parsers and deduplication")
+    parser.add_argument("--cues", type=int, default=10000, help="Synthetic cues per format (default: 10000)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement (default: 5)")
+    parser.add_argument("--file", help="Benchmark a real subtitle file instead of synthetic content")
+    parser.add_argument("--format", choices=supported_formats(), help="Format of --file (default: file extension)")
+    args = parser.parse_args()
+
+    print(f"📊 Extraction core benchmark (median of {args.runs} runs)\n")
+
+    if args.file:
+        format_type = args.format or os.path.splitext(args.file)[1].lstrip('.')
+        with open(args.file, 'r', encoding='utf-8') as f:
+            benchmark(format_type, f.read(), args.runs)
+        return
+
+    for format_type in supported_formats():
+        if format_type in GENERATORS:
+            benchmark(format_type, GENERATORS[format_type](args.cues), args.runs)
+
+    print()
+    benchmark_cleaning(args.cues, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the yt-dlp extraction engines.
+
+Times metadata extraction and subtitle fetching for the in-process library
+engine and the subprocess (CLI) engine on the same videos.
+
+Usage:
+    uv run python scripts/benchmark_extraction.py "https://youtube.com/watch?v=VIDEO_ID" [--runs 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Allow running from the scripts directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.engines import get_engine
+
+
+async def time_engine(engine_name: str, video_url: str, language: str) -> float:
+    """Time one metadata + subtitle extraction with the given engine."""
+    engine = get_engine(engine_name)
+    started = time.perf_counter()
+
+    if engine.name == 'library':
+        # One extract_info call provides both metadata and subtitle URLs
+        info = await engine.extract_info(video_url)
+        await engine.fetch_subtitles(video_url, language, info=info)
+    else:
+        await engine.extract_info(video_url)
+        await engine.fetch_subtitles(video_url, language)
+
+    return time.perf_counter() - started
+
+
+async def run_benchmark(urls, runs: int, language: str, engine_names):
+    print(f"📊 Benchmarking {len(urls)} video(s), {runs} run(s) each\n")
+
+    for engine_name in engine_names:
+        timings = []
+        for url in urls:
+            for _ in range(runs):
+                try:
+                    timings.append(await time_engine(engine_name, url, language))
+                except Exception as e:
+                    print(f"❌ {engine_name}: {url}: {e}")
+
+        if timings:
+            print(f"⚙️  {engine_name:<10} mean {statistics.mean(timings):6.2f}s  "
+                  f"min {min(timings):6.2f}s  max {max(timings):6.2f}s  (n={len(timings)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark yt-dlp extraction engines")
+    parser.add_argument("urls", nargs="+", help="YouTube video URLs")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per video and engine (default: 3)")
+    parser.add_argument("--language", default="en", help="Subtitle language (default: en)")
+    parser.add_argument("--engine", choices=["library", "subprocess"], action="append",
+                        help="Engine to benchmark (repeatable, default: both)")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.urls, args.runs, args.language, args.engine or ["library", "subprocess"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark single-pass quality scoring against the previous multi-pass code.
+
+Scores a long synthetic transcript (several hours of cues, with rolling
+repeats and hour-long timestamps) with both implementations, checks that the
+results are identical and prints the timings.
+
+Usage:
+    uv run python scripts/benchmark_quality.py [--cues 20000] [--runs 3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Allow running from the scripts directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.cues import Cue, as_cues
+from src.youtube_transcript_server.quality import calculate_quality_score, count_duplicates
+
+WORDS = ("so today we are going to talk about how transcripts work and why captions repeat, "
+         "the quality score checks punctuation; timing: and more!").split()
+
+
+def synthetic_cues(count: int) -> List[Cue]:
+    """Build auto-caption style cues, 2.5 s apart, with some exact repeats."""
+    rng = random.Random(0)
+    cues = []
+    for i in range(count):
+        if i % 7 == 3:
+            text = cues[-1].text
+        else:
+            text = ' '.join(rng.choice(WORDS) for _ in range(4 + i % 5))
+        cues.append(Cue(i * 2500, i * 2500 + 2400, text))
+    return cues
+
+
+# ----------------------------------------------------------------------------
+# Previous implementations, kept for comparison
+# ----------------------------------------------------------------------------
+
+def legacy_calculate_quality_score(lines: List[Cue], video_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """The multi-pass ``calculate_quality_score`` this module replaced."""
+    if not lines:
+        return {
+            "quality_score": 0,
+            "line_count": 0,
+            "avg_line_length": 0,
+            "deduplication_effectiveness": 0,
+            "has_punctuation": False,
+            "timestamp_coverage": 0,
+            "quality_warnings": []
+        }
+
+    cues = as_cues(lines)
+
+    # Basic metrics (timestamps are rendered as "[MM:SS] " in front of the text)
+    line_count = len(cues)
+    timestamps = [cue.timestamp for cue in cues]
+    total_chars = sum(len(cue.text) + (len(ts) + 1 if ts else 0) for cue, ts in zip(cues, timestamps))
+    avg_line_length = total_chars / line_count if line_count > 0 else 0
+
+    # Punctuation analysis (timestamp colons included)
+    punctuation_chars = sum(1 for cue in cues for char in cue.text if char in '.,!?;:')
+    punctuation_chars += sum(ts.count(':') for ts in timestamps)
+    has_punctuation = punctuation_chars > line_count * 0.1  # At least 10% of lines have punctuation
+
+    # Timestamp coverage
+    timestamped_lines = sum(1 for ts in timestamps if ts)
+    timestamp_coverage = timestamped_lines / line_count if line_count > 0 else 0
+
+    # Enhanced Quality Validation (NEW)
+    quality_warnings = []
+    safety_penalties = 0
+
+    # Extract text content for analysis
+    text_content = [cue.text.lower() for cue in cues if cue.text]
+
+    full_text = ' '.join(text_content)
+
+    # SAFETY CHECK 1: Detect gibberish/nonsensical content
+    if full_text:
+        words = full_text.split()
+        if len(words) > 10:
+            # Check for excessive repetition of short words
+            word_freq = {}
+            for word in words:
+                if len(word) <= 3:  # Short words like "uh", "um", "the"
+                    word_freq[word] = word_freq.get(word, 0) + 1
+
+            most_common_short = max(word_freq.values()) if word_freq else 0
+            if most_common_short > len(words) * 0.15:  # More than 15% repetition
+                quality_warnings.append("High repetition of short words detected")
+                safety_penalties += 15
+
+    # SAFETY CHECK 2: Check for incoherent character sequences
+    if full_text:
+        # Look for excessive special characters or garbled text
+        special_char_ratio = sum(1 for c in full_text if not c.isalnum() and c not in ' .,!?;:-\'\"') / len(full_text)
+        if special_char_ratio > 0.05:  # More than 5% special characters
+            quality_warnings.append("Excessive special characters suggest garbled content")
+            safety_penalties += 20
+
+    # SAFETY CHECK 3: Duration validation (if video info available)
+    if video_info and 'duration' in video_info:
+        expected_lines = video_info['duration'] / 3  # Rough estimate: 1 line per 3 seconds
+        if line_count > expected_lines * 2:  # More than double expected
+            quality_warnings.append("Transcript length seems excessive for video duration")
+            safety_penalties += 10
+        elif line_count < expected_lines * 0.3:  # Less than 30% expected
+            quality_warnings.append("Transcript seems too short for video duration")
+            safety_penalties += 15
+
+    # SAFETY CHECK 4: Language consistency check
+    if full_text:
+        # Simple heuristic: Check for mixed language patterns
+        english_words = {'the', 'and', 'is', 'to', 'of', 'in', 'for', 'with', 'on', 'as', 'by', 'this', 'that'}
+        words_lower = set(full_text.split())
+        english_word_ratio = len(english_words.intersection(words_lower)) / len(english_words)
+
+        if english_word_ratio < 0.3 and len(words_lower) > 20:  # Low English word presence
+            quality_warnings.append("Content may not be in expected language")
+            safety_penalties += 10
+
+    # Quality score calculation (0-100)
+    quality_score = 0
+
+    # Line count factor (more lines generally better, up to a point)
+    if line_count > 10:
+        quality_score += min(30, line_count * 0.5)
+
+    # Average line length (reasonable length indicates good segmentation)
+    if 20 <= avg_line_length <= 100:
+        quality_score += 25
+    elif 10 <= avg_line_length <= 150:
+        quality_score += 15
+
+    # Punctuation presence
+    if has_punctuation:
+        quality_score += 20
+
+    # Timestamp coverage
+    quality_score += timestamp_coverage * 25
+
+    # Apply safety penalties
+    quality_score = max(0, quality_score - safety_penalties)
+
+    # Additional warning if score is artificially high but has safety issues
+    if quality_score > 60 and safety_penalties > 20:
+        quality_warnings.append("⚠️ High structural score but content quality concerns detected")
+
+    return {
+        "quality_score": int(quality_score),
+        "line_count": line_count,
+        "avg_line_length": round(avg_line_length, 1),
+        "deduplication_effectiveness": 0,  # Will be calculated during deduplication
+        "has_punctuation": has_punctuation,
+        "timestamp_coverage": round(timestamp_coverage, 2),
+        "quality_warnings": quality_warnings,
+        "safety_penalties": safety_penalties
+    }
+
+
+def legacy_count_duplicates(texts: List[str]) -> Tuple[int, int]:
+    """The quadratic duplicate scan ``count_duplicates`` replaced."""
+    exact_duplicates = 0
+    partial_duplicates = 0
+    seen_texts = set()
+
+    for text in texts:
+        clean_text = ' '.join(text.split()).lower()
+        if clean_text in seen_texts:
+            exact_duplicates += 1
+        else:
+            # Check for partial duplicates
+            for seen_text in seen_texts:
+                if (clean_text in seen_text or seen_text in clean_text) and clean_text != seen_text:
+                    partial_duplicates += 1
+                    break
+            seen_texts.add(clean_text)
+
+    return exact_duplicates, partial_duplicates
+
+
+def time_call(func, runs: int) -> float:
+    """Get the median wall time of ``func`` in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-pass quality scoring")
+    parser.add_argument("--cues", type=int, default=20000, help="Synthetic cues (default: 20000, about 14 hours)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per measurement (default: 3)")
+    args = parser.parse_args()
+
+    cues = synthetic_cues(args.cues)
+    texts = [cue.text for cue in cues]
+    video_info = {'duration': args.cues * 2.5}
+
+    print(f"📊 Quality scoring benchmark: {len(cues)} cues (median of {args.runs} runs)\n")
+
+    assert calculate_quality_score(cues, video_info) == legacy_calculate_quality_score(cues, video_info)
+    score_ms = time_call(lambda: calculate_quality_score(cues, video_info), args.runs)
+    legacy_score_ms = time_call(lambda: legacy_calculate_quality_score(cues, video_info), args.runs)
+    print(f"🎯 calculate_quality_score  single pass {score_ms:9.2f}ms  multi-pass {legacy_score_ms:9.2f}ms")
+
+    # The quadratic scan is slow on long transcripts; compare on a slice of them
+    sample = texts[:min(len(texts), 10000)]
+    assert count_duplicates(sample) == legacy_count_duplicates(sample)
+    dup_ms = time_call(lambda: count_duplicates(sample), args.runs)
+    legacy_dup_ms = time_call(lambda: legacy_count_duplicates(sample), 1)
+    print(f"🔁 count_duplicates ({len(sample)})  single pass {dup_ms:9.2f}ms  quadratic  {legacy_dup_ms:9.2f}ms")
+    print("\n✅ Results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,14 +24,19 @@ import argparse
 import asyncio
 import re
 import subprocess
-import glob
 import tempfile
 import shutil
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Optional
-import html
+
+# Use the same extraction core as the MCP servers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.youtube_transcript_server.engines import download_subtitles_with_fallback
+from src.youtube_transcript_server.parsers import parse_subtitle_file
+from src.youtube_transcript_server.quality import content_checks, count_duplicates, count_punctuation
+from src.youtube_transcript_server.dedup import deduplicate_transcript_lines
 
 # Note: This tool now uses only yt-dlp for transcript extraction
 # The youtube-transcript-api has been removed due to frequent blocking issues
@@ -109,7 +114,7 @@ def extract_transcript(video_url: str, language: str = "en", metadata: Optional[
         temp_dir = tempfile.mkdtemp(prefix="ytdlp_mcp_")
         
         # Use new fallback system instead of hardcoded VTT
-        subtitle_file, actual_format = download_subtitles_with_fallback(video_url, language, temp_dir)
+        subtitle_file, actual_format = asyncio.run(download_subtitles_with_fallback(video_url, language, temp_dir))
         
         # Parse using the appropriate parser
         transcript_lines = parse_subtitle_file(subtitle_file, actual_format)
@@ -117,7 +122,7 @@ def extract_transcript(video_url: str, language: str = "en", metadata: Optional[
         # Apply deduplication (mainly needed for VTT fallback)
         original_count = len(transcript_lines)
         if actual_format == 'vtt':
-            transcript_lines = deduplicate_transcript_lines(transcript_lines)
+            transcript_lines = deduplicate_transcript_lines(transcript_lines, aggressive=True)
         
         # Calculate deduplication effectiveness
         dedup_effectiveness = ((original_count - len(transcript_lines)) / original_count * 100) if original_count > 0 else 0
@@ -211,75 +216,14 @@ def analyze_transcript_quality(lines: List[str], video_info: Optional[Dict[str,
         if text and text not in ['[Music]', '[Applause]', '[Laughter]']:
             text_lines.append(text)
     
-    # Enhanced Quality Validation (NEW)
-    quality_warnings = []
-    safety_penalties = 0
-    
-    full_text = ' '.join(text_lines).lower()
-    
-    # SAFETY CHECK 1: Detect gibberish/nonsensical content
-    if full_text:
-        words = full_text.split()
-        if len(words) > 10:
-            # Check for excessive repetition of short words
-            word_freq = {}
-            for word in words:
-                if len(word) <= 3:  # Short words like "uh", "um", "the"
-                    word_freq[word] = word_freq.get(word, 0) + 1
-            
-            most_common_short = max(word_freq.values()) if word_freq else 0
-            if most_common_short > len(words) * 0.15:  # More than 15% repetition
-                quality_warnings.append("High repetition of short words detected")
-                safety_penalties += 15
-    
-    # SAFETY CHECK 2: Check for incoherent character sequences
-    if full_text:
-        # Look for excessive special characters or garbled text
-        special_char_ratio = sum(1 for c in full_text if not c.isalnum() and c not in ' .,!?;:-\'\"') / len(full_text)
-        if special_char_ratio > 0.05:  # More than 5% special characters
-            quality_warnings.append("Excessive special characters suggest garbled content")
-            safety_penalties += 20
-    
-    # SAFETY CHECK 3: Duration validation (if video info available)
-    if video_info and 'duration' in video_info:
-        expected_lines = video_info['duration'] / 3  # Rough estimate: 1 line per 3 seconds
-        if total_lines > expected_lines * 2:  # More than double expected
-            quality_warnings.append("Transcript length seems excessive for video duration")
-            safety_penalties += 10
-        elif total_lines < expected_lines * 0.3:  # Less than 30% expected
-            quality_warnings.append("Transcript seems too short for video duration")
-            safety_penalties += 15
-    
-    # SAFETY CHECK 4: Language consistency check
-    if full_text:
-        # Simple heuristic: Check for mixed language patterns
-        english_words = {'the', 'and', 'is', 'to', 'of', 'in', 'for', 'with', 'on', 'as', 'by', 'this', 'that'}
-        words_lower = set(full_text.split())
-        english_word_ratio = len(english_words.intersection(words_lower)) / len(english_words)
-        
-        if english_word_ratio < 0.3 and len(words_lower) > 20:  # Low English word presence
-            quality_warnings.append("Content may not be in expected language")
-            safety_penalties += 10
+    # Enhanced Quality Validation (shared single-pass checks)
+    quality_warnings, safety_penalties = content_checks(' '.join(text_lines).lower(), total_lines, video_info)
     
     # Duplicate analysis
-    exact_duplicates = 0
-    partial_duplicates = 0
-    seen_texts = set()
-    
-    for text in text_lines:
-        clean_text = ' '.join(text.split()).lower()
-        if clean_text in seen_texts:
-            exact_duplicates += 1
-        else:
-            # Check for partial duplicates
-            for seen_text in seen_texts:
-                if (clean_text in seen_text or seen_text in clean_text) and clean_text != seen_text:
-                    partial_duplicates += 1
-                    break
-            seen_texts.add(clean_text)
+    exact_duplicates, partial_duplicates = count_duplicates(text_lines)
     
     # After deduplication metrics
-    deduplicated = deduplicate_transcript_lines(lines)
+    deduplicated = deduplicate_transcript_lines(lines, aggressive=True)
     dedupe_reduction = ((total_lines - len(deduplicated)) / total_lines * 100) if total_lines > 0 else 0
     
     # Text quality metrics
@@ -287,7 +231,7 @@ def analyze_transcript_quality(lines: List[str], video_info: Optional[Dict[str,
     avg_words_per_line = total_words / len(text_lines) if text_lines else 0
     
     # Punctuation analysis
-    punctuation_chars = sum(1 for line in text_lines for char in line if char in '.,!?;:')
+    punctuation_chars = count_punctuation(' '.join(text_lines))
     has_punctuation = punctuation_chars > len(text_lines) * 0.1  # At least 10% of lines have punctuation
     
     # Timestamp coverage
@@ -534,73 +478,6 @@ def save_mcp_resource(result: Dict[str, Any], video_url: str, metadata: Dict[str
         print(f"❌ Error saving MCP resource: {e}")
         return ""
 
-def deduplicate_transcript_lines(lines: List[str]) -> List[str]:
-    """Remove duplicate consecutive text while preserving timestamps.
-    
-    This fixes the common issue where YouTube auto-captions repeat the same text
-    across multiple timestamps as speech continues.
-    """
-    if not lines:
-        return lines
-    
-    deduplicated = []
-    last_clean_text = ""
-    last_words = set()
-    
-    for line in lines:
-        # Extract timestamp and text
-        if line.startswith('[') and ']' in line:
-            timestamp_end = line.find(']') + 1
-            timestamp = line[:timestamp_end]
-            text = line[timestamp_end:].strip()
-        else:
-            timestamp = ""
-            text = line.strip()
-        
-        if not text or text in ['[Music]', '[Applause]', '[Laughter]']:
-            continue
-            
-        # Clean text for comparison (remove extra spaces, normalize)
-        clean_text = ' '.join(text.split()).lower()
-        
-        # Skip if this is an exact duplicate of the last line
-        if clean_text == last_clean_text:
-            continue
-            
-        # Skip if this text is completely contained in the last text
-        # and last text is not a special caption
-        if last_clean_text and clean_text in last_clean_text and last_clean_text not in ['[Music]', '[Applause]', '[Laughter]']:
-            continue
-            
-        # Skip if the last text is completely contained in this text
-        # but this text is much longer (likely an extension)
-        if last_clean_text and last_clean_text in clean_text:
-            if len(clean_text) > len(last_clean_text) * 1.2:
-                # Replace the last entry with this longer version
-                if deduplicated:
-                    deduplicated[-1] = line
-                    last_clean_text = clean_text
-                    last_words = set(clean_text.split())
-                    continue
-        
-        # Advanced duplicate detection: check word overlap
-        current_words = set(clean_text.split())
-        if last_words and len(current_words) > 3:
-            # Calculate overlap percentage
-            overlap = len(current_words.intersection(last_words))
-            overlap_percentage = overlap / min(len(current_words), len(last_words))
-            
-            # If more than 80% word overlap and similar length, skip
-            if (overlap_percentage > 0.8 and 
-                abs(len(current_words) - len(last_words)) <= 2):
-                continue
-        
-        deduplicated.append(line)
-        last_clean_text = clean_text
-        last_words = current_words
-    
-    return deduplicated
-
 def create_plain_text_script(lines: List[str], remove_duplicates: bool = True, aggressive_dedup: bool = False) -> str:
     """Create a clean plain text script from timestamped transcript lines.
     
@@ -616,7 +493,7 @@ def create_plain_text_script(lines: List[str], remove_duplicates: bool = True, a
         return ""
     
     # First, deduplicate if requested
-    working_lines = deduplicate_transcript_lines(lines) if remove_duplicates else lines
+    working_lines = deduplicate_transcript_lines(lines, aggressive=True) if remove_duplicates else lines
     
     # Extract just the text parts and clean them
     text_parts = []
@@ -701,193 +578,6 @@ def create_plain_text_script(lines: List[str], remove_duplicates: bool = True, a
     
     return '\n\n'.join(paragraphs)
 
-# ============================================================================
-# SUBTITLE FORMAT PARSERS (Added in VTT → SRV1 Migration)
-# ============================================================================
-
-def parse_srv1_content(srv1_file_path: str) -> List[str]:
-    """Parse SRV1 (XML) subtitle file and return timestamped transcript lines."""
-    import xml.etree.ElementTree as ET
-    
-    with open(srv1_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    transcript_lines = []
-    
-    try:
-        root = ET.fromstring(content)
-        for text_elem in root.findall('text'):
-            start_time = float(text_elem.get('start', 0))
-            text = text_elem.text
-            
-            if text and text.strip():
-                # Format timestamp
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                
-                # Clean and format text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    except ET.ParseError as e:
-        print(f"Error parsing SRV1 XML content: {e}")
-    
-    return transcript_lines
-
-
-def parse_json3_content(json3_file_path: str) -> List[str]:
-    """Parse JSON3 subtitle file and return timestamped transcript lines."""
-    with open(json3_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    transcript_lines = []
-    
-    for event in data.get('events', []):
-        if 'segs' in event:
-            start_time = event.get('tStartMs', 0) / 1000
-            text_parts = []
-            
-            for seg in event['segs']:
-                if 'utf8' in seg and seg['utf8'] != '\n':
-                    text_parts.append(seg['utf8'])
-            
-            text = ''.join(text_parts).strip()
-            if text:
-                # Format timestamp
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                
-                # Clean text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    return transcript_lines
-
-
-def download_subtitles_with_fallback(video_url: str, language: str = "en", temp_dir: Optional[str] = None) -> tuple[str, str]:
-    """Download subtitles with format fallback chain: srv1 → json3 → ttml → vtt."""
-    formats = ['srv1', 'json3', 'ttml', 'vtt']  # Order by quality
-    
-    for fmt in formats:
-        cmd = [
-            'yt-dlp',
-            '--write-auto-subs',
-            '--write-subs', 
-            '--sub-lang', language,
-            '--sub-format', fmt,
-            '--skip-download',
-            '--output', f'{temp_dir}/%(title)s.%(ext)s',
-            video_url
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                # Check if files were actually created
-                subtitle_files = glob.glob(f'{temp_dir}/*.{language}.{fmt}') or glob.glob(f'{temp_dir}/*.en.{fmt}')
-                if subtitle_files:
-                    return subtitle_files[0], fmt
-        except subprocess.TimeoutExpired:
-            continue
-        except Exception:
-            continue
-    
-    raise Exception("No subtitle formats available")
-
-
-def parse_subtitle_file(file_path: str, format_type: str) -> List[str]:
-    """Parse subtitle file based on format type."""
-    if format_type == 'srv1':
-        return parse_srv1_content(file_path)
-    elif format_type == 'json3':
-        return parse_json3_content(file_path)
-    elif format_type == 'ttml':
-        # For now, fallback to VTT parsing logic for TTML
-        return parse_vtt_content_legacy(file_path)
-    elif format_type == 'vtt':
-        return parse_vtt_content_legacy(file_path)
-    else:
-        raise ValueError(f"Unsupported subtitle format: {format_type}")
-
-
-def parse_vtt_content_legacy(vtt_file_path: str) -> List[str]:
-    """Legacy VTT parser for fallback compatibility."""
-    with open(vtt_file_path, 'r', encoding='utf-8') as f:
-        vtt_content = f.read()
-    
-    lines = vtt_content.split('\n')
-    transcript_lines = []
-    
-    current_timestamp = None
-    current_text_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines and VTT headers
-        if not line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-            if not line and current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-                current_timestamp = None
-                current_text_lines = []
-            continue
-        
-        # Check if line contains timestamp
-        if '-->' in line:
-            if current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-            
-            # Extract start time
-            time_parts = line.split(' --> ')[0]
-            try:
-                time_clean = time_parts.split('.')[0].split(':')
-                if len(time_clean) >= 3:
-                    hours = int(time_clean[0])
-                    minutes = int(time_clean[1]) + (hours * 60)
-                    seconds = int(time_clean[2])
-                    current_timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                else:
-                    current_timestamp = "[00:00]"
-            except (ValueError, IndexError):
-                current_timestamp = "[00:00]"
-            
-            current_text_lines = []
-            continue
-        
-        # Accumulate text lines
-        if current_timestamp:
-            current_text_lines.append(line)
-    
-    # Process final cue
-    if current_timestamp and current_text_lines:
-        combined_text = ' '.join(current_text_lines)
-        clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-        # Decode HTML entities
-        clean_text = html.unescape(clean_text)
-        if clean_text:
-            transcript_lines.append(f"{current_timestamp} {clean_text}")
-    
-    return transcript_lines
-
 def main():
     parser = argparse.ArgumentParser(
         description="Extract YouTube transcripts as MCP resources using yt-dlp",
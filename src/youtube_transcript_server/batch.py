@@ -0,0 +1,62 @@
+"""Concurrent batch extraction.
+
+``iter_batch`` runs one coroutine per item with a bounded number of workers
+and a per-item timeout, and yields results as they complete. A batch
+therefore takes roughly as long as its slowest video instead of the sum of
+all extraction latencies, and one stuck video can't hold up the rest.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from .config import settings
+
+
+def parse_batch_urls(video_urls: str) -> List[str]:
+    """Split a comma-separated URL list, dropping blanks and duplicates (order is kept)."""
+    urls = [url.strip() for url in video_urls.split(',') if url.strip()]
+    return list(dict.fromkeys(urls))
+
+
+async def iter_batch(items: List[Any], worker: Callable[[Any], Awaitable[Any]],
+                     max_workers: Optional[int] = None,
+                     timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Run ``worker`` for every item concurrently and yield results in completion order.
+
+    Args:
+        items: Work items (usually video URLs)
+        worker: Coroutine function called with one item
+        max_workers: Items processed at the same time (defaults to ``BATCH_MAX_WORKERS``)
+        timeout: Seconds allowed per item once it starts (defaults to ``BATCH_VIDEO_TIMEOUT``)
+
+    Yields:
+        Dictionary with the item ``index`` and ``item``, ``success``, the
+        worker ``result`` or an ``error`` message, and ``elapsed`` seconds
+    """
+    max_workers = max(1, max_workers or settings.batch_max_workers)
+    timeout = timeout or settings.batch_video_timeout
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(index: int, item: Any) -> Dict[str, Any]:
+        async with semaphore:
+            started = time.perf_counter()
+            outcome = {'index': index, 'item': item, 'success': False, 'result': None, 'error': None}
+            try:
+                outcome['result'] = await asyncio.wait_for(worker(item), timeout)
+                outcome['success'] = True
+            except asyncio.TimeoutError:
+                outcome['error'] = f"Timed out after {timeout:g}s"
+            except Exception as e:
+                outcome['error'] = str(e)
+            outcome['elapsed'] = round(time.perf_counter() - started, 3)
+            return outcome
+
+    tasks = [asyncio.ensure_future(run(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Stop outstanding work if the consumer gives up early
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,384 @@
+"""Bounded in-memory transcript cache.
+
+Entries are keyed by ``(video_id, language, format, dedup_mode)`` so the same
+video can be cached as timestamped lines, plain text, etc. The cache evicts
+least recently used entries once either the entry limit (``CACHE_SIZE``) or
+the byte budget (``CACHE_MAX_BYTES``) is exceeded, and counts hits, misses
+and evictions for the status resources. The budget covers the memoized
+``TranscriptPipeline`` of an entry too (stages, search index, ...): the cache
+subscribes to it and re-checks the budget whenever it grows.
+
+The cache behaves like a dict so existing code and tests can keep using
+``cached_transcripts[video_id] = {...}``; a bare video ID addresses the
+default variant (English transcript text, no dedup).
+
+Extraction results can also be persisted to a ``DiskCache`` (SQLite) so they
+survive server restarts; memory misses fall through to disk.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .cues import cues_from_lines, pack_timings
+from .pipeline import TranscriptPipeline
+
+CacheKey = Tuple[str, str, str, str]
+
+# Entry fields that only live in memory (memoized objects, not JSON)
+MEMORY_ONLY_KEYS = ("pipeline",)
+
+
+def cache_key(video_id: str, language: str = "en", fmt: str = "text", dedup_mode: str = "none") -> CacheKey:
+    """Build the cache key for one variant of a transcript."""
+    return (video_id, language, fmt, dedup_mode)
+
+
+def split_lines_result(result: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Split an extraction result into transcript text and JSON-safe details.
+
+    The lines are stored once as the transcript text; cues are reduced to
+    compact ``[start_ms, end_ms]`` timings.
+    """
+    details = {key: value for key, value in result.items() if key not in ('lines', 'cues', 'pipeline')}
+    if 'cues' in result:
+        details['cue_timings'] = pack_timings(result['cues'])
+    return '\n'.join(result['lines']), details
+
+
+def rebuild_lines_result(entry: Dict[str, Any], cache: Optional["TranscriptCache"] = None) -> Dict[str, Any]:
+    """Rebuild the lines and cues of a result stored with ``split_lines_result``.
+
+    The entry's ``TranscriptPipeline`` is reused (or created and kept on the
+    entry), so stages computed by earlier calls are not recomputed. Pass the
+    ``cache`` holding the entry so a new pipeline counts toward its budget.
+    """
+    details = {key: value for key, value in entry["result"].items() if key != 'cue_timings'}
+    pipeline = entry.get("pipeline")
+    if pipeline is None:
+        transcript = entry["transcript"]
+        lines = transcript.split('\n') if transcript else []
+        cues = cues_from_lines(lines, entry["result"].get('cue_timings'))
+        pipeline = entry["pipeline"] = TranscriptPipeline(cues, lines=lines)
+        if cache is not None:
+            cache.track(entry)
+    return {**details, 'lines': pipeline.lines(), 'cues': pipeline.raw, 'pipeline': pipeline, 'cached': True}
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory footprint of a cache entry in bytes (string payload only).
+
+    Pipelines are not included; ``TranscriptCache`` adds their ``size_bytes``.
+    """
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    return 0
+
+
+class DiskCache:
+    """SQLite transcript store with a TTL and a total size cap.
+
+    The database is opened lazily, and storage errors are swallowed so a
+    read-only or corrupt cache file never breaks extraction.
+    """
+
+    def __init__(self, path: Path, ttl_seconds: float = 7 * 24 * 3600, max_bytes: int = 200 * 1024 * 1024):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS transcripts (
+                    video_id TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    format TEXT NOT NULL,
+                    dedup_mode TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (video_id, language, format, dedup_mode)
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Get a stored entry, dropping it if it has expired."""
+        if self._conn is None and not self.path.exists():
+            return None  # Nothing stored yet; don't create the database on a read
+
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT payload, created_at FROM transcripts "
+                    "WHERE video_id = ? AND language = ? AND format = ? AND dedup_mode = ?",
+                    key
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[1] > self.ttl_seconds:
+                    conn.execute(
+                        "DELETE FROM transcripts WHERE video_id = ? AND language = ? AND format = ? AND dedup_mode = ?",
+                        key
+                    )
+                    conn.commit()
+                    return None
+                conn.execute(
+                    "UPDATE transcripts SET accessed_at = ? "
+                    "WHERE video_id = ? AND language = ? AND format = ? AND dedup_mode = ?",
+                    (now, *key)
+                )
+                conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, OSError, ValueError):
+            return None
+
+    def put(self, key: CacheKey, entry: Dict[str, Any]) -> None:
+        """Store an entry, then drop expired and least recently used rows past the size cap."""
+        now = time.time()
+        try:
+            payload = json.dumps({key: value for key, value in entry.items() if key not in MEMORY_ONLY_KEYS})
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, payload, len(payload), now, now)
+                )
+                conn.execute("DELETE FROM transcripts WHERE created_at < ?", (now - self.ttl_seconds,))
+
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+                if total > self.max_bytes:
+                    rows = conn.execute(
+                        "SELECT video_id, language, format, dedup_mode, size FROM transcripts "
+                        "ORDER BY accessed_at"
+                    ).fetchall()
+                    for row in rows:
+                        if total <= self.max_bytes or tuple(row[:4]) == tuple(key):
+                            break
+                        conn.execute(
+                            "DELETE FROM transcripts "
+                            "WHERE video_id = ? AND language = ? AND format = ? AND dedup_mode = ?",
+                            row[:4]
+                        )
+                        total -= row[4]
+                conn.commit()
+        except (sqlite3.Error, OSError, TypeError, ValueError):
+            pass
+
+    def clear(self) -> None:
+        """Remove every stored entry."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM transcripts")
+                conn.commit()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number and total size of stored entries."""
+        entries, size = 0, 0
+        try:
+            # Don't create the database just to report on it
+            if self._conn is not None or self.path.exists():
+                with self._lock:
+                    entries, size = self._connect().execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts"
+                    ).fetchone()
+        except (sqlite3.Error, OSError):
+            pass
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+class TranscriptCache(MutableMapping):
+    """LRU transcript cache bounded by entry count and total size."""
+
+    def __init__(self, max_entries: int = 50, max_bytes: int = 50 * 1024 * 1024,
+                 disk: Optional[DiskCache] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.disk_hits = 0
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[CacheKey, int] = {}
+        self._payload_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(key) -> CacheKey:
+        return cache_key(key) if isinstance(key, str) else key
+
+    @property
+    def total_bytes(self) -> int:
+        """Estimated size of the entries, including their pipelines (each counted once)."""
+        pipelines = {id(pipeline): pipeline.size_bytes for pipeline in
+                     (entry.get("pipeline") for entry in self._entries.values()) if pipeline is not None}
+        return self._payload_bytes + sum(pipelines.values())
+
+    def track(self, entry: Dict[str, Any]) -> None:
+        """Count an entry's pipeline toward the byte budget from now on, evicting if it is already over."""
+        pipeline = entry.get("pipeline")
+        if pipeline is not None and pipeline.subscribe(self._pipeline_grew):
+            self._pipeline_grew(pipeline)
+
+    def _pipeline_grew(self, pipeline: TranscriptPipeline) -> None:
+        """Evict other entries if a memoized stage or derived object pushed the cache over budget."""
+        for key in reversed(self._entries):
+            if self._entries[key].get("pipeline") is pipeline:
+                # The entry is in use, so it becomes the most recently used one
+                self._entries.move_to_end(key)
+                self._evict(keep=key)
+                return
+
+    # -- Mapping protocol ---------------------------------------------------
+
+    def __getitem__(self, key) -> Dict[str, Any]:
+        key = self._key(key)
+        entry = self._entries[key]
+        self._entries.move_to_end(key)
+        return entry
+
+    def __setitem__(self, key, value: Dict[str, Any]) -> None:
+        key = self._key(key)
+        if key in self._entries:
+            self._payload_bytes -= self._sizes[key]
+
+        size = estimate_size(value)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._sizes[key] = size
+        self._payload_bytes += size
+        pipeline = value.get("pipeline")
+        if pipeline is not None:
+            pipeline.subscribe(self._pipeline_grew)
+        self._evict(keep=key)
+
+    def __delitem__(self, key) -> None:
+        key = self._key(key)
+        del self._entries[key]
+        self._payload_bytes -= self._sizes.pop(key)
+
+    def __contains__(self, key) -> bool:
+        return self._key(key) in self._entries
+
+    def __iter__(self) -> Iterator[CacheKey]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self._payload_bytes = 0
+
+    # -- Cache API ----------------------------------------------------------
+
+    def lookup(self, key) -> Optional[Dict[str, Any]]:
+        """Get an entry and record a hit or miss.
+
+        Memory misses fall through to the disk cache; entries found there are
+        promoted back into memory.
+        """
+        key = self._key(key)
+        entry = self._entries.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.disk_hits += 1
+                self[key] = entry
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value: Dict[str, Any], persist: bool = False) -> None:
+        """Store an entry, also writing it to the disk cache when ``persist`` is set."""
+        self[key] = value
+        if persist and self.disk is not None:
+            self.disk.put(self._key(key), value)
+
+    def find(self, video_id: str,
+             predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Optional[Dict[str, Any]]:
+        """Get the most recently used entry of any variant for a video.
+
+        Args:
+            video_id: YouTube video ID
+            predicate: Optional filter the entry must satisfy
+        """
+        for key in reversed(self._entries):
+            if key[0] == video_id and (predicate is None or predicate(self._entries[key])):
+                return self._entries[key]
+        return None
+
+    def _evict(self, keep: CacheKey) -> None:
+        """Drop least recently used entries until both limits are met.
+
+        The entry that was just stored (or whose pipeline just grew) is never
+        evicted, even if it alone exceeds the byte budget.
+        """
+        while len(self._entries) > 1 and (
+            len(self._entries) > max(1, self.max_entries) or self.total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            del self[oldest]
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters for status resources."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "size_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "disk_hits": self.disk_hits,
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
+
+
+def create_transcript_cache(settings) -> TranscriptCache:
+    """Build the transcript cache described by a settings object."""
+    disk = None
+    if settings.disk_cache_enabled:
+        disk = DiskCache(
+            Path(settings.resource_dir) / "transcript_cache.sqlite3",
+            ttl_seconds=settings.disk_cache_ttl,
+            max_bytes=settings.disk_cache_max_bytes
+        )
+    return TranscriptCache(settings.cache_size, settings.cache_max_bytes, disk=disk)
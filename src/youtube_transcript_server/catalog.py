@@ -0,0 +1,384 @@
+"""Catalog index of the saved transcript resource files.
+
+Listing resources used to read every ``*.md`` file in the resource directory
+and scan all of its lines for the title and channel. The catalog keeps one
+small JSON manifest (``catalog.json``) with an entry per resource instead:
+
+- ``update()`` records a file right after it is saved, from the content that
+  was just written, so the server never re-reads its own files.
+- ``refresh()`` picks up files added, changed or removed by other tools. The
+  directory is only listed again when its mtime changes (a file was added,
+  removed or renamed); otherwise the known files are just stat'ed, which
+  catches in-place overwrites. Only files whose size or mtime differ from
+  the manifest have their header parsed.
+
+Reads are served from memory, so listing thousands of resources (or
+counting them for a status page) no longer scales with the corpus size.
+``query()`` pages through the catalog with opaque keyset cursors, over sorted
+views that are built once per catalog change.
+"""
+
+import base64
+import bisect
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MANIFEST_NAME = "catalog.json"
+MANIFEST_VERSION = 1
+
+# Only the header (video information and quality metrics) is parsed
+HEADER_BYTES = 8 * 1024
+
+_QUALITY_SCORE_RE = re.compile(r'^- \*\*Quality Score\*\*:?\s*([\d.]+)%', re.MULTILINE)
+
+# Sort orders for paginated listings
+SORT_KEYS = {
+    'created': lambda entry: entry['created'],
+    'size': lambda entry: entry['file_size'],
+    'channel': lambda entry: entry['channel'].casefold()
+}
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(sort_by: str, descending: bool, position: Tuple[Any, str]) -> str:
+    """Encode the position after the last listed resource as a URL-safe cursor."""
+    payload = json.dumps([sort_by, descending, list(position)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, bool, Tuple[Any, str]]:
+    """Decode a cursor from ``encode_cursor``."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_by, descending, (key, video_id) = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return sort_by, bool(descending), (key, video_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _end_of_day(value: str) -> str:
+    """Make a date-only upper bound include the whole day."""
+    return value + "T23:59:59.999999" if len(value) == 10 else value
+
+
+def parse_resource_header(text: str) -> Dict[str, Any]:
+    """Extract title, channel and quality score from the top of a resource file."""
+    title = "Unknown Title"
+    channel = "Unknown Channel"
+
+    for line in text.split('\n'):
+        # Handle both formats: "- **Title**:" (manual) and "- **Title**" (MCP server)
+        if line.startswith('- **Title**:'):
+            title = line.replace('- **Title**:', '').strip()
+        elif line.startswith('- **Title**'):
+            title = line.replace('- **Title**', '').strip().lstrip(':').strip()
+        elif line.startswith('- **Channel**:'):
+            channel = line.replace('- **Channel**:', '').strip()
+        elif line.startswith('- **Channel**'):
+            channel = line.replace('- **Channel**', '').strip().lstrip(':').strip()
+        elif line.startswith('```'):
+            # Transcript bodies start here; the header fields are all above
+            break
+
+    match = _QUALITY_SCORE_RE.search(text)
+    return {
+        'title': title,
+        'channel': channel,
+        'quality_score': float(match.group(1)) if match else None
+    }
+
+
+class ResourceCatalog:
+    """In-memory resource index persisted as a JSON manifest."""
+
+    def __init__(self, directory: Path, pattern: str = "*.md"):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.manifest_path = self.directory / MANIFEST_NAME
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._directory_mtime: Optional[int] = None
+        # Sorted (keys, entries) views per sort key, dropped whenever an entry changes
+        self._views: Dict[str, Tuple[List[Tuple[Any, str]], List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self._suffix = Path(pattern).suffix
+        self.scans = 0
+        self.parsed = 0
+
+    # -- Manifest -----------------------------------------------------------
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('resources', {})
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically (temp file + rename)."""
+        payload = json.dumps({'version': MANIFEST_VERSION, 'resources': self._entries})
+        temp_path = self.manifest_path.with_suffix('.json.tmp')
+        try:
+            temp_path.write_text(payload, encoding='utf-8')
+            os.replace(temp_path, self.manifest_path)
+        except OSError:
+            pass
+
+    def _directory_stamp(self) -> Optional[int]:
+        try:
+            return self.directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    # -- Indexing -----------------------------------------------------------
+
+    def _entry(self, path: Path, stat: os.stat_result, header: str) -> Dict[str, Any]:
+        self.parsed += 1
+        return {
+            'video_id': path.stem,
+            **parse_resource_header(header),
+            'file_size': stat.st_size,
+            'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            'mtime_ns': stat.st_mtime_ns
+        }
+
+    @staticmethod
+    def _read_header(path: Path) -> str:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read(HEADER_BYTES)
+
+    def _scan(self) -> bool:
+        """Reconcile the index with the directory; returns whether anything changed."""
+        self.scans += 1
+        changed = False
+        seen = set()
+        for path in self.directory.glob(self.pattern):
+            try:
+                stat = path.stat()
+                video_id = path.stem
+                seen.add(video_id)
+                known = self._entries.get(video_id)
+                if known is not None and known['mtime_ns'] == stat.st_mtime_ns and known['file_size'] == stat.st_size:
+                    continue
+                self._entries[video_id] = self._entry(path, stat, self._read_header(path))
+                changed = True
+            except OSError:
+                continue
+
+        for video_id in [video_id for video_id in self._entries if video_id not in seen]:
+            del self._entries[video_id]
+            changed = True
+        return changed
+
+    def _check_entries(self) -> bool:
+        """Re-parse known files rewritten in place (no directory listing); returns whether anything changed."""
+        changed = False
+        for video_id, known in list(self._entries.items()):
+            path = self.directory / f"{video_id}{self._suffix}"
+            try:
+                stat = path.stat()
+                if known['mtime_ns'] == stat.st_mtime_ns and known['file_size'] == stat.st_size:
+                    continue
+                self._entries[video_id] = self._entry(path, stat, self._read_header(path))
+            except OSError:
+                del self._entries[video_id]
+            changed = True
+        return changed
+
+    def refresh(self) -> None:
+        """Bring the index up to date, rescanning the directory only if its listing changed."""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load_manifest()
+            stamp = self._directory_stamp()
+            if stamp is None:
+                self._entries.clear()
+                self._views.clear()
+                self._directory_mtime = None
+                return
+            if stamp == self._directory_mtime:
+                # Overwriting a file in place does not touch the directory
+                if self._check_entries():
+                    self._views.clear()
+                    self._save_manifest()
+                    self._directory_mtime = self._directory_stamp()
+                return
+            if self._scan():
+                self._views.clear()
+                self._save_manifest()
+            # Our own manifest write touches the directory too
+            self._directory_mtime = self._directory_stamp()
+
+    def update(self, path: Path, content: Optional[str] = None) -> None:
+        """Record a resource file that was just written (``content`` avoids re-reading it)."""
+        path = Path(path)
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load_manifest()
+            try:
+                stat = path.stat()
+                header = content[:HEADER_BYTES] if content is not None else self._read_header(path)
+            except OSError:
+                return
+            fresh = self._directory_mtime is not None and self._directory_mtime == self._directory_stamp()
+            self._entries[path.stem] = self._entry(path, stat, header)
+            self._views.clear()
+            self._save_manifest()
+            if fresh:
+                # Nothing else changed since the last scan: the new stamp only reflects our writes
+                self._directory_mtime = self._directory_stamp()
+
+    def remove(self, video_id: str) -> None:
+        """Forget a resource (its file was deleted)."""
+        with self._lock:
+            if self._entries is not None and self._entries.pop(video_id, None) is not None:
+                self._views.clear()
+                self._save_manifest()
+
+    # -- Queries ------------------------------------------------------------
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All resources, newest first."""
+        self.refresh()
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        return sorted(entries, key=lambda entry: entry['created'], reverse=True)
+
+    def get(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Catalog entry of one resource."""
+        self.refresh()
+        with self._lock:
+            entry = self._entries.get(video_id)
+            return dict(entry) if entry is not None else None
+
+    def ids(self) -> List[str]:
+        """Video IDs of all resources."""
+        return [entry['video_id'] for entry in self.entries()]
+
+    def __len__(self) -> int:
+        self.refresh()
+        with self._lock:
+            return len(self._entries)
+
+    def _view(self, sort_by: str) -> Tuple[List[Tuple[Any, str]], List[Dict[str, Any]]]:
+        """Entries in ascending ``(sort key, video_id)`` order, sorted once per catalog change."""
+        view = self._views.get(sort_by)
+        if view is None:
+            sort_key = SORT_KEYS[sort_by]
+            ordered = sorted(((sort_key(entry), entry['video_id']), entry) for entry in self._entries.values())
+            view = self._views[sort_by] = ([key for key, _ in ordered], [entry for _, entry in ordered])
+        return view
+
+    def query(self, sort_by: str = "created", descending: bool = True, cursor: Optional[str] = None,
+              limit: int = DEFAULT_PAGE_SIZE, channel: Optional[str] = None,
+              created_after: Optional[str] = None, created_before: Optional[str] = None,
+              min_quality: Optional[float] = None, max_quality: Optional[float] = None) -> Dict[str, Any]:
+        """Get one page of resources.
+
+        Args:
+            sort_by: One of ``SORT_KEYS`` (created, size, channel)
+            descending: Sort direction
+            cursor: ``next_cursor`` of the previous page; pages stay stable when resources are added
+            limit: Page size, capped at ``MAX_PAGE_SIZE``
+            channel: Case-insensitive substring of the channel name
+            created_after: ISO date or datetime (inclusive)
+            created_before: ISO date or datetime (inclusive; a date covers the whole day)
+            min_quality: Lowest quality score; resources without a score are excluded
+            max_quality: Highest quality score; resources without a score are excluded
+
+        Returns:
+            ``resources`` of the page, ``next_cursor`` (None on the last page)
+            and ``total`` resources matching the filters
+
+        Raises:
+            ValueError: For an unknown sort key or a cursor from another sort order
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_by} (use one of: {', '.join(SORT_KEYS)})")
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        position = None
+        if cursor:
+            cursor_sort, cursor_descending, position = decode_cursor(cursor)
+            if (cursor_sort, cursor_descending) != (sort_by, descending):
+                raise ValueError("Cursor does not match the requested sort order")
+
+        matches = self._filter(channel, created_after, created_before, min_quality, max_quality)
+
+        self.refresh()
+        with self._lock:
+            keys, entries = self._view(sort_by)
+            # Keyset pagination: resume strictly after the cursor's (key, video_id)
+            if descending:
+                stop = bisect.bisect_left(keys, tuple(position)) if position else len(keys)
+                indices = range(stop - 1, -1, -1)
+            else:
+                start = bisect.bisect_right(keys, tuple(position)) if position else 0
+                indices = range(start, len(keys))
+            total = sum(1 for entry in entries if matches(entry))
+
+            page = []
+            last_key = None
+            has_more = False
+            for index in indices:
+                entry = entries[index]
+                if not matches(entry):
+                    continue
+                if len(page) == limit:
+                    has_more = True
+                    break
+                page.append(dict(entry))
+                last_key = keys[index]
+
+        return {
+            'resources': page,
+            'next_cursor': encode_cursor(sort_by, descending, last_key) if has_more else None,
+            'total': total,
+            'sort_by': sort_by,
+            'descending': descending,
+            'limit': limit
+        }
+
+    @staticmethod
+    def _filter(channel: Optional[str], created_after: Optional[str], created_before: Optional[str],
+                min_quality: Optional[float], max_quality: Optional[float]) -> Callable[[Dict[str, Any]], bool]:
+        """Build the filter predicate of a query."""
+        channel = channel.casefold() if channel else None
+        created_before = _end_of_day(created_before) if created_before else None
+        check_quality = min_quality is not None or max_quality is not None
+
+        def matches(entry: Dict[str, Any]) -> bool:
+            if channel and channel not in entry['channel'].casefold():
+                return False
+            if created_after and entry['created'] < created_after:
+                return False
+            if created_before and entry['created'] > created_before:
+                return False
+            if check_quality:
+                score = entry.get('quality_score')
+                if score is None:
+                    return False
+                if min_quality is not None and score < min_quality:
+                    return False
+                if max_quality is not None and score > max_quality:
+                    return False
+            return True
+
+        return matches
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for status resources."""
+        return {
+            "resources": len(self),
+            "manifest": str(self.manifest_path),
+            "scans": self.scans,
+            "headers_parsed": self.parsed
+        }
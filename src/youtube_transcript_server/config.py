@@ -1,6 +1,7 @@
 """Server configuration settings."""
 
 import os
+from pathlib import Path
 from typing import Optional
 
 
@@ -12,10 +13,27 @@ class Settings:
         self.version = "0.3.0"
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         self.cache_size = int(os.getenv("CACHE_SIZE", "50"))
+        # Byte budget for the in-memory transcript cache (LRU eviction past either limit)
+        self.cache_max_bytes = int(os.getenv("CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+        self.resource_dir = Path(os.getenv("RESOURCE_DIR", "resources/transcripts"))
+        # Persistent SQLite cache under resource_dir so restarts don't re-run yt-dlp
+        self.disk_cache_enabled = os.getenv("DISK_CACHE_ENABLED", "true").lower() == "true"
+        self.disk_cache_ttl = int(os.getenv("DISK_CACHE_TTL", str(7 * 24 * 3600)))
+        self.disk_cache_max_bytes = int(os.getenv("DISK_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
         self.default_language = os.getenv("DEFAULT_LANGUAGE", "en")
         # Claude Desktop has a 100,000 character limit for tool responses
         self.max_output_chars = int(os.getenv("MAX_OUTPUT_CHARS", "95000"))  # Slightly under limit
         self.enable_smart_truncation = os.getenv("ENABLE_SMART_TRUNCATION", "true").lower() == "true"
+        # Upper bound on yt-dlp extractions running at the same time
+        self.max_concurrent_extractions = int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "4"))
+        # "library" runs yt_dlp in-process, "subprocess" shells out to the yt-dlp CLI
+        self.extraction_engine = os.getenv("EXTRACTION_ENGINE", "library").lower()
+        # Batch tools: videos processed at once, per-video time limit (seconds) and URLs per call
+        self.batch_max_workers = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+        self.batch_video_timeout = float(os.getenv("BATCH_VIDEO_TIMEOUT", "180"))
+        self.batch_max_urls = int(os.getenv("BATCH_MAX_URLS", "50"))
+        # Rebuild the word stream of rolling auto-captions instead of comparing neighbouring cues
+        self.rolling_dedup = os.getenv("ROLLING_DEDUP", "true").lower() == "true"
     
     @property
     def server_info(self) -> dict:
@@ -25,9 +43,20 @@ class Settings:
             "version": self.version,
             "log_level": self.log_level,
             "cache_size": self.cache_size,
+            "cache_max_bytes": self.cache_max_bytes,
+            "resource_dir": str(self.resource_dir),
+            "disk_cache_enabled": self.disk_cache_enabled,
+            "disk_cache_ttl": self.disk_cache_ttl,
+            "disk_cache_max_bytes": self.disk_cache_max_bytes,
             "default_language": self.default_language,
             "max_output_chars": self.max_output_chars,
-            "enable_smart_truncation": self.enable_smart_truncation
+            "enable_smart_truncation": self.enable_smart_truncation,
+            "max_concurrent_extractions": self.max_concurrent_extractions,
+            "extraction_engine": self.extraction_engine,
+            "batch_max_workers": self.batch_max_workers,
+            "batch_video_timeout": self.batch_video_timeout,
+            "batch_max_urls": self.batch_max_urls,
+            "rolling_dedup": self.rolling_dedup
         }
 
 
@@ -60,7 +89,7 @@ This transcript was truncated due to Claude Desktop's 100,000 character display
 
 **To get the full transcript:**
 - Use `search_transcript` to find specific content
-- Request specific time ranges or topics
+- Use `get_transcript_segment` to read specific time ranges
 - Use analysis tools which process the full transcript internally
 
 **Available options:**
@@ -0,0 +1,132 @@
+"""Structured transcript cues.
+
+Parsers emit ``Cue`` objects (start/end in milliseconds plus text) and the
+processing stages (deduplication, quality scoring, plain text, search) work
+on them directly. The ``"[MM:SS] text"`` strings shown to users are rendered
+only at output time with ``render_lines``.
+
+Cached results keep the rendered lines plus compact ``[start_ms, end_ms]``
+timings, from which ``cues_from_lines`` rebuilds the cues without losing
+sub-second precision.
+"""
+
+import math
+import re
+from typing import Iterable, List, Optional, Sequence, Union
+
+_TIMESTAMP_RE = re.compile(r'\[(?:(\d+):)?(\d+):(\d{2})\]')
+
+
+class Cue:
+    """One caption: start/end offsets in milliseconds and its text."""
+
+    __slots__ = ('start_ms', 'end_ms', 'text')
+
+    def __init__(self, start_ms: Optional[int], end_ms: Optional[int], text: str):
+        self.start_ms = start_ms
+        self.end_ms = end_ms if end_ms is not None else start_ms
+        self.text = text
+
+    @property
+    def start(self) -> Optional[float]:
+        """Start offset in seconds."""
+        return self.start_ms / 1000 if self.start_ms is not None else None
+
+    @property
+    def end(self) -> Optional[float]:
+        """End offset in seconds."""
+        return self.end_ms / 1000 if self.end_ms is not None else None
+
+    @property
+    def timestamp(self) -> str:
+        """Rendered start time (``[MM:SS]`` or ``[HH:MM:SS]``), empty for untimed cues."""
+        return format_timestamp(self.start_ms / 1000) if self.start_ms is not None else ""
+
+    def render(self) -> str:
+        """Render the cue as a ``"[MM:SS] text"`` transcript line."""
+        if self.start_ms is None:
+            return self.text
+        return f"{self.timestamp} {self.text}"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Cue):
+            return NotImplemented
+        return (self.start_ms, self.end_ms, self.text) == (other.start_ms, other.end_ms, other.text)
+
+    def __repr__(self) -> str:
+        return f"Cue({self.start_ms}, {self.end_ms}, {self.text!r})"
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds to MM:SS or HH:MM:SS timestamp."""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = int(seconds % 60)
+
+    if hours > 0:
+        return f"[{hours:02d}:{minutes:02d}:{secs:02d}]"
+    else:
+        return f"[{minutes:02d}:{secs:02d}]"
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a time offset as plain seconds to the millisecond (``90``, ``1000010.25``), as ``parse_time`` reads it."""
+    return f"{seconds:.3f}".rstrip('0').rstrip('.')
+
+
+def parse_time(value: Union[str, int, float]) -> float:
+    """Parse a time offset in seconds: ``90``, ``90.5``, ``1:30`` or ``01:02:03``.
+
+    Raises:
+        ValueError: For anything else, or a negative or non-finite (``inf``, ``nan``) offset
+    """
+    text = str(value).strip().strip('[]')
+    parts = text.split(':')
+    try:
+        if len(parts) > 3 or any(not part for part in parts):
+            raise ValueError
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+    except ValueError:
+        raise ValueError(f"Invalid time: {value!r} (use seconds, MM:SS or HH:MM:SS)")
+    if not math.isfinite(seconds):
+        raise ValueError(f"Invalid time: {value!r} (must be a finite number)")
+    if seconds < 0:
+        raise ValueError(f"Invalid time: {value!r} (must not be negative)")
+    return seconds
+
+
+def render_lines(cues: Iterable[Cue]) -> List[str]:
+    """Render cues as ``"[MM:SS] text"`` transcript lines."""
+    return [cue.render() for cue in cues]
+
+
+def cue_from_line(line: str) -> Cue:
+    """Parse a rendered transcript line back into a cue (second precision)."""
+    line = line.strip()
+    match = _TIMESTAMP_RE.match(line)
+    if match is None:
+        return Cue(None, None, line)
+    hours, minutes, seconds = match.groups()
+    start_ms = ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000
+    return Cue(start_ms, start_ms, line[match.end():].strip())
+
+
+def cues_from_lines(lines: Sequence[str], timings: Optional[Sequence[Sequence[int]]] = None) -> List[Cue]:
+    """Rebuild cues from rendered lines, using stored ``[start_ms, end_ms]`` timings when they match."""
+    cues = [cue_from_line(line) for line in lines]
+    if timings is not None and len(timings) == len(cues):
+        for cue, (start_ms, end_ms) in zip(cues, timings):
+            cue.start_ms, cue.end_ms = start_ms, end_ms
+    return cues
+
+
+def pack_timings(cues: Iterable[Cue]) -> List[List[Optional[int]]]:
+    """Get compact ``[start_ms, end_ms]`` pairs for caching alongside rendered lines."""
+    return [[cue.start_ms, cue.end_ms] for cue in cues]
+
+
+def as_cues(items: Sequence[Union[Cue, str]]) -> List[Cue]:
+    """Accept cues or rendered transcript lines and return cues."""
+    return [item if isinstance(item, Cue) else cue_from_line(item) for item in items]
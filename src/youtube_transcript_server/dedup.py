@@ -0,0 +1,152 @@
+"""Transcript deduplication shared by both servers and the CLI."""
+
+import string
+from typing import List, Sequence, Union
+
+from .cues import Cue, as_cues, render_lines
+
+# Non-speech captions that carry no transcript content
+NON_SPEECH_CAPTIONS = {'[Music]', '[Applause]', '[Laughter]'}
+
+# Shortest partial overlap treated as a rolling repeat; a single shared word
+# ("... and I" / "I think ...") is usually real speech
+MIN_ROLLING_OVERLAP = 2
+
+
+def deduplicate_cues(cues: Sequence[Cue], aggressive: bool = False) -> List[Cue]:
+    """Remove duplicate consecutive text while preserving timestamps.
+
+    This fixes the common issue where YouTube auto-captions repeat the same text
+    across multiple timestamps as speech continues.
+
+    Args:
+        cues: Transcript cues in time order
+        aggressive: Also drop cues whose words mostly overlap the previous cue
+            (used for AI analysis and auto-caption VTT)
+    """
+    deduplicated = []
+    last_clean_text = ""
+    last_words = set()
+
+    for cue in cues:
+        text = cue.text
+
+        if not text or text in NON_SPEECH_CAPTIONS:
+            continue
+
+        # Clean text for comparison (remove extra spaces, normalize)
+        clean_text = ' '.join(text.split()).lower()
+
+        # Skip if this is an exact duplicate of the last cue
+        if clean_text == last_clean_text:
+            continue
+
+        # Skip if this text is completely contained in the last text
+        if last_clean_text and clean_text in last_clean_text and len(clean_text) < len(last_clean_text) * 0.8:
+            continue
+
+        # Skip if the last text is completely contained in this text
+        # but this text is much longer (likely an extension)
+        if last_clean_text and last_clean_text in clean_text:
+            if len(clean_text) > len(last_clean_text) * 1.3:
+                # Replace the last entry with this more complete one
+                if deduplicated:
+                    deduplicated[-1] = cue
+                    last_clean_text = clean_text
+                    continue
+
+        if aggressive:
+            # Advanced duplicate detection: check word overlap
+            current_words = set(clean_text.split())
+            if last_words and len(current_words) > 3:
+                # Calculate overlap percentage
+                overlap = len(current_words.intersection(last_words))
+                overlap_percentage = overlap / min(len(current_words), len(last_words))
+
+                # If more than 75% word overlap and similar length, skip
+                if (overlap_percentage > 0.75 and
+                    abs(len(current_words) - len(last_words)) <= 3):
+                    continue
+
+            last_words = current_words
+
+        deduplicated.append(cue)
+        last_clean_text = clean_text
+
+    return deduplicated
+
+
+def _overlap_length(tail: Sequence[str], words: Sequence[str]) -> int:
+    """Length of the longest prefix of ``words`` that is a suffix of ``tail`` (KMP, linear time)."""
+    if not tail or not words:
+        return 0
+
+    # Prefix function of the cue words
+    failure = [0] * len(words)
+    k = 0
+    for i in range(1, len(words)):
+        while k and words[i] != words[k]:
+            k = failure[k - 1]
+        if words[i] == words[k]:
+            k += 1
+        failure[i] = k
+
+    # Run the tail through the automaton; the final state is the overlap
+    k = 0
+    for word in tail:
+        while k and (k == len(words) or word != words[k]):
+            k = failure[k - 1]
+        if word == words[k]:
+            k += 1
+    return k
+
+
+def deduplicate_rolling_cues(cues: Sequence[Cue]) -> List[Cue]:
+    """Rebuild the continuous word stream from rolling auto-captions.
+
+    YouTube auto-generated VTT shows a rolling window: each cue repeats the
+    tail of the previous ones and adds a few new words. Each cue's words are
+    matched against the end of the words emitted so far (suffix/prefix
+    overlap via KMP), and only the new words are kept, with that cue's timing.
+    Work is linear in the number of words.
+    """
+    deduplicated = []
+    # Normalised words emitted so far; only the last len(cue) words can overlap
+    stream: List[str] = []
+
+    for cue in cues:
+        text = cue.text
+        if not text or text in NON_SPEECH_CAPTIONS:
+            continue
+
+        words = text.split()
+        normalised = [word.strip(string.punctuation).lower() for word in words]
+        overlap = _overlap_length(stream[-len(normalised):], normalised)
+        if overlap == len(words):
+            continue
+        if overlap < MIN_ROLLING_OVERLAP:
+            overlap = 0
+
+        deduplicated.append(Cue(cue.start_ms, cue.end_ms, ' '.join(words[overlap:])))
+        stream.extend(normalised[overlap:])
+        # Keep the tail bounded so memory stays flat on long videos
+        if len(stream) > 4096:
+            del stream[:-1024]
+
+    return deduplicated
+
+
+def deduplicate_vtt_cues(cues: Sequence[Cue], aggressive: bool = True, rolling: bool = True) -> List[Cue]:
+    """Deduplicate auto-caption VTT cues with the rolling or the consecutive-cue deduplicator."""
+    if rolling:
+        return deduplicate_rolling_cues(cues)
+    return deduplicate_cues(cues, aggressive)
+
+
+def deduplicate_transcript_lines(lines: Sequence[Union[Cue, str]], aggressive: bool = False) -> List[Union[Cue, str]]:
+    """Deduplicate cues or rendered ``"[MM:SS] text"`` lines, returning the same kind."""
+    if not lines:
+        return list(lines)
+    if isinstance(lines[0], Cue):
+        return deduplicate_cues(lines, aggressive)
+    return render_lines(deduplicate_cues(as_cues(lines), aggressive))
@@ -0,0 +1,396 @@
+"""yt-dlp extraction engines.
+
+Two interchangeable engines are provided:
+
+- ``LibraryEngine`` drives ``yt_dlp.YoutubeDL`` in-process. Each worker thread
+  keeps one long-lived ``YoutubeDL`` instance, a single ``extract_info`` call
+  returns the metadata together with every subtitle track URL, and the chosen
+  subtitle body is fetched straight into memory.
+- ``SubprocessEngine`` shells out to the ``yt-dlp`` binary through
+  ``run_ytdlp``. It is kept as a fallback and as a baseline for benchmarks.
+
+The engine is selected with the ``EXTRACTION_ENGINE`` environment variable
+(``library`` or ``subprocess``); ``get_engine()`` returns the shared instance.
+"""
+
+import asyncio
+import glob
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .config import settings
+from .ytdlp_runner import run_ytdlp, check_ytdlp_available_async
+
+# Subtitle formats ordered by quality (SRV1 avoids the VTT duplication issue)
+SUBTITLE_FORMATS = ['srv1', 'json3', 'ttml', 'vtt']
+
+
+class SubprocessEngine:
+    """Extraction engine that runs the yt-dlp command line tool."""
+
+    name = "subprocess"
+
+    async def available(self) -> bool:
+        """Check if the yt-dlp binary can be executed."""
+        return await check_ytdlp_available_async()
+
+    async def version(self) -> Optional[str]:
+        """Get the yt-dlp version string."""
+        result = await run_ytdlp(['--version'], timeout=5)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    async def extract_info(self, video_url: str, timeout: float = 30) -> Dict[str, Any]:
+        """Get the full info dict for a video (equivalent to ``--dump-json``)."""
+        result = await run_ytdlp(['--dump-json', '--no-download', video_url], timeout=timeout)
+        if result.returncode != 0:
+            raise Exception(f"yt-dlp failed: {result.stderr.strip()}")
+        return json.loads(result.stdout)
+
+    async def fetch_subtitles(self, video_url: str, language: str = "en",
+                              formats: Optional[List[str]] = None,
+                              info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch the best available subtitle track and return its content.
+
+        The track is chosen from the info dict (fetched with ``--dump-json``
+        when not supplied) and downloaded directly. If that fails, the
+        per-format ``--write-subs`` download loop is used instead.
+        """
+        try:
+            if info is None:
+                info = await self.extract_info(video_url)
+        except subprocess.TimeoutExpired:
+            raise
+        except Exception:
+            info = None
+
+        if info is not None:
+            track = select_subtitle_track(info, language, formats)
+            if track is None:
+                raise Exception("No subtitle formats available")
+            try:
+                content = await asyncio.to_thread(_fetch_url, track['url'])
+                remember_subtitle_format(video_url, language, track['format'])
+                return {
+                    'content': content,
+                    'format': track['format'],
+                    'language': track['language'],
+                    'automatic': track['automatic']
+                }
+            except OSError:
+                pass  # Signed track URLs occasionally fail; let yt-dlp download instead
+
+        temp_dir = tempfile.mkdtemp(prefix="ytdlp_mcp_")
+        try:
+            subtitle_file, actual_format = await download_subtitles_with_fallback(
+                video_url, language, temp_dir, formats
+            )
+            with open(subtitle_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            # Files are named <title>.<lang>.<ext>
+            track_language = os.path.basename(subtitle_file).rsplit('.', 2)[-2]
+            return {
+                'content': content,
+                'format': actual_format,
+                'language': track_language,
+                'automatic': None
+            }
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _fetch_url(url: str, timeout: float = 60) -> str:
+    """Download a subtitle track with the standard library (subprocess engine)."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return response.read().decode('utf-8', errors='replace')
+
+
+class _QuietLogger:
+    """Swallow yt-dlp log output (stdout is reserved for the MCP stdio transport)."""
+
+    def debug(self, msg):
+        pass
+
+    def info(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+    def error(self, msg):
+        pass
+
+
+class LibraryEngine:
+    """Extraction engine that uses ``yt_dlp.YoutubeDL`` in-process."""
+
+    name = "library"
+
+    def __init__(self):
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @staticmethod
+    def is_installed() -> bool:
+        """Check if the yt_dlp package can be imported."""
+        try:
+            import yt_dlp  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the bounded worker pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.max_concurrent_extractions),
+                    thread_name_prefix="ytdlp"
+                )
+            return self._executor
+
+    def _get_ydl(self):
+        """Get the long-lived YoutubeDL instance owned by the current worker thread."""
+        ydl = getattr(self._local, 'ydl', None)
+        if ydl is None:
+            import yt_dlp
+
+            ydl = yt_dlp.YoutubeDL({
+                'quiet': True,
+                'no_warnings': True,
+                'noprogress': True,
+                'skip_download': True,
+                'socket_timeout': 30,
+                'logger': _QuietLogger(),
+            })
+            self._local.ydl = ydl
+        return ydl
+
+    async def _run(self, timeout: float, description: str, func, *args):
+        """Run a blocking yt_dlp call in the worker pool."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), func, *args)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # Keep the exception type callers already handle for the CLI path
+            raise subprocess.TimeoutExpired(description, timeout)
+
+    async def available(self) -> bool:
+        """Check if the yt_dlp package is importable (no process is spawned)."""
+        return self.is_installed()
+
+    async def version(self) -> Optional[str]:
+        """Get the yt_dlp package version."""
+        if not self.is_installed():
+            return None
+        from yt_dlp.version import __version__
+        return __version__
+
+    def _extract_info_sync(self, video_url: str) -> Dict[str, Any]:
+        ydl = self._get_ydl()
+        info = ydl.extract_info(video_url, download=False)
+        return ydl.sanitize_info(info)
+
+    def _fetch_url_sync(self, url: str) -> str:
+        with self._get_ydl().urlopen(url) as response:
+            return response.read().decode('utf-8', errors='replace')
+
+    async def extract_info(self, video_url: str, timeout: float = 30) -> Dict[str, Any]:
+        """Get the full info dict for a video, including subtitle track URLs."""
+        return await self._run(timeout, f"extract_info {video_url}", self._extract_info_sync, video_url)
+
+    async def fetch_subtitles(self, video_url: str, language: str = "en",
+                              formats: Optional[List[str]] = None,
+                              info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch the best available subtitle track into memory.
+
+        Args:
+            video_url: YouTube video URL
+            language: Preferred subtitle language (English is used as fallback)
+            formats: Subtitle formats in order of preference
+            info: Info dict from a previous ``extract_info`` call, if available
+
+        Returns:
+            Dictionary with the subtitle ``content``, ``format``, ``language``
+            and whether the track is an ``automatic`` caption
+        """
+        if info is None:
+            info = await self.extract_info(video_url)
+
+        track = select_subtitle_track(info, language, formats)
+        if track is None:
+            raise Exception("No subtitle formats available")
+
+        content = await self._run(60, f"fetch subtitles {video_url}", self._fetch_url_sync, track['url'])
+        remember_subtitle_format(video_url, language, track['format'])
+        return {
+            'content': content,
+            'format': track['format'],
+            'language': track['language'],
+            'automatic': track['automatic']
+        }
+
+
+def select_subtitle_track(info: Dict[str, Any], language: str = "en",
+                          formats: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """Pick the best subtitle track from a yt-dlp info dict.
+
+    The requested language wins over the English fallback, manual subtitles
+    win over automatic captions within a language, and only then are formats
+    tried in order of preference.
+    """
+    formats = formats or SUBTITLE_FORMATS
+    languages = [language] if language == 'en' else [language, 'en']
+
+    subtitles = info.get('subtitles') or {}
+    automatic_captions = info.get('automatic_captions') or {}
+
+    for lang in languages:
+        for automatic, tracks in ((False, subtitles.get(lang) or []), (True, automatic_captions.get(lang) or [])):
+            for fmt in formats:
+                for track in tracks:
+                    if track.get('ext') == fmt and track.get('url'):
+                        return {'url': track['url'], 'format': fmt, 'language': lang, 'automatic': automatic}
+
+    return None
+
+
+def list_subtitle_languages(info: Dict[str, Any]) -> List[str]:
+    """List the manually created subtitle languages of a video."""
+    return sorted(lang for lang in (info.get('subtitles') or {}) if lang != 'live_chat')
+
+
+async def fetch_video_bundle(video_url: str, language: str = "en",
+                             formats: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Get video metadata and the best subtitle track in a single pass.
+
+    The info dict is fetched once, the best format is chosen up front from
+    its ``subtitles``/``automatic_captions`` entries and only that track is
+    downloaded.
+
+    Returns:
+        Dictionary with the raw ``info`` dict, the ``subtitles`` track
+        (see ``fetch_subtitles``) and the ``available_languages``
+    """
+    engine = get_engine()
+    info = await engine.extract_info(video_url)
+    subtitles = await engine.fetch_subtitles(video_url, language, formats, info=info)
+
+    available_languages = list_subtitle_languages(info)
+    if subtitles.get('automatic') and subtitles['language'] not in available_languages:
+        available_languages.append(f"{subtitles['language']} (auto)")
+
+    return {
+        'info': info,
+        'subtitles': subtitles,
+        'available_languages': available_languages
+    }
+
+
+# Winning subtitle format per (video_id, language), most recent last
+_known_formats: "OrderedDict[tuple, str]" = OrderedDict()
+_KNOWN_FORMATS_LIMIT = 1024
+
+
+def _video_key(video_url: str) -> str:
+    """Get the video ID from a URL (the URL itself when no ID is found)."""
+    match = re.search(r'(?:v=|youtu\.be/|embed/|shorts/|live/)([A-Za-z0-9_-]{11})', video_url)
+    return match.group(1) if match else video_url
+
+
+def remember_subtitle_format(video_url: str, language: str, fmt: str) -> None:
+    """Record which subtitle format was used for a video."""
+    key = (_video_key(video_url), language)
+    _known_formats[key] = fmt
+    _known_formats.move_to_end(key)
+    while len(_known_formats) > _KNOWN_FORMATS_LIMIT:
+        _known_formats.popitem(last=False)
+
+
+def known_subtitle_format(video_url: str, language: str) -> Optional[str]:
+    """Get the subtitle format that last worked for a video, if any."""
+    return _known_formats.get((_video_key(video_url), language))
+
+
+def find_subtitle_file(temp_dir: str, languages: List[str], formats: List[str]) -> Optional[tuple[str, str]]:
+    """Find the best downloaded subtitle file, detecting its format from the extension.
+
+    Files are named ``<title>.<lang>.<ext>``; the requested language wins over
+    the English fallback, then formats are tried in order of preference.
+    """
+    for lang in languages:
+        for fmt in formats:
+            subtitle_files = glob.glob(os.path.join(glob.escape(temp_dir), f'*.{lang}.{fmt}'))
+            if subtitle_files:
+                return subtitle_files[0], fmt
+    return None
+
+
+async def download_subtitles_with_fallback(video_url: str, language: str = "en", temp_dir: Optional[str] = None,
+                                           formats: Optional[List[str]] = None) -> tuple[str, str]:
+    """Download subtitles in a single yt-dlp run, letting it pick the best available format.
+
+    All acceptable formats are passed as one ``--sub-format srv1/json3/ttml/vtt``
+    preference list instead of probing them one process at a time. The format
+    that won is detected from the file extension and remembered for the video,
+    so later downloads ask for it first.
+    """
+    formats = list(formats or SUBTITLE_FORMATS)
+    known = known_subtitle_format(video_url, language)
+    if known in formats:
+        formats.remove(known)
+        formats.insert(0, known)
+    languages = [language] if language == 'en' else [language, 'en']
+
+    args = [
+        '--write-auto-subs',
+        '--write-subs',
+        '--sub-lang', ','.join(languages),
+        '--sub-format', '/'.join(formats),
+        '--skip-download',
+        '--output', f'{temp_dir}/%(title)s.%(ext)s',
+        video_url
+    ]
+
+    result = await run_ytdlp(args, timeout=60)
+    found = find_subtitle_file(temp_dir, languages, formats) if result.returncode == 0 else None
+    if found is None:
+        raise Exception("No subtitle formats available")
+
+    remember_subtitle_format(video_url, language, found[1])
+    return found
+
+
+_engines: Dict[str, Any] = {}
+
+
+def get_engine(name: Optional[str] = None):
+    """Get the shared extraction engine.
+
+    Args:
+        name: ``library`` or ``subprocess``; defaults to ``settings.extraction_engine``.
+            The library engine falls back to the subprocess engine when the
+            yt_dlp package is not importable.
+    """
+    name = (name or settings.extraction_engine).lower()
+    if name not in ('library', 'subprocess'):
+        raise ValueError(f"Unknown extraction engine: {name}")
+    if name == 'library' and not LibraryEngine.is_installed():
+        name = 'subprocess'
+
+    engine = _engines.get(name)
+    if engine is None:
+        engine = LibraryEngine() if name == 'library' else SubprocessEngine()
+        _engines[name] = engine
+    return engine
@@ -8,17 +8,26 @@ and markdown generation capabilities shared between the MCP server and standalon
 import re
 import json
 import subprocess
-import tempfile
-import shutil
 import os
-import glob
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import html
+from typing import List, Dict, Any, Optional, Union
 
 # Import configuration
 from .config import settings
+from .engines import get_engine, fetch_video_bundle, download_subtitles_with_fallback
+from . import resources
+from .cache import rebuild_lines_result
+from .singleflight import coalesce
+# Shared extraction core, re-exported for existing importers
+from .parsers import parse_subtitle_content, parse_subtitle_cues, parse_subtitle_file
+from .dedup import NON_SPEECH_CAPTIONS, deduplicate_cues, deduplicate_transcript_lines, deduplicate_vtt_cues
+from .cues import Cue, as_cues, render_lines
+from .pipeline import AGGRESSIVE, RAW, TranscriptPipeline, as_pipeline, pipeline_for
+from .quality import (
+    count_duplicates, is_current_quality, load_quality_sidecar, quality_sidecar_path, stamp_quality_version
+)
 
 # Note: youtube-transcript-api removed due to cloud server blocking issues
 # This module now uses only yt-dlp for reliable transcript extraction
@@ -51,16 +60,14 @@ def check_ytdlp_available() -> bool:
 
 async def get_video_metadata(video_url: str) -> Dict[str, Any]:
     """Get comprehensive video metadata using yt-dlp."""
-    if not check_ytdlp_available():
+    engine = get_engine()
+    if not await engine.available():
         return {}
     
     try:
-        cmd = ['yt-dlp', '--dump-json', '--no-download', video_url]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            return json.loads(result.stdout)
+        return await engine.extract_info(video_url)
     except Exception as e:
-        print(f"⚠️  Could not get video metadata: {e}")
+        print(f"⚠️  Could not get video metadata: {e}", file=sys.stderr)
     return {}
 
 
@@ -80,13 +87,19 @@ async def extract_transcript_api(video_url: str, language: str = "en") -> Dict[s
     }
 
 
-async def extract_transcript_ytdlp(video_url: str, language: str = "en") -> Dict[str, Any]:
+async def extract_transcript_ytdlp(video_url: str, language: str = "en", info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Extract transcript using yt-dlp with SRV1 format preference and automatic fallback.
     
     This updated version uses the improved format chain: srv1 → json3 → ttml → vtt
     to eliminate the VTT duplication issue discovered in the analysis.
+    Pass the ``info`` dict from ``get_video_metadata`` to pick the track from it
+    instead of resolving the video a second time.
+
+    The parsed ``cues`` are returned alongside the rendered ``lines`` so later
+    stages don't have to re-parse the strings.
     """
-    if not check_ytdlp_available():
+    engine = get_engine()
+    if not await engine.available():
         return {
             'method': 'yt-dlp',
             'success': False,
@@ -95,28 +108,26 @@ async def extract_transcript_ytdlp(video_url: str, language: str = "en") -> Dict
             'line_count': 0
         }
     
-    temp_dir = None
     try:
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp(prefix="ytdlp_mcp_")
-        
-        # Use new fallback system instead of hardcoded VTT
-        subtitle_file, actual_format = download_subtitles_with_fallback(video_url, language, temp_dir)
+        # Fetch the best subtitle track using the fallback chain
+        subtitles = await engine.fetch_subtitles(video_url, language, info=info)
+        actual_format = subtitles['format']
         
         # Parse using the appropriate parser
-        transcript_lines = parse_subtitle_file(subtitle_file, actual_format)
+        cues = parse_subtitle_cues(subtitles['content'], actual_format)
         
         # Apply deduplication (mainly needed for VTT fallback)
         if actual_format == 'vtt':
-            transcript_lines = deduplicate_transcript_lines(transcript_lines)
+            cues = deduplicate_vtt_cues(cues, aggressive=True, rolling=settings.rolling_dedup)
         
         return {
             'method': 'yt-dlp',
             'success': True,
             'format': actual_format,  # Report which format was actually used
             'language': language,
-            'lines': transcript_lines,
-            'line_count': len(transcript_lines)
+            'cues': cues,
+            'lines': render_lines(cues),
+            'line_count': len(cues)
         }
         
     except subprocess.TimeoutExpired:
@@ -135,127 +146,15 @@ async def extract_transcript_ytdlp(video_url: str, language: str = "en") -> Dict
             'lines': [],
             'line_count': 0
         }
-    finally:
-        # Clean up
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
 
 
-def parse_vtt_content(vtt_content: str) -> List[str]:
-    """Parse VTT content and extract timestamped lines."""
-    lines = []
-    vtt_lines = vtt_content.split('\n')
-    
-    current_timestamp = ""
-    current_text = ""
-    
-    for line in vtt_lines:
-        line = line.strip()
-        
-        # Skip VTT headers and empty lines
-        if not line or line.startswith('WEBVTT') or line.startswith('NOTE'):
-            continue
-        
-        # Timestamp line format: 00:00:01.000 --> 00:00:03.000
-        if '-->' in line:
-            # Extract start timestamp
-            start_time = line.split('-->')[0].strip()
-            # Convert to [MM:SS] format
-            if ':' in start_time:
-                time_parts = start_time.split(':')
-                if len(time_parts) >= 2:
-                    minutes = int(float(time_parts[-2]))
-                    seconds = int(float(time_parts[-1].split('.')[0]))
-                    current_timestamp = f"[{minutes:02d}:{seconds:02d}]"
-        
-        # Text line
-        elif line and not line.isdigit():
-            # Clean HTML tags and decode entities
-            clean_text = re.sub(r'<[^>]+>', '', line)
-            clean_text = html.unescape(clean_text)
-            
-            if clean_text.strip() and current_timestamp:
-                lines.append(f"{current_timestamp} {clean_text.strip()}")
-                current_timestamp = ""  # Reset after use
-    
-    return lines
-
-
-def deduplicate_transcript_lines(lines: List[str]) -> List[str]:
-    """Remove duplicate consecutive text while preserving timestamps.
-    
-    This fixes the common issue where YouTube auto-captions repeat the same text
-    across multiple timestamps as speech continues.
-    """
-    if not lines:
-        return lines
-    
-    deduplicated = []
-    last_clean_text = ""
-    last_words = set()
-    
-    for line in lines:
-        # Extract timestamp and text
-        if line.startswith('[') and ']' in line:
-            timestamp_end = line.find(']') + 1
-            timestamp = line[:timestamp_end]
-            text = line[timestamp_end:].strip()
-        else:
-            timestamp = ""
-            text = line.strip()
-        
-        if not text or text in ['[Music]', '[Applause]', '[Laughter]']:
-            continue
-            
-        # Clean text for comparison (remove extra spaces, normalize)
-        clean_text = ' '.join(text.split()).lower()
-        
-        # Skip if this is an exact duplicate of the last line
-        if clean_text == last_clean_text:
-            continue
-            
-        # Skip if this text is completely contained in the last text
-        if last_clean_text and clean_text in last_clean_text and last_clean_text not in ['[Music]', '[Applause]', '[Laughter]']:
-            continue
-            
-        # Skip if the last text is completely contained in this text
-        # but this text is much longer (likely an extension)
-        if last_clean_text and last_clean_text in clean_text:
-            if len(clean_text) > len(last_clean_text) * 1.2:
-                # Replace the last entry with this longer version
-                if deduplicated:
-                    deduplicated[-1] = line
-                    last_clean_text = clean_text
-                    last_words = set(clean_text.split())
-                    continue
-        
-        # Advanced duplicate detection: check word overlap
-        current_words = set(clean_text.split())
-        if last_words and len(current_words) > 3:
-            # Calculate overlap percentage
-            overlap = len(current_words.intersection(last_words))
-            overlap_percentage = overlap / min(len(current_words), len(last_words))
-            
-            # If more than 80% word overlap and similar length, skip
-            if (overlap_percentage > 0.8 and 
-                abs(len(current_words) - len(last_words)) <= 2):
-                continue
-        
-        deduplicated.append(line)
-        last_clean_text = clean_text
-        last_words = current_words
-    
-    return deduplicated
-
-
-def create_plain_text_script(lines: List[str], remove_duplicates: bool = True, aggressive_dedup: bool = False) -> str:
-    """Create a clean plain text script from timestamped transcript lines.
+def create_plain_text_script(lines: Union[TranscriptPipeline, List[Cue]], remove_duplicates: bool = True,
+                             aggressive_dedup: bool = False) -> str:
+    """Create a clean plain text script from transcript cues.
     
     Args:
-        lines: List of transcript lines with timestamps
+        lines: Transcript pipeline or cues (rendered ``"[MM:SS] text"`` lines are accepted too);
+            with a pipeline the script is built once and memoized
         remove_duplicates: Whether to remove consecutive duplicate text
         aggressive_dedup: Whether to use aggressive deduplication (removes more potential duplicates)
         
@@ -266,19 +165,21 @@ def create_plain_text_script(lines: List[str], remove_duplicates: bool = True, a
         return ""
     
     # First, deduplicate if requested
-    working_lines = deduplicate_transcript_lines(lines) if remove_duplicates else lines
-    
+    pipeline = as_pipeline(lines)
+    return pipeline.derive(
+        ("plain_script", remove_duplicates, aggressive_dedup),
+        lambda: _build_plain_text_script(pipeline.stage(AGGRESSIVE if remove_duplicates else RAW), aggressive_dedup)
+    )
+
+
+def _build_plain_text_script(working_cues: List[Cue], aggressive_dedup: bool) -> str:
+    """Join deduplicated cues into paragraphs of plain text."""
     # Extract just the text parts and clean them
     text_parts = []
     last_text = ""
     
-    for line in working_lines:
-        # Extract text from timestamped line
-        if line.startswith('[') and ']' in line:
-            timestamp_end = line.find(']') + 1
-            text = line[timestamp_end:].strip()
-        else:
-            text = line.strip()
+    for cue in working_cues:
+        text = cue.text
         
         if not text or text in ['[Music]', '[Applause]', '[Laughter]']:
             continue
@@ -347,49 +248,34 @@ def create_plain_text_script(lines: List[str], remove_duplicates: bool = True, a
     return '\n\n'.join(paragraphs)
 
 
-def analyze_transcript_quality(lines: List[str]) -> Dict[str, Any]:
-    """Analyze the quality of a transcript and provide detailed metrics."""
+def analyze_transcript_quality(lines: Union[TranscriptPipeline, List[Cue]]) -> Dict[str, Any]:
+    """Analyze the quality of a transcript (pipeline, cues or rendered lines) and provide detailed metrics."""
     if not lines:
         return {'error': 'No lines to analyze'}
     
+    pipeline = as_pipeline(lines)
+    return pipeline.derive("quality", lambda: _analyze_transcript_quality(pipeline))
+
+
+def _analyze_transcript_quality(pipeline: TranscriptPipeline) -> Dict[str, Any]:
+    """Compute the quality metrics of ``analyze_transcript_quality``."""
+    cues = pipeline.raw
+    
     # Basic metrics
-    total_lines = len(lines)
+    total_lines = len(cues)
     
     # Extract text content
-    text_lines = []
-    for line in lines:
-        if line.startswith('[') and ']' in line:
-            timestamp_end = line.find(']') + 1
-            text = line[timestamp_end:].strip()
-        else:
-            text = line.strip()
-        
-        if text and text not in ['[Music]', '[Applause]', '[Laughter]']:
-            text_lines.append(text)
+    text_lines = [cue.text for cue in cues if cue.text and cue.text not in NON_SPEECH_CAPTIONS]
     
     # Duplicate analysis
-    exact_duplicates = 0
-    partial_duplicates = 0
-    seen_texts = set()
-    
-    for text in text_lines:
-        clean_text = ' '.join(text.split()).lower()
-        if clean_text in seen_texts:
-            exact_duplicates += 1
-        else:
-            # Check for partial duplicates
-            for seen_text in seen_texts:
-                if (clean_text in seen_text or seen_text in clean_text) and clean_text != seen_text:
-                    partial_duplicates += 1
-                    break
-            seen_texts.add(clean_text)
+    exact_duplicates, partial_duplicates = count_duplicates(text_lines)
     
     # After deduplication metrics
-    deduplicated = deduplicate_transcript_lines(lines)
+    deduplicated = pipeline.stage(AGGRESSIVE)
     dedupe_reduction = ((total_lines - len(deduplicated)) / total_lines * 100) if total_lines > 0 else 0
     
     # Text quality metrics
-    total_words = sum(len(text.split()) for text in text_lines)
+    total_words = len(' '.join(text_lines).split())
     avg_words_per_line = total_words / len(text_lines) if text_lines else 0
     
     # Calculate quality score
@@ -446,7 +332,8 @@ def create_mcp_markdown(result: Dict[str, Any], video_url: str, metadata: Dict[s
 """
     
     # Generate clean plain text script with aggressive deduplication
-    plain_script = create_plain_text_script(result['lines'], remove_duplicates=True, aggressive_dedup=True)
+    pipeline = pipeline_for(result)
+    plain_script = create_plain_text_script(pipeline, remove_duplicates=True, aggressive_dedup=True)
     markdown_content += plain_script
     
     markdown_content += f"""
@@ -455,14 +342,12 @@ def create_mcp_markdown(result: Dict[str, Any], video_url: str, metadata: Dict[s
 
 """
     
-    # Add original transcript lines with timestamps
+    # Add original transcript lines with timestamps (text was cleaned by the parser)
     for line in result['lines']:
-        # Clean up HTML entities for better readability
-        clean_line = html.unescape(line)
-        markdown_content += f"{clean_line}\n"
+        markdown_content += f"{line}\n"
     
     # Add quality analysis
-    quality_analysis = analyze_transcript_quality(result['lines'])
+    quality_analysis = analyze_transcript_quality(pipeline)
     
     markdown_content += f"""
 
@@ -519,6 +404,82 @@ async def get_transcript(video_id: str):
     return markdown_content
 
 
+# Metadata fields read by the enhanced views; the rest of the yt-dlp info dict is not stored
+ENHANCED_METADATA_KEYS = (
+    'title', 'uploader', 'channel_id', 'channel_follower_count', 'duration', 'duration_string',
+    'upload_date', 'view_count', 'like_count', 'comment_count', 'description', 'tags', 'categories',
+    'language', 'resolution', 'fps', 'ext', 'filesize_approx', 'aspect_ratio'
+)
+
+# Enhanced result fields rebuilt from the cached cues instead of being stored
+DERIVED_ENHANCED_KEYS = ('raw_lines', 'deduplicated_lines', 'plain_text', 'markdown_content')
+
+
+def compact_metadata(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the metadata fields the enhanced views use.
+
+    Caption tracks are reduced to ``{language: [formats]}``; their signed
+    download URLs expire and make up most of the info dict.
+    """
+    metadata = {key: info[key] for key in ENHANCED_METADATA_KEYS if key in info}
+    for key in ('automatic_captions', 'subtitles'):
+        tracks = info.get(key) or {}
+        metadata[key] = {lang: [track.get('ext') for track in entries if isinstance(track, dict)]
+                         for lang, entries in tracks.items()}
+    return metadata
+
+
+def _enhanced_markdown(result: Dict[str, Any]) -> str:
+    """Markdown resource of an enhanced result, built once per pipeline."""
+    return pipeline_for(result).derive(
+        "markdown", lambda: create_mcp_markdown(result, result['video_url'], result.get('metadata') or {})
+    )
+
+
+def _assemble_enhanced_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the derived views (deduplicated lines, plain text, markdown) to a lines result."""
+    pipeline = pipeline_for(result)
+    return {
+        **result,
+        'raw_lines': result['lines'],
+        'deduplicated_lines': pipeline.lines(AGGRESSIVE),
+        'plain_text': create_plain_text_script(pipeline, remove_duplicates=True, aggressive_dedup=True),
+        'markdown_content': _enhanced_markdown(result)
+    }
+
+
+def cache_enhanced_result(result: Dict[str, Any]) -> None:
+    """Cache an enhanced result in the shared transcript store.
+
+    Only the raw lines, cue timings, metadata and metrics are stored; the
+    derived views are rebuilt from the cues (and memoized on the pipeline)
+    when the entry is read back.
+    """
+    stored = {key: value for key, value in result.items() if key not in DERIVED_ENHANCED_KEYS}
+    resources.cache_transcript_lines(result['video_id'], stored, result['language'], "enhanced", "aggressive")
+
+
+def get_cached_enhanced_result(video_id: str, language: str = "en") -> Optional[Dict[str, Any]]:
+    """Get a cached enhanced result from memory or disk without extracting.
+
+    Results scored by an older ``QUALITY_SCORING_VERSION`` are rescored from
+    the cached cues and stored again.
+    """
+    entry = resources.get_cached_transcript(video_id, language, "enhanced", "aggressive")
+    if entry is None or "result" not in entry:
+        return None
+    
+    result = rebuild_lines_result(entry, resources._transcript_cache)
+    if not is_current_quality(result.get('quality_metrics')):
+        metrics = stamp_quality_version(dict(analyze_transcript_quality(result['pipeline'])))
+        result['quality_metrics'] = entry["result"]['quality_metrics'] = metrics
+        resources.add_to_cache(video_id, entry["transcript"], language, "enhanced", "aggressive",
+                               result=entry["result"], pipeline=result['pipeline'])
+    return _assemble_enhanced_result(result)
+
+
+@coalesce(lambda video_url, language="en", quality_analysis=True:
+          ("enhanced", extract_video_id(video_url), language, quality_analysis))
 async def extract_enhanced_transcript(video_url: str, language: str = "en", quality_analysis: bool = True) -> Dict[str, Any]:
     """Extract transcript with full enhancement pipeline.
     
@@ -528,17 +489,25 @@ async def extract_enhanced_transcript(video_url: str, language: str = "en", qual
     - Quality analysis
     - Rich metadata extraction
     - Comprehensive formatting
+
+    Results are served from the shared transcript store (memory, then disk)
+    when available. Concurrent calls for the same video and language share one run.
     """
     try:
+        video_id = extract_video_id(video_url)
+        cached = get_cached_enhanced_result(video_id, language)
+        if cached is not None:
+            return cached
+        
         # Get video metadata first
-        metadata = await get_video_metadata(video_url)
+        info = await get_video_metadata(video_url)
         
         # Try youtube-transcript-api first
         result = await extract_transcript_api(video_url, language)
         
         if not result['success']:
-            # Fallback to yt-dlp
-            result = await extract_transcript_ytdlp(video_url, language)
+            # Fallback to yt-dlp, reusing the metadata lookup for subtitle URLs
+            result = await extract_transcript_ytdlp(video_url, language, info=info or None)
         
         if not result['success']:
             return {
@@ -548,34 +517,35 @@ async def extract_enhanced_transcript(video_url: str, language: str = "en", qual
                 'video_id': extract_video_id(video_url)
             }
         
-        # Apply deduplication
-        deduplicated_lines = deduplicate_transcript_lines(result['lines'])
-        
-        # Create plain text version
-        plain_text = create_plain_text_script(result['lines'], remove_duplicates=True, aggressive_dedup=True)
+        # Every stage is computed once on the pipeline and shared with the markdown
+        pipeline = pipeline_for(result)
         
         # Analyze quality if requested
-        quality_metrics = analyze_transcript_quality(result['lines']) if quality_analysis else {}
-        
-        # Create comprehensive markdown
-        markdown_content = create_mcp_markdown(result, video_url, metadata)
+        quality_metrics = stamp_quality_version(dict(analyze_transcript_quality(pipeline))) if quality_analysis else {}
         
-        return {
+        enhanced_result = _assemble_enhanced_result({
             'success': True,
-            'video_id': extract_video_id(video_url),
+            'video_id': video_id,
             'video_url': video_url,
             'method': result['method'],
             'language': result.get('language', language),
-            'raw_lines': result['lines'],
-            'deduplicated_lines': deduplicated_lines,
-            'plain_text': plain_text,
-            'markdown_content': markdown_content,
-            'metadata': metadata,
+            'format': result.get('format'),
+            'lines': result['lines'],
+            'cues': pipeline.raw,
+            'pipeline': pipeline,
+            'metadata': compact_metadata(info),
             'quality_metrics': quality_metrics,
             'line_count': len(result['lines']),
-            'deduplicated_count': len(deduplicated_lines),
             'available_languages': result.get('available_languages', [])
-        }
+        })
+        enhanced_result['deduplicated_count'] = len(enhanced_result['deduplicated_lines'])
+        enhanced_result['plain_text_length'] = len(enhanced_result['plain_text'])
+        
+        # Only complete results are cached so later calls can skip extraction entirely
+        if quality_analysis:
+            cache_enhanced_result(enhanced_result)
+        
+        return enhanced_result
         
     except Exception as e:
         return {
@@ -586,179 +556,41 @@ async def extract_enhanced_transcript(video_url: str, language: str = "en", qual
         }
 
 
-# ============================================================================
-# SUBTITLE FORMAT PARSERS
-# ============================================================================
-
-def parse_srv1_content(srv1_file_path: str) -> List[str]:
-    """Parse SRV1 (XML) subtitle file and return timestamped transcript lines."""
-    import xml.etree.ElementTree as ET
-    
-    with open(srv1_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    transcript_lines = []
-    
-    try:
-        root = ET.fromstring(content)
-        for text_elem in root.findall('text'):
-            start_time = float(text_elem.get('start', 0))
-            text = text_elem.text
-            
-            if text and text.strip():
-                # Format timestamp
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                
-                # Clean and format text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    except ET.ParseError as e:
-        print(f"Error parsing SRV1 XML content: {e}")
-    
-    return transcript_lines
+# Layout of the enhanced server's quality sidecars (the streamlined server writes its own)
+QUALITY_REPORT_SCHEMA = "enhanced"
+QUALITY_REPORT_KEYS = ('video_id', 'video_url', 'title', 'method', 'language', 'line_count',
+                       'deduplicated_count', 'plain_text_length', 'quality_metrics')
 
 
-def parse_json3_content(json3_file_path: str) -> List[str]:
-    """Parse JSON3 subtitle file and return timestamped transcript lines."""
-    with open(json3_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    transcript_lines = []
-    
-    for event in data.get('events', []):
-        if 'segs' in event:
-            start_time = event.get('tStartMs', 0) / 1000
-            text_parts = []
-            
-            for seg in event['segs']:
-                if 'utf8' in seg and seg['utf8'] != '\n':
-                    text_parts.append(seg['utf8'])
-            
-            text = ''.join(text_parts).strip()
-            if text:
-                # Format timestamp
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                
-                # Clean text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    return transcript_lines
-
-
-def download_subtitles_with_fallback(video_url: str, language: str = "en", temp_dir: Optional[str] = None) -> tuple[str, str]:
-    """Download subtitles with format fallback chain: srv1 → json3 → ttml → vtt."""
-    formats = ['srv1', 'json3', 'ttml', 'vtt']  # Order by quality
-    
-    for fmt in formats:
-        cmd = [
-            'yt-dlp',
-            '--write-auto-subs',
-            '--write-subs', 
-            '--sub-lang', language,
-            '--sub-format', fmt,
-            '--skip-download',
-            '--output', f'{temp_dir}/%(title)s.%(ext)s',
-            video_url
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                # Check if files were actually created
-                subtitle_files = glob.glob(f'{temp_dir}/*.{language}.{fmt}') or glob.glob(f'{temp_dir}/*.en.{fmt}')
-                if subtitle_files:
-                    return subtitle_files[0], fmt
-        except subprocess.TimeoutExpired:
-            continue
-        except Exception:
-            continue
-    
-    raise Exception("No subtitle formats available")
+def build_quality_report(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact quality report of an enhanced extraction result (what the quality views display)."""
+    metadata = result.get('metadata') or {}
+    return {
+        'video_id': result['video_id'],
+        'video_url': result['video_url'],
+        'title': metadata.get('title', 'Unknown Title'),
+        'method': result['method'],
+        'language': result.get('language', 'en'),
+        'line_count': result['line_count'],
+        'deduplicated_count': result['deduplicated_count'],
+        'plain_text_length': result['plain_text_length'],
+        'quality_metrics': result['quality_metrics']
+    }
 
 
-def parse_subtitle_file(file_path: str, format_type: str) -> List[str]:
-    """Parse subtitle file based on format type."""
-    if format_type == 'srv1':
-        return parse_srv1_content(file_path)
-    elif format_type == 'json3':
-        return parse_json3_content(file_path)
-    elif format_type == 'ttml':
-        # For now, fallback to VTT parsing logic for TTML
-        return parse_vtt_content_legacy(file_path)
-    elif format_type == 'vtt':
-        return parse_vtt_content_legacy(file_path)
-    else:
-        raise ValueError(f"Unsupported subtitle format: {format_type}")
+def get_stored_quality_report(video_id: str, language: str = "en") -> Optional[Dict[str, Any]]:
+    """Get the quality report of an already-extracted video without extracting it again.
 
-
-def parse_vtt_content_legacy(vtt_file_path: str) -> List[str]:
-    """Legacy VTT parser for fallback compatibility."""
-    with open(vtt_file_path, 'r', encoding='utf-8') as f:
-        vtt_content = f.read()
-    
-    lines = vtt_content.split('\n')
-    transcript_lines = []
-    
-    current_timestamp = None
-    current_text_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines and VTT headers
-        if not line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-            if not line and current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-                current_timestamp = None
-                current_text_lines = []
-            continue
-        
-        # Check if line contains timestamp
-        if '-->' in line:
-            if current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-            
-            # Extract start time
-            time_parts = line.split(' --> ')[0]
-            try:
-                time_clean = time_parts.split('.')[0].split(':')
-                if len(time_clean) >= 3:
-                    hours = int(time_clean[0])
-                    minutes = int(time_clean[1]) + (hours * 60)
-                    seconds = int(time_clean[2])
-                    current_timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                else:
-                    current_timestamp = "[00:00]"
-            except (ValueError, IndexError):
-                current_timestamp = "[00:00]"
-            
-            current_text_lines = []
-            continue
-        
-        # Accumulate text lines
-        if current_timestamp:
-            current_text_lines.append(line)
-    
-    # Process final cue
-    if current_timestamp and current_text_lines:
-        combined_text = ' '.join(current_text_lines)
-        clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-        if clean_text:
-            transcript_lines.append(f"{current_timestamp} {clean_text}")
-    
-    return transcript_lines
+    The cached enhanced result is checked first, then the sidecar written next
+    to the resource file. Reports from another scoring version are ignored.
+    """
+    # The stored details are enough; the transcript views are not rebuilt
+    cached = resources.get_cached_transcript(video_id, language, "enhanced", "aggressive")
+    if cached is not None and "result" in cached and is_current_quality(cached["result"].get('quality_metrics')):
+        return build_quality_report(cached["result"])
+    
+    report = load_quality_sidecar(quality_sidecar_path(settings.resource_dir, video_id, QUALITY_REPORT_SCHEMA),
+                                  QUALITY_REPORT_SCHEMA, QUALITY_REPORT_KEYS)
+    if report is not None and report.get('language', 'en') == language:
+        return report
+    return None
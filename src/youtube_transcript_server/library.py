@@ -0,0 +1,303 @@
+"""Full-text index over the saved transcript resource files.
+
+Finding which saved resources mention a term used to mean loading every file.
+``LibraryIndex`` keeps one SQLite database (``library_index.sqlite3``) in the
+resource directory with a row per timestamped transcript line, in an FTS5
+table when SQLite has it (a plain table scanned with ``LIKE`` otherwise):
+
+- ``update()`` indexes a file right after it is saved, from the content that
+  was just written.
+- ``refresh()`` picks up files added, changed or removed by other tools, like
+  the resource catalog: the directory is only listed again when its mtime
+  changes, otherwise the indexed files are just stat'ed (which catches
+  in-place overwrites), and only files whose size or mtime differ are
+  re-indexed.
+
+Hits are ranked with BM25 and carry the video ID and the line's timestamp.
+Queries use the ``search`` syntax: words are ANDed and match as prefixes,
+quoted text matches as a phrase.
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cues import cue_from_line, format_timestamp
+from .catalog import HEADER_BYTES, parse_resource_header
+from .search import parse_query
+
+INDEX_NAME = "library_index.sqlite3"
+
+DEFAULT_HIT_LIMIT = 20
+MAX_HIT_LIMIT = 100
+
+# Timestamped transcript lines ("[MM:SS] text" / "[HH:MM:SS] text") of both resource formats
+_SEGMENT_RE = re.compile(r'^\[(?:\d+:)?\d+:\d{2}\] ', re.MULTILINE)
+_VIDEO_ID_RE = re.compile(r'^- \*\*Video ID\*\*:?\s*`?([\w-]+)`?', re.MULTILINE)
+
+
+def extract_segments(content: str) -> List[Tuple[int, str]]:
+    """Timestamped ``(start_ms, text)`` lines of a resource file, each line once."""
+    segments = []
+    seen = set()
+    for match in _SEGMENT_RE.finditer(content):
+        end = content.find('\n', match.start())
+        cue = cue_from_line(content[match.start():end if end != -1 else len(content)])
+        key = (cue.start_ms, cue.text)
+        if cue.text and key not in seen:
+            seen.add(key)
+            segments.append(key)
+    return segments
+
+
+def fts_query(query: str) -> Optional[str]:
+    """Translate a query into an FTS5 MATCH expression (None if it has no words)."""
+    terms, phrases = parse_query(query)
+    clauses = [f'"{term}"*' for term in terms] + [f'"{" ".join(words)}"' for words in phrases]
+    return ' AND '.join(clauses) if clauses else None
+
+
+class LibraryIndex:
+    """Persistent full-text index of a resource directory.
+
+    The database is opened lazily, and storage errors are swallowed so a
+    read-only or corrupt index never breaks saving resources.
+    """
+
+    def __init__(self, directory: Path, pattern: str = "*.md"):
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.path = self.directory / INDEX_NAME
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fts = False
+        self._directory_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        self._suffix = Path(pattern).suffix
+        self.scans = 0
+        self.indexed = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS documents (
+                    name TEXT PRIMARY KEY,
+                    video_id TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    first_segment INTEGER NOT NULL,
+                    segment_count INTEGER NOT NULL
+                )
+            """)
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5("
+                    "text, name UNINDEXED, start_ms UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+                self._fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5
+                conn.execute("CREATE TABLE IF NOT EXISTS segments (text TEXT, name TEXT, start_ms INTEGER)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _directory_stamp(self) -> Optional[int]:
+        try:
+            return self.directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    # -- Indexing -----------------------------------------------------------
+
+    def _index(self, conn: sqlite3.Connection, path: Path, stat, content: str) -> None:
+        name = path.stem
+        header = parse_resource_header(content[:HEADER_BYTES])
+        match = _VIDEO_ID_RE.search(content, 0, HEADER_BYTES)
+        segments = extract_segments(content)
+        self._drop(conn, name)
+        # Each document's segments get a contiguous rowid range, so dropping them is a range delete
+        first = conn.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM segments").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO segments (rowid, text, name, start_ms) VALUES (?, ?, ?, ?)",
+            ((first + offset, text, name, start_ms) for offset, (start_ms, text) in enumerate(segments))
+        )
+        conn.execute(
+            "INSERT INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, match.group(1) if match else name, header['title'], stat.st_mtime_ns, stat.st_size,
+             first, len(segments))
+        )
+        self.indexed += 1
+
+    def _drop(self, conn: sqlite3.Connection, name: str) -> None:
+        row = conn.execute("SELECT first_segment, segment_count FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is not None:
+            first, count = row
+            conn.execute("DELETE FROM segments WHERE rowid BETWEEN ? AND ?", (first, first + count - 1))
+            conn.execute("DELETE FROM documents WHERE name = ?", (name,))
+
+    def _scan(self, conn: sqlite3.Connection) -> None:
+        """Reconcile the index with the directory."""
+        self.scans += 1
+        known = {name: (mtime_ns, size) for name, mtime_ns, size in
+                 conn.execute("SELECT name, mtime_ns, size FROM documents")}
+        seen = set()
+        for path in self.directory.glob(self.pattern):
+            try:
+                stat = path.stat()
+                seen.add(path.stem)
+                if known.get(path.stem) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                self._index(conn, path, stat, path.read_text(encoding='utf-8', errors='replace'))
+            except OSError:
+                continue
+        for name in known.keys() - seen:
+            self._drop(conn, name)
+        conn.commit()
+
+    def _check_documents(self, conn: sqlite3.Connection) -> bool:
+        """Re-index known files rewritten in place (no directory listing); returns whether anything changed."""
+        changed = False
+        for name, mtime_ns, size in conn.execute("SELECT name, mtime_ns, size FROM documents").fetchall():
+            path = self.directory / f"{name}{self._suffix}"
+            try:
+                stat = path.stat()
+                if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+                    continue
+                self._index(conn, path, stat, path.read_text(encoding='utf-8', errors='replace'))
+            except OSError:
+                self._drop(conn, name)
+            changed = True
+        if changed:
+            conn.commit()
+        return changed
+
+    def refresh(self) -> None:
+        """Bring the index up to date, rescanning the directory only if its listing changed."""
+        stamp = self._directory_stamp()
+        if stamp is None:
+            return
+        try:
+            with self._lock:
+                if stamp == self._directory_mtime:
+                    # Overwriting a file in place does not touch the directory
+                    if self._check_documents(self._connect()):
+                        self._directory_mtime = self._directory_stamp()
+                    return
+                self._scan(self._connect())
+                # Our own database writes touch the directory too
+                self._directory_mtime = self._directory_stamp()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def update(self, path: Path, content: Optional[str] = None) -> None:
+        """Index a resource file that was just written (``content`` avoids re-reading it)."""
+        path = Path(path)
+        try:
+            stat = path.stat()
+            if content is None:
+                content = path.read_text(encoding='utf-8', errors='replace')
+            with self._lock:
+                fresh = self._directory_mtime is not None and self._directory_mtime == self._directory_stamp()
+                conn = self._connect()
+                self._index(conn, path, stat, content)
+                conn.commit()
+                if fresh:
+                    # Nothing else changed since the last scan: the new stamp only reflects our writes
+                    self._directory_mtime = self._directory_stamp()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def remove(self, name: str) -> None:
+        """Forget a resource (its file was deleted)."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                self._drop(conn, name)
+                conn.commit()
+        except (sqlite3.Error, OSError):
+            pass
+
+    # -- Queries ------------------------------------------------------------
+
+    def search(self, query: str, limit: int = DEFAULT_HIT_LIMIT) -> List[Dict[str, Any]]:
+        """Best matching transcript lines across the library.
+
+        Returns:
+            Hits ordered by relevance, each with ``video_id``, ``resource``
+            (file name without ``.md``), ``title``, ``timestamp``,
+            ``start_ms``, a highlighted ``snippet`` and a ``score`` (higher
+            is better)
+        """
+        limit = max(1, min(limit, MAX_HIT_LIMIT))
+        match = fts_query(query)
+        if match is None:
+            return []
+
+        self.refresh()
+        if self._conn is None and not self.path.exists():
+            return []  # Nothing indexed yet; don't create the database on a read
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                if self._fts:
+                    rows = conn.execute(
+                        "SELECT s.name, d.video_id, d.title, s.start_ms, "
+                        "snippet(segments, 0, '**', '**', '…', 16), -bm25(segments) "
+                        "FROM segments s JOIN documents d ON d.name = s.name "
+                        "WHERE segments MATCH ? ORDER BY bm25(segments) LIMIT ?",
+                        (match, limit)
+                    ).fetchall()
+                else:
+                    rows = self._scan_search(conn, query, limit)
+        except (sqlite3.Error, OSError):
+            return []
+
+        return [{
+            'video_id': video_id,
+            'resource': name,
+            'title': title,
+            'timestamp': format_timestamp(start_ms / 1000) if start_ms is not None else "",
+            'start_ms': start_ms,
+            'snippet': snippet,
+            'score': round(score, 3)
+        } for name, video_id, title, start_ms, snippet, score in rows]
+
+    @staticmethod
+    def _scan_search(conn: sqlite3.Connection, query: str, limit: int) -> List[tuple]:
+        """Substring search without FTS5, in library order."""
+        terms, phrases = parse_query(query)
+        needles = terms + [' '.join(words) for words in phrases]
+        where = ' AND '.join("lower(s.text) LIKE ? ESCAPE '\\'" for _ in needles)
+        patterns = ['%' + re.sub(r'([%_\\])', r'\\\1', needle) + '%' for needle in needles]
+        return conn.execute(
+            "SELECT s.name, d.video_id, d.title, s.start_ms, s.text, 0.0 "
+            f"FROM segments s JOIN documents d ON d.name = s.name WHERE {where} LIMIT ?",
+            (*patterns, limit)
+        ).fetchall()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for status resources."""
+        documents, segments = 0, 0
+        try:
+            # Don't create the database just to report on it
+            if self._conn is not None or self.path.exists():
+                with self._lock:
+                    conn = self._connect()
+                    documents = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+                    segments = conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        except (sqlite3.Error, OSError):
+            pass
+        return {
+            "documents": documents,
+            "segments": segments,
+            "full_text": self._fts,
+            "index": str(self.path),
+            "scans": self.scans,
+            "files_indexed": self.indexed
+        }
@@ -0,0 +1,443 @@
+"""Subtitle parsers shared by both servers and the CLI.
+
+Each parser is a generator that reads the raw content of one subtitle format
+and yields ``Cue`` objects (start/end milliseconds and text) as it goes. The
+source may be a string or a text stream (an open file), and the built-in
+parsers read it incrementally, so memory stays flat for multi-hour videos and
+the first cues are available before parsing finishes.
+
+Parsers are looked up in a registry keyed by yt-dlp's subtitle extension, so
+new formats can be plugged in with ``register_parser``:
+
+    @register_parser('srt')
+    def iter_srt_cues(source: TextSource) -> Iterator[Cue]:
+        ...
+
+``parse_subtitle_content`` renders the cues as ``"[MM:SS] text"`` lines for
+callers that still want strings.
+"""
+
+import html
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+from typing import Callable, Dict, Iterable, Iterator, List, TextIO, Union
+
+from .cues import Cue, cue_from_line, format_timestamp, render_lines
+
+TextSource = Union[str, TextIO]
+Parser = Callable[[TextSource], Iterable[Cue]]
+
+_PARSERS: Dict[str, Parser] = {}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Characters read from a stream at a time by the incremental parsers
+CHUNK_SIZE = 64 * 1024
+
+
+def register_parser(format_type: str) -> Callable[[Parser], Parser]:
+    """Decorator registering a parser for a subtitle format (replacing any existing one)."""
+    def decorator(func: Parser) -> Parser:
+        _PARSERS[format_type] = func
+        return func
+    return decorator
+
+
+def get_parser(format_type: str) -> Parser:
+    """Get the parser for a subtitle format."""
+    try:
+        return _PARSERS[format_type]
+    except KeyError:
+        raise ValueError(f"Unsupported subtitle format: {format_type}") from None
+
+
+def supported_formats() -> List[str]:
+    """List the subtitle formats with a registered parser."""
+    return list(_PARSERS)
+
+
+def iter_subtitle_cues(source: TextSource, format_type: str) -> Iterator[Cue]:
+    """Yield cues from subtitle content or an open text stream as they are parsed."""
+    for item in get_parser(format_type)(source):
+        # Plugged-in parsers may yield rendered lines as well
+        yield item if isinstance(item, Cue) else cue_from_line(item)
+
+
+def parse_subtitle_cues(content: TextSource, format_type: str) -> List[Cue]:
+    """Parse subtitle content held in memory into cues based on format type."""
+    return list(iter_subtitle_cues(content, format_type))
+
+
+def parse_subtitle_content(content: str, format_type: str) -> List[str]:
+    """Parse subtitle content held in memory into ``"[MM:SS] text"`` lines."""
+    return render_lines(iter_subtitle_cues(content, format_type))
+
+
+def iter_subtitle_file(file_path: str, format_type: str) -> Iterator[Cue]:
+    """Stream cues from a subtitle file without reading it into memory."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_subtitle_cues(f, format_type)
+
+
+def parse_subtitle_file(file_path: str, format_type: str) -> List[str]:
+    """Parse subtitle file based on format type."""
+    return render_lines(iter_subtitle_file(file_path, format_type))
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def parse_vtt_timestamp(timestamp_str: str) -> float:
+    """Parse VTT timestamp to seconds."""
+    # Format: 00:00:12.345 -> 12.345 seconds
+    parts = timestamp_str.split(':')
+    if len(parts) == 3:
+        hours, minutes, seconds = parts
+        return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
+    elif len(parts) == 2:
+        minutes, seconds = parts
+        return float(minutes) * 60 + float(seconds)
+    else:
+        return float(parts[0])
+
+
+
+
+def iter_chunks(source: TextSource) -> Iterator[str]:
+    """Yield the source in ``CHUNK_SIZE`` pieces (strings are sliced, not copied whole)."""
+    if isinstance(source, str):
+        for offset in range(0, len(source), CHUNK_SIZE):
+            yield source[offset:offset + CHUNK_SIZE]
+        return
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_lines(source: TextSource) -> Iterator[str]:
+    """Yield the lines of the source one at a time (without building a list of lines)."""
+    if not isinstance(source, str):
+        yield from source
+        return
+    start = 0
+    while start < len(source):
+        end = source.find('\n', start)
+        if end == -1:
+            yield source[start:]
+            return
+        yield source[start:end]
+        start = end + 1
+
+
+class JSONStreamReader:
+    """Minimal incremental JSON reader for walking one large top-level object.
+
+    Values are decoded with ``json.JSONDecoder.raw_decode`` from a buffer that
+    is refilled from the stream on demand and trimmed as values are consumed.
+    """
+
+    def __init__(self, source: TextSource):
+        self._chunks = iter_chunks(source)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it ('' at the end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be ``char``."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON: expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if (end == len(self._buffer) and isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and not self._eof and self._fill()):
+                continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator:
+        """Yield the items of the array at the current position one by one."""
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self._pos += 1
+                continue
+            self.expect(']')
+            return
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object at the current position.
+
+        After each key the reader is positioned at its value, which the caller
+        must consume (``value()`` or ``iter_array()``) before asking for the next key.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() == ',':
+                self._pos += 1
+                continue
+            self.expect('}')
+            return
+
+
+# ============================================================================
+# TEXT CLEANING
+# ============================================================================
+
+def clean_caption_text(text: str) -> str:
+    """Clean the raw text of one cue; every parser runs its cue text through this.
+
+    Strips markup tags, decodes HTML entities and collapses whitespace. Most
+    auto-captions have no markup, so the regex and the entity decoder only run
+    when the text contains ``<`` or ``&``.
+    """
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    if '&' in text:
+        text = html.unescape(text)
+    return ' '.join(text.split())
+
+
+# ============================================================================
+# SUBTITLE FORMAT PARSERS
+# ============================================================================
+
+@register_parser('srv1')
+def iter_srv1_cues(source: TextSource) -> Iterator[Cue]:
+    """Yield cues from SRV1 (XML) subtitle content, discarding elements once read."""
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+
+    try:
+        for chunk in iter_chunks(source):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    continue
+                if elem.tag != 'text':
+                    continue
+                clean_text = clean_caption_text(elem.text or '')
+                if clean_text:
+                    start_ms = round(float(elem.get('start', 0)) * 1000)
+                    end_ms = start_ms + round(float(elem.get('dur', 0)) * 1000)
+                    yield Cue(start_ms, end_ms, clean_text)
+            # Drop finished elements so the tree never holds more than one chunk
+            if root is not None:
+                root.clear()
+        parser.close()
+
+    except ET.ParseError as e:
+        # stdout is reserved for the MCP stdio transport
+        print(f"Error parsing SRV1 XML content: {e}", file=sys.stderr)
+
+
+@register_parser('json3')
+def iter_json3_cues(source: TextSource) -> Iterator[Cue]:
+    """Yield cues from JSON3 subtitle content, decoding one event at a time."""
+    reader = JSONStreamReader(source)
+
+    for key in reader.iter_object():
+        if key != 'events':
+            reader.value()
+            continue
+
+        for event in reader.iter_array():
+            if 'segs' in event:
+                text = ''.join(seg['utf8'] for seg in event['segs'] if 'utf8' in seg and seg['utf8'] != '\n')
+                clean_text = clean_caption_text(text)
+                if clean_text:
+                    start_ms = int(event.get('tStartMs', 0))
+                    yield Cue(start_ms, start_ms + int(event.get('dDurationMs', 0)), clean_text)
+
+
+@register_parser('vtt')
+def iter_vtt_cues(source: TextSource) -> Iterator[Cue]:
+    """Yield cues from WebVTT subtitle content line by line, joining the text lines of each cue."""
+    start_ms = end_ms = None
+    current_text_lines = []
+
+    def flush():
+        if start_ms is not None and current_text_lines:
+            clean_text = clean_caption_text(' '.join(current_text_lines))
+            if clean_text:
+                return Cue(start_ms, end_ms, clean_text)
+        return None
+
+    for line in iter_lines(source):
+        line = line.strip()
+
+        # Skip empty lines and VTT headers
+        if not line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
+            if not line:
+                cue = flush()
+                if cue is not None:
+                    yield cue
+                start_ms = end_ms = None
+                current_text_lines = []
+            continue
+
+        # Check if line contains timestamp
+        if '-->' in line:
+            cue = flush()
+            if cue is not None:
+                yield cue
+            start, _, end = line.partition('-->')
+            try:
+                start_ms = round(parse_vtt_timestamp(start.strip()) * 1000)
+            except ValueError:
+                start_ms = 0
+            try:
+                end_ms = round(parse_vtt_timestamp(end.split()[0]) * 1000)
+            except (ValueError, IndexError):
+                end_ms = start_ms
+            current_text_lines = []
+            continue
+
+        # Accumulate text lines
+        if start_ms is not None:
+            current_text_lines.append(line)
+
+    # Process final cue
+    cue = flush()
+    if cue is not None:
+        yield cue
+
+
+_TTML_PARAMETER_NS = 'http://www.w3.org/ns/ttml#parameter'
+
+_TTML_OFFSET_RE = re.compile(r'^([\d.]+)(h|ms|m|s|f|t)$')
+
+
+def _local_name(tag: str) -> str:
+    """Strip the ``{namespace}`` prefix from an element or attribute name."""
+    return tag.rpartition('}')[2]
+
+
+def parse_ttml_time(value: str, frame_rate: float = 30.0, tick_rate: float = 1.0) -> float:
+    """Parse a TTML time expression to seconds.
+
+    Supports clock times (``HH:MM:SS.fff`` and ``HH:MM:SS:frames``) and
+    offset times (``1.5s``, ``1500ms``, ``2m``, ``1h``, ``45f``, ``900t``).
+    """
+    value = value.strip()
+    match = _TTML_OFFSET_RE.match(value)
+    if match:
+        number, unit = float(match.group(1)), match.group(2)
+        if unit == 'h':
+            return number * 3600
+        if unit == 'm':
+            return number * 60
+        if unit == 'ms':
+            return number / 1000
+        if unit == 'f':
+            return number / frame_rate
+        if unit == 't':
+            return number / tick_rate
+        return number
+
+    parts = value.split(':')
+    if len(parts) == 4:
+        hours, minutes, seconds, frames = parts
+        return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + float(frames) / frame_rate
+    return parse_vtt_timestamp(value)
+
+
+def _ttml_text(elem) -> str:
+    """Collect the text of a ``<p>`` including nested ``<span>``s, turning ``<br/>`` into spaces."""
+    parts = [elem.text or '']
+    for child in elem:
+        if _local_name(child.tag) == 'br':
+            parts.append(' ')
+        else:
+            parts.append(_ttml_text(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+
+@register_parser('ttml')
+def iter_ttml_cues(source: TextSource) -> Iterator[Cue]:
+    """Yield cues from TTML (XML) subtitle content, one ``<p>`` at a time."""
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    open_elements = []
+    frame_rate = 30.0
+    tick_rate = 1.0
+
+    try:
+        for chunk in iter_chunks(source):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    if not open_elements:
+                        frame_rate = float(elem.get(f'{{{_TTML_PARAMETER_NS}}}frameRate', frame_rate))
+                        tick_rate = float(elem.get(f'{{{_TTML_PARAMETER_NS}}}tickRate', tick_rate))
+                    open_elements.append(elem)
+                    continue
+                open_elements.pop()
+                if _local_name(elem.tag) != 'p':
+                    continue
+                # Detach the paragraph so finished cues are not kept in the tree
+                if open_elements:
+                    open_elements[-1].remove(elem)
+                if elem.get('begin') is None:
+                    continue
+                clean_text = clean_caption_text(_ttml_text(elem))
+                if clean_text:
+                    start = parse_ttml_time(elem.get('begin'), frame_rate, tick_rate)
+                    if elem.get('end') is not None:
+                        end = parse_ttml_time(elem.get('end'), frame_rate, tick_rate)
+                    else:
+                        end = start + parse_ttml_time(elem.get('dur', '0s'), frame_rate, tick_rate)
+                    yield Cue(round(start * 1000), round(end * 1000), clean_text)
+        parser.close()
+
+    except (ET.ParseError, ValueError) as e:
+        # stdout is reserved for the MCP stdio transport
+        print(f"Error parsing TTML content: {e}", file=sys.stderr)
@@ -0,0 +1,167 @@
+"""Staged transcript processing with memoized intermediate results.
+
+A ``TranscriptPipeline`` wraps the cues of one extracted transcript and
+computes each processing stage at most once:
+
+    raw -> deduplicated -> aggressive -> rendered lines / plain text / metrics
+
+The pipeline is stored on the in-memory cache entry of its transcript (it is
+never persisted), so every tool asking for the same video reuses the stages
+computed by earlier calls instead of deduplicating the lines again. It keeps
+a running estimate of what it holds (``size_bytes``) and tells subscribers,
+like the transcript cache, whenever that grows.
+"""
+
+import bisect
+from array import array
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Union
+
+from .cues import Cue, as_cues, render_lines
+from .dedup import deduplicate_cues
+
+RAW = "raw"
+DEDUPLICATED = "deduplicated"
+AGGRESSIVE = "aggressive"
+
+STAGES = (RAW, DEDUPLICATED, AGGRESSIVE)
+
+# Rough size of an object header plus the slot referencing it
+OBJECT_OVERHEAD = 56
+
+
+def estimate_footprint(value: Any) -> int:
+    """Estimate the memory held by a stage or derived output in bytes.
+
+    Strings count their length, arrays their buffer and cues their text, each
+    plus ``OBJECT_OVERHEAD``; other objects can report their own size with a
+    ``footprint()`` method.
+    """
+    if isinstance(value, str):
+        return OBJECT_OVERHEAD + len(value)
+    if isinstance(value, Cue):
+        return OBJECT_OVERHEAD + len(value.text)
+    if isinstance(value, (bytes, bytearray)):
+        return OBJECT_OVERHEAD + len(value)
+    if isinstance(value, array):
+        return OBJECT_OVERHEAD + len(value) * value.itemsize
+    if isinstance(value, dict):
+        return OBJECT_OVERHEAD + sum(estimate_footprint(key) + estimate_footprint(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return OBJECT_OVERHEAD + sum(estimate_footprint(item) for item in value)
+    footprint = getattr(value, 'footprint', None)
+    if callable(footprint):
+        return footprint()
+    return OBJECT_OVERHEAD
+
+
+class TranscriptPipeline:
+    """Lazily computed, memoized processing stages of one transcript."""
+
+    def __init__(self, cues: Sequence[Cue], lines: Optional[List[str]] = None):
+        self._stages: Dict[str, List[Cue]] = {RAW: list(cues)}
+        self._lines: Dict[str, List[str]] = {}
+        self._derived: Dict[Hashable, Any] = {}
+        self._listeners: List[Callable[["TranscriptPipeline"], None]] = []
+        self.size_bytes = estimate_footprint(self._stages[RAW])
+        if lines is not None:
+            self._lines[RAW] = lines
+            self.size_bytes += estimate_footprint(lines)
+
+    def __len__(self) -> int:
+        return len(self._stages[RAW])
+
+    @property
+    def raw(self) -> List[Cue]:
+        """Cues as extracted."""
+        return self._stages[RAW]
+
+    def stage(self, name: str = RAW) -> List[Cue]:
+        """Get the cues of a stage, computing it on first use."""
+        cues = self._stages.get(name)
+        if cues is None:
+            if name == DEDUPLICATED:
+                cues = deduplicate_cues(self.raw)
+            elif name == AGGRESSIVE:
+                # Derived from the raw cues so it matches a standalone aggressive pass
+                cues = deduplicate_cues(self.raw, aggressive=True)
+            else:
+                raise ValueError(f"Unknown transcript stage: {name}")
+            self._stages[name] = cues
+            self.account(estimate_footprint(cues))
+        return cues
+
+    def lines(self, name: str = RAW) -> List[str]:
+        """Get the ``"[MM:SS] text"`` lines of a stage, rendering them once."""
+        lines = self._lines.get(name)
+        if lines is None:
+            lines = self._lines[name] = render_lines(self.stage(name))
+            self.account(estimate_footprint(lines))
+        return lines
+
+    def derive(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Memoize an output built from the stages (plain text, quality metrics, ...)."""
+        if key not in self._derived:
+            value = self._derived[key] = func()
+            self.account(estimate_footprint(value))
+        return self._derived[key]
+
+    def account(self, nbytes: int) -> None:
+        """Record memory held by a new memoized object and notify the subscribers.
+
+        Derived objects that grow later (e.g. an index built lazily) report
+        the growth here too.
+        """
+        self.size_bytes += nbytes
+        for listener in list(self._listeners):
+            listener(self)
+
+    def subscribe(self, listener: Callable[["TranscriptPipeline"], None]) -> bool:
+        """Call ``listener(pipeline)`` whenever ``size_bytes`` grows; returns False if already subscribed."""
+        if listener in self._listeners:
+            return False
+        self._listeners.append(listener)
+        return True
+
+    def computed(self) -> List[str]:
+        """Names of the stages computed so far (for status and tests)."""
+        return list(self._stages)
+
+
+def as_pipeline(transcript: Union[TranscriptPipeline, Sequence[Union[Cue, str]]]) -> TranscriptPipeline:
+    """Accept a pipeline, cues or rendered lines and return a pipeline."""
+    if isinstance(transcript, TranscriptPipeline):
+        return transcript
+    return TranscriptPipeline(as_cues(transcript))
+
+
+def pipeline_for(result: Dict[str, Any]) -> TranscriptPipeline:
+    """Get the pipeline of an extraction result, attaching one built from its cues if missing."""
+    pipeline = result.get('pipeline')
+    if pipeline is None:
+        cues = result.get('cues') or as_cues(result.get('lines', []))
+        pipeline = result['pipeline'] = TranscriptPipeline(cues, lines=result.get('lines'))
+    return pipeline
+
+
+def cues_in_range(pipeline: TranscriptPipeline, start_ms: int, end_ms: int) -> List[Cue]:
+    """Raw cues overlapping ``[start_ms, end_ms)``, found by binary search on the start times.
+
+    The start times are collected once per transcript and memoized on the
+    pipeline, so each slice costs two bisections plus the cues returned.
+
+    Raises:
+        ValueError: If the transcript has no timestamps
+    """
+    def collect_starts() -> array:
+        if any(cue.start_ms is None for cue in pipeline.raw):
+            raise ValueError("Transcript has no timestamps to slice by")
+        return array('q', (cue.start_ms for cue in pipeline.raw))
+
+    starts = pipeline.derive("start_times", collect_starts)
+    cues = pipeline.raw
+    stop = bisect.bisect_left(starts, end_ms)
+    # The last cue starting at or before the range start may still be running
+    first = max(0, bisect.bisect_right(starts, start_ms) - 1)
+    if first < stop and cues[first].start_ms < start_ms and (cues[first].end_ms or 0) <= start_ms:
+        first += 1
+    return cues[first:stop]
@@ -0,0 +1,289 @@
+"""Single-pass transcript quality scoring shared by the servers and the CLI.
+
+Per-cue work is one Python loop; everything else (punctuation, special
+characters, word frequencies) runs in C over the joined text with
+``str.translate``, a precompiled regex and ``collections.Counter``. Scores are
+identical to the original multi-pass implementations.
+
+Reports are stored with the cached transcript and in a small JSON sidecar next
+to the resource file, tagged with ``QUALITY_SCORING_VERSION`` so lookups for
+an already-fetched video are plain reads until the heuristics change. Both
+servers write sidecars with their own report layout, so each layout has its
+own file (``<video_id>.<schema>.quality.json``) and the sidecar records its
+``schema`` as a guard.
+"""
+
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .cues import Cue, as_cues
+
+# Characters counted as punctuation by the scoring heuristics
+_PUNCTUATION_DELETE = str.maketrans('', '', '.,!?;:')
+
+# Characters that are neither alphanumeric (str.isalnum) nor ordinary text punctuation
+_SPECIAL_CHAR_RE = re.compile(r'[^\w .,!?;:\-\'"]|_')
+
+_ENGLISH_WORDS = {'the', 'and', 'is', 'to', 'of', 'in', 'for', 'with', 'on', 'as', 'by', 'this', 'that'}
+
+# Rendered timestamp prefixes: "[MM:SS] " and "[HH:MM:SS] "
+_HOUR_MS = 3600 * 1000
+
+# Bump whenever a scoring heuristic changes; stored reports with another version are recomputed
+QUALITY_SCORING_VERSION = 1
+
+
+def count_punctuation(text: str) -> int:
+    """Count ``.,!?;:`` characters in a string."""
+    return len(text) - len(text.translate(_PUNCTUATION_DELETE))
+
+
+def content_checks(full_text: str, line_count: int,
+                   video_info: Optional[Dict[str, Any]] = None) -> Tuple[List[str], int]:
+    """Run the content safety checks on lowercased transcript text.
+
+    Returns:
+        The quality warnings and the total score penalty
+    """
+    quality_warnings = []
+    safety_penalties = 0
+    word_counts = Counter(full_text.split()) if full_text else Counter()
+    word_total = sum(word_counts.values())
+
+    # SAFETY CHECK 1: Detect gibberish/nonsensical content
+    if word_total > 10:
+        # Check for excessive repetition of short words like "uh", "um", "the"
+        most_common_short = max((count for word, count in word_counts.items() if len(word) <= 3), default=0)
+        if most_common_short > word_total * 0.15:  # More than 15% repetition
+            quality_warnings.append("High repetition of short words detected")
+            safety_penalties += 15
+
+    # SAFETY CHECK 2: Check for incoherent character sequences
+    if full_text:
+        # Look for excessive special characters or garbled text
+        special_chars = len(full_text) - len(_SPECIAL_CHAR_RE.sub('', full_text))
+        if special_chars / len(full_text) > 0.05:  # More than 5% special characters
+            quality_warnings.append("Excessive special characters suggest garbled content")
+            safety_penalties += 20
+
+    # SAFETY CHECK 3: Duration validation (if video info available)
+    if video_info and 'duration' in video_info:
+        expected_lines = video_info['duration'] / 3  # Rough estimate: 1 line per 3 seconds
+        if line_count > expected_lines * 2:  # More than double expected
+            quality_warnings.append("Transcript length seems excessive for video duration")
+            safety_penalties += 10
+        elif line_count < expected_lines * 0.3:  # Less than 30% expected
+            quality_warnings.append("Transcript seems too short for video duration")
+            safety_penalties += 15
+
+    # SAFETY CHECK 4: Language consistency check
+    if full_text:
+        english_word_ratio = len(_ENGLISH_WORDS.intersection(word_counts)) / len(_ENGLISH_WORDS)
+        if english_word_ratio < 0.3 and len(word_counts) > 20:  # Low English word presence
+            quality_warnings.append("Content may not be in expected language")
+            safety_penalties += 10
+
+    return quality_warnings, safety_penalties
+
+
+def _contains_seen_text(text: str, seen_texts: set, seen_lengths: set) -> bool:
+    """Check whether any seen text is a substring of ``text``.
+
+    For each seen length, the substrings of that length are generated and
+    checked against the set entirely in C (``map`` over slices, ``isdisjoint``).
+    """
+    size = len(text)
+    for length in seen_lengths:
+        if length < size:
+            substrings = map(text.__getitem__, map(slice, range(size - length + 1), range(length, size + 1)))
+            if not seen_texts.isdisjoint(substrings):
+                return True
+    return False
+
+
+def count_duplicates(texts: Iterable[str]) -> Tuple[int, int]:
+    """Count exact and partial duplicates among caption texts.
+
+    A text is an exact duplicate if an earlier text is identical after
+    normalising whitespace and case, and a partial duplicate if it contains or
+    is contained in an earlier one. Containment in earlier texts is one C-level
+    search over their NUL-joined UTF-8 bytes; earlier texts contained in this
+    one are found by looking up its substrings of the lengths seen so far.
+    """
+    exact_duplicates = 0
+    partial_duplicates = 0
+    seen_texts = set()
+    seen_lengths = set()
+    haystack = bytearray(b'\x00')
+
+    for text in texts:
+        clean_text = ' '.join(text.split()).lower()
+        if clean_text in seen_texts:
+            exact_duplicates += 1
+            continue
+
+        encoded = clean_text.encode('utf-8')
+        if seen_texts and (encoded in haystack or _contains_seen_text(clean_text, seen_texts, seen_lengths)):
+            partial_duplicates += 1
+
+        seen_texts.add(clean_text)
+        seen_lengths.add(len(clean_text))
+        haystack += encoded + b'\x00'
+
+    return exact_duplicates, partial_duplicates
+
+
+def calculate_quality_score(lines: Union[Sequence[Cue], Sequence[str]],
+                            video_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Calculate transcript quality metrics with enhanced safety validation.
+
+    Accepts cues (or rendered ``"[MM:SS] text"`` lines). Length and punctuation
+    metrics are measured on the rendered line, timestamp included.
+    """
+    if not lines:
+        return {
+            "quality_score": 0,
+            "line_count": 0,
+            "avg_line_length": 0,
+            "deduplication_effectiveness": 0,
+            "has_punctuation": False,
+            "timestamp_coverage": 0,
+            "quality_warnings": []
+        }
+
+    cues = as_cues(lines)
+
+    # One scan over the cues for everything that depends on the timestamps
+    line_count = len(cues)
+    total_chars = 0
+    timestamp_colons = 0
+    timestamped_lines = 0
+    text_content = []
+    for cue in cues:
+        text = cue.text
+        total_chars += len(text)
+        if cue.start_ms is not None:
+            timestamped_lines += 1
+            if cue.start_ms >= _HOUR_MS:
+                total_chars += 11
+                timestamp_colons += 2
+            else:
+                total_chars += 8
+                timestamp_colons += 1
+        if text:
+            text_content.append(text)
+
+    raw_text = ' '.join(text_content)
+    avg_line_length = total_chars / line_count
+
+    # Punctuation analysis (timestamp colons included)
+    punctuation_chars = count_punctuation(raw_text) + timestamp_colons
+    has_punctuation = punctuation_chars > line_count * 0.1  # At least 10% of lines have punctuation
+
+    # Timestamp coverage
+    timestamp_coverage = timestamped_lines / line_count
+
+    # Enhanced Quality Validation
+    quality_warnings, safety_penalties = content_checks(raw_text.lower(), line_count, video_info)
+
+    # Quality score calculation (0-100)
+    quality_score = 0
+
+    # Line count factor (more lines generally better, up to a point)
+    if line_count > 10:
+        quality_score += min(30, line_count * 0.5)
+
+    # Average line length (reasonable length indicates good segmentation)
+    if 20 <= avg_line_length <= 100:
+        quality_score += 25
+    elif 10 <= avg_line_length <= 150:
+        quality_score += 15
+
+    # Punctuation presence
+    if has_punctuation:
+        quality_score += 20
+
+    # Timestamp coverage
+    quality_score += timestamp_coverage * 25
+
+    # Apply safety penalties
+    quality_score = max(0, quality_score - safety_penalties)
+
+    # Additional warning if score is artificially high but has safety issues
+    if quality_score > 60 and safety_penalties > 20:
+        quality_warnings.append("⚠️ High structural score but content quality concerns detected")
+
+    return {
+        "quality_score": int(quality_score),
+        "line_count": line_count,
+        "avg_line_length": round(avg_line_length, 1),
+        "deduplication_effectiveness": 0,  # Will be calculated during deduplication
+        "has_punctuation": has_punctuation,
+        "timestamp_coverage": round(timestamp_coverage, 2),
+        "quality_warnings": quality_warnings,
+        "safety_penalties": safety_penalties
+    }
+
+
+# ============================================================================
+# STORED QUALITY REPORTS
+# ============================================================================
+
+def stamp_quality_version(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Tag quality metrics with the scoring version they were computed with."""
+    metrics["scoring_version"] = QUALITY_SCORING_VERSION
+    return metrics
+
+
+def is_current_quality(metrics: Optional[Dict[str, Any]]) -> bool:
+    """Check whether stored metrics were computed by the current scoring version."""
+    return bool(metrics) and metrics.get("scoring_version") == QUALITY_SCORING_VERSION
+
+
+def quality_sidecar_path(directory: Union[str, Path], video_id: str, schema: Optional[str] = None) -> Path:
+    """Path of the quality sidecar stored next to a video's resource file, one per report ``schema``."""
+    if schema is None:
+        return Path(directory) / f"{video_id}.quality.json"
+    return Path(directory) / f"{video_id}.{schema}.quality.json"
+
+
+def save_quality_sidecar(path: Path, report: Dict[str, Any], schema: Optional[str] = None) -> bool:
+    """Write a quality report sidecar tagged with the current scoring version and the report ``schema``."""
+    try:
+        payload = {**report, "scoring_version": QUALITY_SCORING_VERSION, "saved_at": datetime.now().isoformat()}
+        if schema is not None:
+            payload["schema"] = schema
+        Path(path).write_text(json.dumps(payload, indent=2), encoding='utf-8')
+        return True
+    except (OSError, TypeError, ValueError):
+        return False
+
+
+def load_quality_sidecar(path: Path, schema: Optional[str] = None,
+                         required_keys: Sequence[str] = ()) -> Optional[Dict[str, Any]]:
+    """Read a quality report sidecar.
+
+    Args:
+        path: Sidecar path (see ``quality_sidecar_path``)
+        schema: Report schema the caller reads; sidecars with another schema are ignored
+        required_keys: Keys the caller reads from the report
+
+    Returns:
+        The stored report, or None if it is missing, unreadable, was
+        written by another scoring version or schema, or lacks a required key
+    """
+    try:
+        report = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(report, dict) or not is_current_quality(report):
+        return None
+    if schema is not None and report.get("schema") != schema:
+        return None
+    if any(key not in report for key in required_keys):
+        return None
+    return report
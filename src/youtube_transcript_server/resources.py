@@ -2,11 +2,16 @@
 
 from typing import Dict, List, Any, Optional
 from .config import settings
+from .engines import get_engine
+from .cache import create_transcript_cache, cache_key, split_lines_result, rebuild_lines_result
+from .pipeline import TranscriptPipeline
+from .singleflight import extraction_flights
 from datetime import datetime
 import sys
 
-# In-memory cache for transcript data
-_transcript_cache: Dict[str, Dict[str, Any]] = {}
+# In-memory cache for transcript data (LRU, bounded by CACHE_SIZE and CACHE_MAX_BYTES),
+# backed by the persistent disk cache for extraction results
+_transcript_cache = create_transcript_cache(settings)
 _video_cache: Dict[str, Dict[str, Any]] = {}
 _analysis_history: List[Dict[str, Any]] = []
 
@@ -15,16 +20,37 @@ cached_transcripts = _transcript_cache
 analysis_history = _analysis_history
 
 
-def add_to_cache(video_id: str, transcript_data: str, language: str = "en") -> None:
-    """Add transcript to cache."""
+def add_to_cache(video_id: str, transcript_data: str, language: str = "en",
+                 fmt: str = "text", dedup_mode: str = "none", result: Optional[Dict[str, Any]] = None,
+                 pipeline: Optional[TranscriptPipeline] = None) -> None:
+    """Add transcript to cache.
+    
+    Args:
+        video_id: YouTube video ID
+        transcript_data: Transcript text
+        language: Language code of the transcript
+        fmt: Transcript variant (e.g. "text", "vtt", "best", "enhanced")
+        dedup_mode: Deduplication applied to the transcript
+        result: Extraction details served to later calls on a cache hit
+        pipeline: Memoized processing stages of the transcript (kept in memory only)
+    """
     global _transcript_cache, _video_cache
     
-    _transcript_cache[video_id] = {
+    entry = {
         "transcript": transcript_data,
         "language": language,
+        "format": fmt,
+        "dedup_mode": dedup_mode,
         "cached_at": datetime.now().isoformat(),
-        "length": len(transcript_data.split('\n'))
+        "length": transcript_data.count('\n') + 1
     }
+    if result is not None:
+        entry["result"] = result
+    if pipeline is not None:
+        # Memoized stages stay with the in-memory entry for later calls
+        entry["pipeline"] = pipeline
+    # Only extraction results are worth persisting across restarts
+    _transcript_cache.put(cache_key(video_id, language, fmt, dedup_mode), entry, persist=result is not None)
     
     _video_cache[video_id] = {
         "video_id": video_id,
@@ -34,6 +60,42 @@ def add_to_cache(video_id: str, transcript_data: str, language: str = "en") -> N
     }
 
 
+def get_cached_transcript(video_id: str, language: str = "en", fmt: str = "text", dedup_mode: str = "none") -> Optional[Dict[str, Any]]:
+    """Get a cached transcript entry, recording a cache hit or miss."""
+    return _transcript_cache.lookup(cache_key(video_id, language, fmt, dedup_mode))
+
+
+def cache_transcript_lines(video_id: str, result: Dict[str, Any], language: str = "en",
+                           fmt: str = "text", dedup_mode: str = "none") -> None:
+    """Cache a line-based extraction result, storing the lines once as transcript text.
+
+    Cues are kept as compact ``[start_ms, end_ms]`` timings next to the text.
+    """
+    transcript, details = split_lines_result(result)
+    add_to_cache(video_id, transcript, language, fmt, dedup_mode, result=details, pipeline=result.get('pipeline'))
+
+
+def get_cached_lines_result(video_id: str, language: str = "en", fmt: str = "text",
+                            dedup_mode: str = "none") -> Optional[Dict[str, Any]]:
+    """Rebuild an extraction result (lines and cues) stored with ``cache_transcript_lines``."""
+    entry = get_cached_transcript(video_id, language, fmt, dedup_mode)
+    if entry is None or "result" not in entry:
+        return None
+    return rebuild_lines_result(entry, _transcript_cache)
+
+
+def find_cached_lines_result(video_id: str, language: str = "en") -> Optional[Dict[str, Any]]:
+    """Rebuild the most recently used in-memory extraction result of any variant for a video.
+
+    Lets tools that only need the cues (search, slicing) reuse whichever
+    variant another tool already extracted.
+    """
+    entry = _transcript_cache.find(video_id, lambda entry: "result" in entry and entry.get("language") == language)
+    if entry is None:
+        return None
+    return rebuild_lines_result(entry, _transcript_cache)
+
+
 def add_analysis_to_history(analysis_type: str, video_url: str, query: str = None) -> None:
     """Add analysis to history."""
     global _analysis_history
@@ -77,10 +139,12 @@ async def get_cached_transcripts() -> dict:
     global _transcript_cache
     
     transcripts = []
-    for video_id, data in _transcript_cache.items():
+    for (video_id, language, fmt, dedup_mode), data in _transcript_cache.items():
         transcripts.append({
             "video_id": video_id,
-            "language": data.get("language", "unknown"),
+            "language": data.get("language", language),
+            "format": fmt,
+            "dedup_mode": dedup_mode,
             "length_lines": data.get("length", 0),
             "cached_at": data.get("cached_at"),
             "size_kb": round(len(data.get("transcript", "")) / 1024, 2)
@@ -89,7 +153,8 @@ async def get_cached_transcripts() -> dict:
     return {
         "cached_transcripts": transcripts,
         "total_cached": len(transcripts),
-        "total_size_kb": round(sum(len(data.get("transcript", "")) for data in _transcript_cache.values()) / 1024, 2)
+        "total_size_kb": round(_transcript_cache.total_bytes / 1024, 2),
+        "cache_stats": _transcript_cache.stats()
     }
 
 
@@ -105,7 +170,7 @@ async def get_video_metadata(video_id: str) -> dict:
         }
     
     video_data = _video_cache[video_id]
-    transcript_data = _transcript_cache.get(video_id, {})
+    transcript_data = _transcript_cache.find(video_id) or {}
     
     return {
         "video_id": video_id,
@@ -122,14 +187,15 @@ async def get_transcript_sample(video_id: str, lines: int = 10) -> dict:
     """Get a sample of transcript lines."""
     global _transcript_cache
     
-    if video_id not in _transcript_cache:
+    entry = _transcript_cache.find(video_id)
+    if entry is None:
         return {
             "video_id": video_id,
             "status": "not_found",
             "sample": []
         }
     
-    transcript = _transcript_cache[video_id]["transcript"]
+    transcript = entry["transcript"]
     lines_list = transcript.split('\n')
     
     # Take first N lines, skipping header if present
@@ -146,7 +212,7 @@ async def get_transcript_sample(video_id: str, lines: int = 10) -> dict:
         "status": "found",
         "sample": sample_lines,
         "total_lines": len(lines_list),
-        "language": _transcript_cache[video_id].get("language", "unknown")
+        "language": entry.get("language", "unknown")
     }
 
 
@@ -185,7 +251,7 @@ def get_memory_usage() -> dict:
     """Get memory usage information."""
     global _transcript_cache, _video_cache, _analysis_history
     
-    transcript_size = sum(len(str(data)) for data in _transcript_cache.values())
+    transcript_size = _transcript_cache.total_bytes
     video_cache_size = sum(len(str(data)) for data in _video_cache.values())
     history_size = sum(len(str(analysis)) for analysis in _analysis_history)
     
@@ -217,11 +283,10 @@ def get_memory_usage() -> dict:
 async def get_system_status() -> dict:
     """Get system status information."""
     # Check yt-dlp availability (our primary method)
+    engine = get_engine()
     try:
-        import subprocess
-        yt_dlp_result = subprocess.run(['yt-dlp', '--version'], capture_output=True, text=True, timeout=5)
-        yt_dlp_available = yt_dlp_result.returncode == 0
-        yt_dlp_version = yt_dlp_result.stdout.strip() if yt_dlp_available else None
+        yt_dlp_version = await engine.version()
+        yt_dlp_available = yt_dlp_version is not None
     except:
         yt_dlp_available = False
         yt_dlp_version = None
@@ -232,12 +297,15 @@ async def get_system_status() -> dict:
         "dependencies": {
             "yt_dlp": "available" if yt_dlp_available else "missing",
             "yt_dlp_version": yt_dlp_version,
-            "extraction_method": "yt-dlp (reliable)"
+            "extraction_method": "yt-dlp (reliable)",
+            "extraction_engine": engine.name
         },
         "cache_status": {
             "transcripts_cached": len(_transcript_cache),
             "videos_tracked": len(_video_cache),
-            "analyses_logged": len(_analysis_history)
+            "analyses_logged": len(_analysis_history),
+            "transcript_cache": _transcript_cache.stats(),
+            "extractions": extraction_flights.stats()
         },
         "notes": {
             "youtube_transcript_api": "removed due to cloud server blocking issues",
@@ -0,0 +1,405 @@
+"""Token index for searching within one transcript.
+
+``TranscriptIndex`` maps every lowercased word of a transcript to its
+positions in the transcript's word stream, and the word stream to cues. It is
+built once per transcript and memoized on its ``TranscriptPipeline`` (which
+lives on the cache entry), so repeated searches of a cached video only touch
+the postings of the query words.
+
+Query syntax:
+
+- ``python decorators`` - cues containing both words (AND). A word matches
+  any token containing it, like the previous substring search.
+- ``"list comprehension"`` - the exact words in sequence; phrases may run on
+  into the next cue and are reported at the cue where they start.
+
+``rank_passages`` orders matches by relevance: each match is scored with BM25
+over its context window (the matching cue and ``context_lines`` cues on either
+side), using the cue-level document frequencies of the query terms. Windows
+that overlap or touch are merged into one passage, so a frequent term yields a
+few longer passages instead of hundreds of repeated context lines.
+
+Fuzzy mode tolerates caption misspellings: each query word also matches the
+indexed words within a small edit distance. Candidates come from a trigram
+index over the transcript's vocabulary (built on first fuzzy use) and are
+verified with a bounded Levenshtein distance, so a query costs a few trigram
+lookups and distance checks on words of similar length, never a scan of the
+transcript.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from array import array
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Pattern, Sequence, Set, Tuple
+
+from .cues import Cue
+from .pipeline import TranscriptPipeline, estimate_footprint
+
+_TOKEN_RE = re.compile(r"\w+")
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+
+# Memoized results of recent queries (and query terms) per transcript
+QUERY_CACHE_SIZE = 64
+
+# BM25 parameters (term frequency saturation and window length normalisation)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Passages returned by ranked searches unless a caller asks for another number
+DEFAULT_TOP_K = 10
+
+# Largest edit distance fuzzy searches accept for a query word
+MAX_FUZZY_EDITS = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of a text."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Split a query into AND terms and quoted phrases.
+
+    Quoted text with a single word is treated as an exact term.
+    """
+    phrases = []
+    terms = []
+    for quoted in _PHRASE_RE.findall(query):
+        words = tokenize(quoted)
+        if len(words) > 1:
+            phrases.append(words)
+        elif words:
+            terms.append(words[0])
+    terms.extend(tokenize(_PHRASE_RE.sub(' ', query)))
+    return list(dict.fromkeys(terms)), phrases
+
+
+def query_words(query: str) -> List[str]:
+    """All distinct words of a query, phrase words included."""
+    terms, phrases = parse_query(query)
+    return list(dict.fromkeys(terms + [word for words in phrases for word in words]))
+
+
+def fuzzy_edits(term: str) -> int:
+    """Edits tolerated for a query word in fuzzy mode: none for short words, more for longer ones."""
+    if len(term) <= 3:
+        return 0
+    return 1 if len(term) <= 7 else MAX_FUZZY_EDITS
+
+
+def trigrams(word: str) -> Set[str]:
+    """Trigrams of a word padded with ``^`` and ``$`` (a word of n characters has n of them)."""
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Levenshtein distance between two words, or None once it must exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= limit else None
+
+
+def highlight_pattern(query: str) -> Pattern:
+    """Regex matching the words and phrases of a query, longest first, case-insensitive."""
+    terms, phrases = parse_query(query)
+    alternatives = [r'\W+'.join(map(re.escape, words)) for words in phrases] + [re.escape(term) for term in terms]
+    if not alternatives:
+        alternatives = [re.escape(query)]
+    return re.compile('|'.join(sorted(alternatives, key=len, reverse=True)), re.IGNORECASE)
+
+
+class TranscriptIndex:
+    """Inverted index of one transcript: word -> word positions -> cues."""
+
+    def __init__(self, cues: Sequence[Cue], on_grow: Optional[Callable[[int], None]] = None):
+        self.cues = cues
+        # Told the size of structures built after construction (see ``TranscriptPipeline.account``)
+        self._on_grow = on_grow
+        postings: Dict[str, array] = {}
+        # Word position at which each cue starts
+        self.cue_starts = array('l')
+        position = 0
+        for cue in cues:
+            self.cue_starts.append(position)
+            for token in tokenize(cue.text):
+                positions = postings.get(token)
+                if positions is None:
+                    positions = postings[token] = array('l')
+                positions.append(position)
+                position += 1
+        self.postings = postings
+        self.word_count = position
+        self._term_cache: Dict[str, Tuple[List[int], FrozenSet[int]]] = {}
+        self._query_cache: Dict[str, List[int]] = {}
+        # Vocabulary trigram index for fuzzy searches, built on first use
+        self._trigrams: Optional[Dict[str, List[str]]] = None
+        self._fuzzy_cache: Dict[Tuple[str, int], Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.cues)
+
+    def footprint(self) -> int:
+        """Estimated size of the postings in bytes (the cues belong to the pipeline)."""
+        return estimate_footprint(self.postings) + estimate_footprint(self.cue_starts)
+
+    def cue_at(self, position: int) -> int:
+        """Index of the cue containing a word position."""
+        return bisect.bisect_right(self.cue_starts, position) - 1
+
+    def expand(self, term: str) -> List[str]:
+        """Indexed tokens containing a term (scans the vocabulary, not the transcript)."""
+        return [token for token in self.postings if term in token]
+
+    def term_positions(self, term: str) -> Tuple[List[int], FrozenSet[int]]:
+        """Sorted word positions of the tokens containing ``term``, and the cues they fall in."""
+        cached = self._term_cache.get(term)
+        if cached is None:
+            if len(self._term_cache) >= QUERY_CACHE_SIZE:
+                self._term_cache.pop(next(iter(self._term_cache)))
+            positions = sorted(position for token in self.expand(term) for position in self.postings[token])
+            cue_at = self.cue_at
+            cached = self._term_cache[term] = (positions, frozenset(cue_at(position) for position in positions))
+        return cached
+
+    def term_cues(self, term: str) -> FrozenSet[int]:
+        """Cues containing a token that contains ``term``."""
+        return self.term_positions(term)[1]
+
+    def phrase_starts(self, words: Sequence[str]) -> List[int]:
+        """Word positions where the exact word sequence starts, in order."""
+        rarest = min(range(len(words)), key=lambda offset: len(self.postings.get(words[offset], ())))
+        candidates = self.postings.get(words[rarest])
+        if not candidates:
+            return []
+        others = [(offset, set(self.postings.get(word, ()))) for offset, word in enumerate(words) if offset != rarest]
+        starts = []
+        for position in candidates:
+            start = position - rarest
+            if start >= 0 and all(start + offset in positions for offset, positions in others):
+                starts.append(start)
+        return starts
+
+    def phrase_cues(self, words: Sequence[str]) -> Set[int]:
+        """Cues where the exact word sequence starts."""
+        return {self.cue_at(start) for start in self.phrase_starts(words)}
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """Indices of the cues matching every term and phrase of a query, in transcript order.
+
+        Returns None if the query has no word characters; callers fall back to
+        a plain substring scan for those.
+        """
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            return cached
+
+        terms, phrases = parse_query(query)
+        if not terms and not phrases:
+            return None
+
+        # Intersect the smallest sets first
+        sets = sorted([self.term_cues(term) for term in terms] +
+                      [self.phrase_cues(words) for words in phrases], key=len)
+        matches = set(sets[0])
+        for cue_set in sets[1:]:
+            if not matches:
+                break
+            matches &= cue_set
+        result = sorted(matches)
+
+        if len(self._query_cache) >= QUERY_CACHE_SIZE:
+            self._query_cache.pop(next(iter(self._query_cache)))
+        self._query_cache[query] = result
+        return result
+
+    def fuzzy_tokens(self, term: str, max_edits: Optional[int] = None) -> Dict[str, float]:
+        """Indexed words close to ``term``, with their similarity (1.0 for exact or containing words).
+
+        Args:
+            term: Lowercased query word
+            max_edits: Edit distance limit (``fuzzy_edits(term)`` if None, capped at ``MAX_FUZZY_EDITS``)
+        """
+        limit = fuzzy_edits(term) if max_edits is None else max(0, min(max_edits, MAX_FUZZY_EDITS))
+        key = (term, limit)
+        cached = self._fuzzy_cache.get(key)
+        if cached is not None:
+            return cached
+
+        matches = {token: 1.0 for token in self.expand(term)}
+        if limit:
+            if self._trigrams is None:
+                grams: Dict[str, List[str]] = {}
+                for token in self.postings:
+                    for gram in trigrams(token):
+                        grams.setdefault(gram, []).append(token)
+                self._trigrams = grams
+                if self._on_grow is not None:
+                    self._on_grow(estimate_footprint(grams))
+            # Each edit destroys at most three trigrams (count filter), and changes the length by at most one
+            term_grams = trigrams(term)
+            shared: Dict[str, int] = {}
+            for gram in term_grams:
+                for token in self._trigrams.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            needed = len(term_grams) - 3 * limit
+            candidates = shared if needed > 0 else self.postings
+            for token in candidates:
+                if token in matches or (needed > 0 and shared[token] < needed):
+                    continue
+                distance = bounded_edit_distance(term, token, limit)
+                if distance is not None:
+                    matches[token] = round(1 - distance / max(len(term), len(token)), 3)
+
+        if len(self._fuzzy_cache) >= QUERY_CACHE_SIZE:
+            self._fuzzy_cache.pop(next(iter(self._fuzzy_cache)))
+        self._fuzzy_cache[key] = matches
+        return matches
+
+    def fuzzy_search(self, query: str, max_edits: Optional[int] = None) -> Optional[Tuple[List[int], List[float]]]:
+        """Cues containing a near match of every query word (phrases are matched word by word).
+
+        Returns:
+            Matching cue indices in transcript order and their similarity (the
+            mean of each word's best match in the cue), or None if the query
+            has no word characters
+        """
+        terms = query_words(query)
+        if not terms:
+            return None
+
+        cue_at = self.cue_at
+        per_term = []
+        for term in terms:
+            best: Dict[int, float] = {}
+            for token, similarity in self.fuzzy_tokens(term, max_edits).items():
+                for position in self.postings[token]:
+                    cue = cue_at(position)
+                    if similarity > best.get(cue, 0.0):
+                        best[cue] = similarity
+            per_term.append(best)
+
+        per_term.sort(key=len)
+        matches = sorted(set(per_term[0]).intersection(*per_term[1:]))
+        similarities = [round(sum(best[cue] for best in per_term) / len(per_term), 3) for cue in matches]
+        return matches, similarities
+
+    def window_scores(self, query: str, matches: Sequence[int], context_lines: int) -> List[float]:
+        """BM25 score of each match's context window.
+
+        Term frequencies are counted in the window's word range by bisecting
+        the term's sorted positions; document frequencies are cue counts.
+        """
+        terms, phrases = parse_query(query)
+        cue_count = len(self.cues)
+        stats = []
+        for term in terms:
+            positions, cues = self.term_positions(term)
+            stats.append((positions, len(cues)))
+        for words in phrases:
+            starts = self.phrase_starts(words)
+            stats.append((starts, len({self.cue_at(start) for start in starts})))
+        weighted = [(positions, math.log((cue_count - df + 0.5) / (df + 0.5) + 1)) for positions, df in stats]
+
+        average_length = self.word_count / cue_count * (2 * context_lines + 1) if cue_count else 0
+        cue_starts = self.cue_starts
+        scores = []
+        for index in matches:
+            low = cue_starts[max(0, index - context_lines)]
+            high_cue = index + context_lines + 1
+            high = cue_starts[high_cue] if high_cue < cue_count else self.word_count
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * (high - low) / average_length) if average_length else BM25_K1
+            score = 0.0
+            for positions, idf in weighted:
+                tf = bisect.bisect_left(positions, high) - bisect.bisect_left(positions, low)
+                if tf:
+                    score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+
+def merge_windows(matches: Sequence[int], scores: Sequence[float], context_lines: int,
+                  cue_count: int) -> List[Dict[str, Any]]:
+    """Merge the context windows of matches (in transcript order) that overlap or touch.
+
+    Returns:
+        Passages in transcript order with the cue range ``start``/``end``
+        (exclusive), their ``matches`` with each match's score in
+        ``scores``, and the best window ``score``
+    """
+    passages = []
+    for index, score in zip(matches, scores):
+        start = max(0, index - context_lines)
+        end = min(cue_count, index + context_lines + 1)
+        if passages and start <= passages[-1]['end']:
+            passage = passages[-1]
+            passage['end'] = max(passage['end'], end)
+            passage['matches'].append(index)
+            passage['scores'].append(score)
+            passage['score'] = max(passage['score'], score)
+        else:
+            passages.append({'start': start, 'end': end, 'matches': [index], 'scores': [score], 'score': score})
+    return passages
+
+
+def transcript_index(pipeline: TranscriptPipeline) -> TranscriptIndex:
+    """Get the search index of a transcript, building it on first use."""
+    return pipeline.derive("search_index", lambda: TranscriptIndex(pipeline.raw, on_grow=pipeline.account))
+
+
+def search_cues(pipeline: TranscriptPipeline, query: str) -> List[int]:
+    """Indices of the raw cues matching a query (see the module docstring for the syntax)."""
+    matches = transcript_index(pipeline).search(query)
+    if matches is None:
+        query_lower = query.lower()
+        matches = [i for i, cue in enumerate(pipeline.raw) if query_lower in cue.text.lower()]
+    return matches
+
+
+def rank_passages(pipeline: TranscriptPipeline, query: str, context_lines: int = 2,
+                  top_k: int = DEFAULT_TOP_K, fuzzy: bool = False,
+                  max_edits: Optional[int] = None) -> Tuple[int, List[Dict[str, Any]]]:
+    """Most relevant passages of a transcript for a query.
+
+    Args:
+        fuzzy: Also match words within a few edits of the query words;
+            passages are then scored by similarity (0-1) instead of BM25
+        max_edits: Edit distance limit for fuzzy matching (see ``fuzzy_edits``)
+
+    Returns:
+        The number of matching cues and up to ``top_k`` merged passages (see
+        ``merge_windows``), best first. Queries without word characters
+        match by substring and keep transcript order.
+    """
+    context_lines = max(0, context_lines)
+    index = transcript_index(pipeline)
+    fuzzy_result = index.fuzzy_search(query, max_edits) if fuzzy else None
+    if fuzzy_result is not None:
+        matches, scores = fuzzy_result
+    else:
+        matches = search_cues(pipeline, query)
+        if index.search(query) is None:
+            scores = [0.0] * len(matches)
+        else:
+            scores = index.window_scores(query, matches, context_lines)
+    passages = merge_windows(matches, scores, context_lines, len(pipeline.raw))
+    # Best first; ties (and substring scans) stay in transcript order
+    best = heapq.nsmallest(max(1, top_k), range(len(passages)), key=lambda i: (-passages[i]['score'], i))
+    return len(matches), [passages[i] for i in best]
+
+
+def fuzzy_highlight_pattern(pipeline: TranscriptPipeline, query: str, max_edits: Optional[int] = None) -> Pattern:
+    """Highlight pattern for the transcript words a fuzzy query matched."""
+    index = transcript_index(pipeline)
+    tokens = {token for term in query_words(query) for token in index.fuzzy_tokens(term, max_edits)}
+    return highlight_pattern(' '.join(sorted(tokens))) if tokens else highlight_pattern(query)
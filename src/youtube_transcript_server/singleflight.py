@@ -0,0 +1,67 @@
+"""Request coalescing for concurrent extractions.
+
+When several tools ask for the same video at the same time, only the first
+call runs the extraction; the others await the in-flight task and share its
+result. Combined with the transcript cache this keeps fan-out workloads
+(e.g. summary + quotes + study notes for one URL) to a single yt-dlp run.
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """Deduplicate concurrent async calls that share a key."""
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` unless a call with the same key is already running.
+
+        The shared task is shielded, so a cancelled caller doesn't cancel the
+        extraction the other callers are waiting for.
+        """
+        loop_key = (asyncio.get_running_loop(), key)
+        task = self._in_flight.get(loop_key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        self._in_flight[loop_key] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(loop_key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing counters for status resources."""
+        return {
+            "in_flight": len(self._in_flight),
+            "coalesced_requests": self.coalesced
+        }
+
+
+# Shared by every extraction entry point in the process
+extraction_flights = SingleFlight()
+
+
+def coalesce(key_func: Callable[..., Hashable]):
+    """Decorator that coalesces concurrent calls to an async extraction function.
+
+    Args:
+        key_func: Builds the flight key from the call arguments. If it raises
+            (e.g. an invalid URL), the call runs uncoalesced so the wrapped
+            function can report the error itself.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                key = key_func(*args, **kwargs)
+            except Exception:
+                return await func(*args, **kwargs)
+            return await extraction_flights.run(key, func, *args, **kwargs)
+        return wrapper
+    return decorator
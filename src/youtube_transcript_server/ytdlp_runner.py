@@ -0,0 +1,88 @@
+"""Asynchronous yt-dlp process runner.
+
+All yt-dlp invocations made on behalf of MCP tools go through this module so
+that a slow video never blocks the stdio event loop. Processes are spawned with
+``asyncio.create_subprocess_exec`` and the number of concurrent extractions is
+bounded by ``settings.max_concurrent_extractions``.
+"""
+
+import asyncio
+import subprocess
+import weakref
+from typing import List, Optional
+
+from .config import settings
+
+# One semaphore per event loop (tests and CLI helpers may run several loops)
+_extraction_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_ytdlp_available: Optional[bool] = None
+
+
+def _get_extraction_slots() -> asyncio.Semaphore:
+    """Get the concurrency limiter for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _extraction_slots.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.max_concurrent_extractions))
+        _extraction_slots[loop] = semaphore
+    return semaphore
+
+
+async def run_ytdlp(args: List[str], timeout: float = 60) -> subprocess.CompletedProcess:
+    """Run yt-dlp with the given arguments without blocking the event loop.
+
+    Args:
+        args: Command line arguments passed to yt-dlp
+        timeout: Seconds to wait before the process is killed
+
+    Returns:
+        CompletedProcess with decoded stdout/stderr, mirroring ``subprocess.run``
+
+    Raises:
+        subprocess.TimeoutExpired: If the process did not finish in time
+        FileNotFoundError: If the yt-dlp binary is not installed
+    """
+    cmd = ['yt-dlp', *args]
+
+    async with _get_extraction_slots():
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.communicate()
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        except asyncio.CancelledError:
+            # Don't leave orphaned yt-dlp processes behind when a request is cancelled
+            process.kill()
+            raise
+
+    return subprocess.CompletedProcess(
+        cmd,
+        process.returncode,
+        stdout.decode('utf-8', errors='replace'),
+        stderr.decode('utf-8', errors='replace')
+    )
+
+
+async def check_ytdlp_available_async() -> bool:
+    """Check if yt-dlp is available without blocking the event loop.
+
+    A positive result is remembered for the lifetime of the process.
+    """
+    global _ytdlp_available
+
+    if _ytdlp_available:
+        return True
+
+    try:
+        result = await run_ytdlp(['--version'], timeout=10)
+        _ytdlp_available = result.returncode == 0
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        _ytdlp_available = False
+
+    return _ytdlp_available
@@ -14,17 +14,34 @@ Focus: Quality over quantity, complete implementations, zero placeholders
 import re
 import json
 import subprocess
-import tempfile
-import shutil
 import os
-import glob
 import asyncio
-import html
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Optional, Dict
+from typing import Any, List, Optional, Dict, Union
 from mcp.server.fastmcp import FastMCP
 
+# yt-dlp extraction engine (in-process library or CLI fallback) shared with the enhanced server
+from src.youtube_transcript_server.engines import get_engine, fetch_video_bundle
+from src.youtube_transcript_server.cache import (
+    create_transcript_cache, cache_key, split_lines_result, rebuild_lines_result
+)
+from src.youtube_transcript_server.singleflight import coalesce, extraction_flights
+# Shared extraction core: subtitle parser registry and deduplication
+from src.youtube_transcript_server.parsers import (
+    parse_subtitle_content, parse_subtitle_cues, parse_subtitle_file, parse_vtt_timestamp, format_timestamp
+)
+from src.youtube_transcript_server.dedup import deduplicate_cues, deduplicate_transcript_lines, deduplicate_vtt_cues
+from src.youtube_transcript_server.cues import Cue, as_cues, render_lines
+from src.youtube_transcript_server.pipeline import AGGRESSIVE, RAW, TranscriptPipeline, as_pipeline, pipeline_for
+# Quality scoring (single pass, shared with the CLI)
+from src.youtube_transcript_server.catalog import ResourceCatalog
+from src.youtube_transcript_server.library import LibraryIndex
+from src.youtube_transcript_server.quality import (
+    calculate_quality_score, is_current_quality, load_quality_sidecar, quality_sidecar_path,
+    save_quality_sidecar, stamp_quality_version
+)
+
 # ============================================================================
 # CONFIGURATION & SETTINGS
 # ============================================================================
@@ -37,12 +54,19 @@ class StreamlinedSettings:
         self.version = "0.5.0"
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         self.cache_size = int(os.getenv("CACHE_SIZE", "50"))
+        self.cache_max_bytes = int(os.getenv("CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
         self.default_language = os.getenv("DEFAULT_LANGUAGE", "en")
         # Claude Desktop has a 100,000 character limit for tool responses
         self.max_output_chars = int(os.getenv("MAX_OUTPUT_CHARS", "95000"))
         self.enable_smart_truncation = os.getenv("ENABLE_SMART_TRUNCATION", "true").lower() == "true"
         self.aggressive_dedup = os.getenv("AGGRESSIVE_DEDUP", "true").lower() == "true"
+        # Rebuild the word stream of rolling auto-captions instead of comparing neighbouring cues
+        self.rolling_dedup = os.getenv("ROLLING_DEDUP", "true").lower() == "true"
         self.resource_dir = Path("resources/transcripts")
+        # Persistent SQLite cache under resource_dir so restarts don't re-run yt-dlp
+        self.disk_cache_enabled = os.getenv("DISK_CACHE_ENABLED", "true").lower() == "true"
+        self.disk_cache_ttl = int(os.getenv("DISK_CACHE_TTL", str(7 * 24 * 3600)))
+        self.disk_cache_max_bytes = int(os.getenv("DISK_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
         
     @property
     def server_info(self) -> dict:
@@ -52,10 +76,15 @@ class StreamlinedSettings:
             "version": self.version,
             "log_level": self.log_level,
             "cache_size": self.cache_size,
+            "cache_max_bytes": self.cache_max_bytes,
             "default_language": self.default_language,
             "max_output_chars": self.max_output_chars,
             "enable_smart_truncation": self.enable_smart_truncation,
-            "aggressive_dedup": self.aggressive_dedup
+            "aggressive_dedup": self.aggressive_dedup,
+            "rolling_dedup": self.rolling_dedup,
+            "disk_cache_enabled": self.disk_cache_enabled,
+            "disk_cache_ttl": self.disk_cache_ttl,
+            "disk_cache_max_bytes": self.disk_cache_max_bytes
         }
 
 # Initialize global settings
@@ -72,21 +101,33 @@ mcp = FastMCP(
 # IN-MEMORY CACHING SYSTEM (Two-tier: Memory + File-based MCP Resources)
 # ============================================================================
 
-# In-memory cache for transcript data
-_transcript_cache: Dict[str, Dict[str, Any]] = {}
+# In-memory cache for transcript data (LRU, bounded by CACHE_SIZE and CACHE_MAX_BYTES),
+# backed by the persistent disk cache for extraction results
+_transcript_cache = create_transcript_cache(settings)
 _video_cache: Dict[str, Dict[str, Any]] = {}
 _analysis_history: List[Dict[str, Any]] = []
 
-def add_to_cache(video_id: str, transcript_data: str, language: str = "en") -> None:
-    """Add transcript to in-memory cache."""
+def add_to_cache(video_id: str, transcript_data: str, language: str = "en", fmt: str = "text",
+                 dedup_mode: str = "none", result: Optional[Dict[str, Any]] = None,
+                 pipeline: Optional[TranscriptPipeline] = None) -> None:
+    """Add transcript to in-memory cache under its (video_id, language, format, dedup mode) key."""
     global _transcript_cache, _video_cache
     
-    _transcript_cache[video_id] = {
+    entry = {
         "transcript": transcript_data,
         "language": language,
+        "format": fmt,
+        "dedup_mode": dedup_mode,
         "cached_at": datetime.now().isoformat(),
-        "length": len(transcript_data.split('\n'))
+        "length": transcript_data.count('\n') + 1
     }
+    if result is not None:
+        entry["result"] = result
+    if pipeline is not None:
+        # Memoized stages stay with the in-memory entry for later calls
+        entry["pipeline"] = pipeline
+    # Only extraction results are worth persisting across restarts
+    _transcript_cache.put(cache_key(video_id, language, fmt, dedup_mode), entry, persist=result is not None)
     
     _video_cache[video_id] = {
         "video_id": video_id,
@@ -95,6 +136,65 @@ def add_to_cache(video_id: str, transcript_data: str, language: str = "en") -> N
         "last_accessed": datetime.now().isoformat()
     }
 
+def get_dedup_mode(aggressive: bool, rolling: bool = False) -> str:
+    """Name of the deduplication mode used in cache keys."""
+    mode = "aggressive" if aggressive else "standard"
+    return f"{mode}+rolling" if rolling else mode
+
+def get_cached_extraction(video_id: str, language: str, dedup_mode: str) -> Optional[Dict[str, Any]]:
+    """Get a cached ``extract_transcript_ytdlp`` result, recording a hit or miss.
+
+    Results scored by an older ``QUALITY_SCORING_VERSION`` are rescored from
+    the cached cues and stored again.
+    """
+    key = cache_key(video_id, language, "best", dedup_mode)
+    entry = _transcript_cache.lookup(key)
+    if entry is None or "result" not in entry:
+        return None
+    result = rebuild_lines_result(entry, _transcript_cache)
+    if not is_current_quality(result.get('quality_metrics')):
+        details = entry["result"]
+        details['quality_metrics'] = result['quality_metrics'] = score_transcript(
+            result['cues'], result.get('metadata') or {},
+            result.get('original_line_count', result['line_count']), result['format']
+        )
+        _transcript_cache.put(key, entry, persist=True)
+    return result
+
+# Layout of this server's quality sidecars (the enhanced server writes its own)
+QUALITY_REPORT_SCHEMA = "streamlined"
+QUALITY_REPORT_KEYS = ('video_id', 'language', 'format', 'line_count', 'original_line_count', 'quality_metrics')
+
+def build_quality_report(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact quality report of an extraction result (what the quality views display)."""
+    return {
+        'video_id': result['video_id'],
+        'language': result['language'],
+        'format': result['format'],
+        'line_count': result['line_count'],
+        'original_line_count': result.get('original_line_count', result['line_count']),
+        'quality_metrics': result['quality_metrics']
+    }
+
+def get_stored_quality_report(video_id: str, language: str = "en") -> Optional[Dict[str, Any]]:
+    """Get the quality report of an already-fetched video without extracting it again.
+
+    The cached extraction details are checked first (no lines are rebuilt),
+    then the sidecar written next to the resource file. Reports from another
+    scoring version are ignored.
+    """
+    dedup_mode = get_dedup_mode(settings.aggressive_dedup, settings.rolling_dedup)
+    entry = _transcript_cache.lookup(cache_key(video_id, language, "best", dedup_mode))
+    if entry is not None and is_current_quality(entry.get("result", {}).get('quality_metrics')):
+        details = entry["result"]
+        return build_quality_report({**details, 'video_id': video_id, 'language': language})
+    
+    report = load_quality_sidecar(quality_sidecar_path(settings.resource_dir, video_id, QUALITY_REPORT_SCHEMA),
+                                  QUALITY_REPORT_SCHEMA, QUALITY_REPORT_KEYS)
+    if report is not None and report.get('language') == language:
+        return report
+    return None
+
 def add_analysis_to_history(analysis_type: str, video_url: str, query: Optional[str] = None) -> None:
     """Add analysis to history."""
     global _analysis_history
@@ -156,246 +256,29 @@ def extract_video_id(url: str) -> str:
 
 def check_ytdlp_available() -> bool:
     """Check if yt-dlp is available."""
+    if get_engine().name == 'library':
+        return True  # get_engine() only selects the library engine when yt_dlp imports
     try:
         subprocess.run(['yt-dlp', '--version'], capture_output=True, check=True)
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
-def parse_vtt_timestamp(timestamp_str: str) -> float:
-    """Parse VTT timestamp to seconds."""
-    # Format: 00:00:12.345 -> 12.345 seconds
-    parts = timestamp_str.split(':')
-    if len(parts) == 3:
-        hours, minutes, seconds = parts
-        return float(hours) * 3600 + float(minutes) * 60 + float(seconds)
-    elif len(parts) == 2:
-        minutes, seconds = parts
-        return float(minutes) * 60 + float(seconds)
-    else:
-        return float(parts[0])
-
-def format_timestamp(seconds: float) -> str:
-    """Format seconds to MM:SS or HH:MM:SS timestamp."""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    
-    if hours > 0:
-        return f"[{hours:02d}:{minutes:02d}:{secs:02d}]"
-    else:
-        return f"[{minutes:02d}:{secs:02d}]"
-
-# ============================================================================
-# SMART DEDUPLICATION ALGORITHM
-# ============================================================================
-
-def deduplicate_transcript_lines(lines: List[str], aggressive: bool = False) -> List[str]:
-    """Remove duplicate consecutive text while preserving timestamps.
-    
-    This fixes the common issue where YouTube auto-captions repeat the same text
-    across multiple timestamps as speech continues.
-    
-    Args:
-        lines: List of transcript lines with timestamps
-        aggressive: Use more aggressive deduplication for AI analysis
-    """
-    if not lines:
-        return lines
-    
-    deduplicated = []
-    last_clean_text = ""
-    last_words = set()
-    
-    for line in lines:
-        # Extract timestamp and text
-        if line.startswith('[') and ']' in line:
-            timestamp_end = line.find(']') + 1
-            timestamp = line[:timestamp_end]
-            text = line[timestamp_end:].strip()
-        else:
-            timestamp = ""
-            text = line.strip()
-        
-        if not text or text in ['[Music]', '[Applause]', '[Laughter]']:
-            continue
-            
-        # Clean text for comparison (remove extra spaces, normalize)
-        clean_text = ' '.join(text.split()).lower()
-        
-        # Skip if this is an exact duplicate of the last line
-        if clean_text == last_clean_text:
-            continue
-            
-        # Skip if this text is completely contained in the last text
-        # and last text is not a special caption
-        if last_clean_text and clean_text in last_clean_text and len(clean_text) < len(last_clean_text) * 0.8:
-            continue
-            
-        # Skip if the last text is completely contained in this text
-        # but this text is much longer (likely an extension)
-        if last_clean_text and last_clean_text in clean_text:
-            if len(clean_text) > len(last_clean_text) * 1.3:
-                # Replace the last entry with this more complete one
-                if deduplicated:
-                    deduplicated[-1] = line
-                    last_clean_text = clean_text
-                    continue
-        
-        if aggressive:
-            # Advanced duplicate detection: check word overlap
-            current_words = set(clean_text.split())
-            if last_words and len(current_words) > 3:
-                # Calculate overlap percentage
-                overlap = len(current_words.intersection(last_words))
-                overlap_percentage = overlap / min(len(current_words), len(last_words))
-                
-                # If more than 75% word overlap and similar length, skip
-                if (overlap_percentage > 0.75 and 
-                    abs(len(current_words) - len(last_words)) <= 3):
-                    continue
-            
-            last_words = current_words
-        
-        deduplicated.append(line)
-        last_clean_text = clean_text
-    
-    return deduplicated
-
-def calculate_quality_score(lines: List[str], video_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Calculate transcript quality metrics with enhanced safety validation."""
-    if not lines:
-        return {
-            "quality_score": 0,
-            "line_count": 0,
-            "avg_line_length": 0,
-            "deduplication_effectiveness": 0,
-            "has_punctuation": False,
-            "timestamp_coverage": 0,
-            "quality_warnings": []
-        }
-    
-    # Basic metrics
-    line_count = len(lines)
-    total_chars = sum(len(line) for line in lines)
-    avg_line_length = total_chars / line_count if line_count > 0 else 0
-    
-    # Punctuation analysis
-    punctuation_chars = sum(1 for line in lines for char in line if char in '.,!?;:')
-    has_punctuation = punctuation_chars > line_count * 0.1  # At least 10% of lines have punctuation
-    
-    # Timestamp coverage
-    timestamped_lines = sum(1 for line in lines if line.startswith('['))
-    timestamp_coverage = timestamped_lines / line_count if line_count > 0 else 0
-    
-    # Enhanced Quality Validation (NEW)
-    quality_warnings = []
-    safety_penalties = 0
-    
-    # Extract text content for analysis
-    text_content = []
-    for line in lines:
-        if line.startswith('[') and ']' in line:
-            text = line[line.find(']') + 1:].strip()
-            if text:
-                text_content.append(text.lower())
-        elif line.strip():
-            text_content.append(line.strip().lower())
-    
-    full_text = ' '.join(text_content)
-    
-    # SAFETY CHECK 1: Detect gibberish/nonsensical content
-    if full_text:
-        words = full_text.split()
-        if len(words) > 10:
-            # Check for excessive repetition of short words
-            word_freq = {}
-            for word in words:
-                if len(word) <= 3:  # Short words like "uh", "um", "the"
-                    word_freq[word] = word_freq.get(word, 0) + 1
-            
-            most_common_short = max(word_freq.values()) if word_freq else 0
-            if most_common_short > len(words) * 0.15:  # More than 15% repetition
-                quality_warnings.append("High repetition of short words detected")
-                safety_penalties += 15
-    
-    # SAFETY CHECK 2: Check for incoherent character sequences
-    if full_text:
-        # Look for excessive special characters or garbled text
-        special_char_ratio = sum(1 for c in full_text if not c.isalnum() and c not in ' .,!?;:-\'\"') / len(full_text)
-        if special_char_ratio > 0.05:  # More than 5% special characters
-            quality_warnings.append("Excessive special characters suggest garbled content")
-            safety_penalties += 20
-    
-    # SAFETY CHECK 3: Duration validation (if video info available)
-    if video_info and 'duration' in video_info:
-        expected_lines = video_info['duration'] / 3  # Rough estimate: 1 line per 3 seconds
-        if line_count > expected_lines * 2:  # More than double expected
-            quality_warnings.append("Transcript length seems excessive for video duration")
-            safety_penalties += 10
-        elif line_count < expected_lines * 0.3:  # Less than 30% expected
-            quality_warnings.append("Transcript seems too short for video duration")
-            safety_penalties += 15
-    
-    # SAFETY CHECK 4: Language consistency check
-    if full_text:
-        # Simple heuristic: Check for mixed language patterns
-        english_words = {'the', 'and', 'is', 'to', 'of', 'in', 'for', 'with', 'on', 'as', 'by', 'this', 'that'}
-        words_lower = set(full_text.split())
-        english_word_ratio = len(english_words.intersection(words_lower)) / len(english_words)
-        
-        if english_word_ratio < 0.3 and len(words_lower) > 20:  # Low English word presence
-            quality_warnings.append("Content may not be in expected language")
-            safety_penalties += 10
-    
-    # Quality score calculation (0-100)
-    quality_score = 0
-    
-    # Line count factor (more lines generally better, up to a point)
-    if line_count > 10:
-        quality_score += min(30, line_count * 0.5)
-    
-    # Average line length (reasonable length indicates good segmentation)
-    if 20 <= avg_line_length <= 100:
-        quality_score += 25
-    elif 10 <= avg_line_length <= 150:
-        quality_score += 15
-    
-    # Punctuation presence
-    if has_punctuation:
-        quality_score += 20
-    
-    # Timestamp coverage
-    quality_score += timestamp_coverage * 25
-    
-    # Apply safety penalties
-    quality_score = max(0, quality_score - safety_penalties)
-    
-    # Additional warning if score is artificially high but has safety issues
-    if quality_score > 60 and safety_penalties > 20:
-        quality_warnings.append("⚠️ High structural score but content quality concerns detected")
-    
-    return {
-        "quality_score": int(quality_score),
-        "line_count": line_count,
-        "avg_line_length": round(avg_line_length, 1),
-        "deduplication_effectiveness": 0,  # Will be calculated during deduplication
-        "has_punctuation": has_punctuation,
-        "timestamp_coverage": round(timestamp_coverage, 2),
-        "quality_warnings": quality_warnings,
-        "safety_penalties": safety_penalties
-    }
-
 # ============================================================================
 # ROBUST TRANSCRIPT EXTRACTION ENGINE
 # ============================================================================
 
-def extract_transcript_ytdlp(video_url: str, language: str = "en", metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+@coalesce(lambda video_url, language="en", metadata=None: ("best", extract_video_id(video_url), language))
+async def extract_transcript_ytdlp(video_url: str, language: str = "en", metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Extract transcript using yt-dlp with SRV1 format preference and automatic fallback.
     
     This updated version eliminates VTT duplication issues by using srv1 → json3 → ttml → vtt fallback.
+    Metadata and subtitles come from a single ``fetch_video_bundle`` pass; the enhanced
+    metadata is returned under ``metadata`` so callers don't need a second extraction.
+    Concurrent calls for the same video and language share one extraction.
     """
-    if not check_ytdlp_available():
+    engine = get_engine()
+    if not await engine.available():
         return {
             'method': 'yt-dlp',
             'success': False,
@@ -404,69 +287,60 @@ def extract_transcript_ytdlp(video_url: str, language: str = "en", metadata: Opt
             'available_languages': []
         }
     
-    temp_dir = None
     try:
         video_id = extract_video_id(video_url)
+        dedup_mode = get_dedup_mode(settings.aggressive_dedup, settings.rolling_dedup)
         
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp(prefix="ytdlp_streamlined_")
+        cached = get_cached_extraction(video_id, language, dedup_mode)
+        if cached is not None:
+            return cached
         
-        # Use new fallback system: srv1 → json3 → ttml → vtt
-        subtitle_file, actual_format = download_subtitles_with_fallback(video_url, language, temp_dir)
+        # One info lookup picks the best format up front: srv1 → json3 → ttml → vtt
+        bundle = await fetch_video_bundle(video_url, language)
+        subtitles = bundle['subtitles']
+        actual_format = subtitles['format']
+        if metadata is None:
+            metadata = build_enhanced_metadata(bundle['info'], video_url)
         
-        # Parse using the appropriate parser
-        transcript_lines = parse_subtitle_file(subtitle_file, actual_format)
+        # Parse into cues; strings are only rendered for the result
+        cues = parse_subtitle_cues(subtitles['content'], actual_format)
         
         # Calculate original line count for deduplication effectiveness
-        original_count = len(transcript_lines)
+        original_count = len(cues)
         
         # Apply deduplication (mainly for VTT fallback)
         if actual_format == 'vtt':
-            transcript_lines = deduplicate_transcript_lines(transcript_lines, aggressive=settings.aggressive_dedup)
-        
-        # Calculate deduplication effectiveness
-        dedup_effectiveness = ((original_count - len(transcript_lines)) / original_count * 100) if original_count > 0 else 0
-        
-        # Try to detect available languages from the downloaded files
-        all_subtitle_files = glob.glob(f'{temp_dir}/*.{actual_format}')
-        available_languages = []
-        for subtitle_file_path in all_subtitle_files:
-            filename = os.path.basename(subtitle_file_path)
-            if '.' in filename:
-                lang_part = filename.split('.')[-2]
-                if len(lang_part) <= 5:  # Language codes are typically 2-5 chars
-                    available_languages.append(lang_part)
-        
-        # Calculate quality metrics with video context for enhanced validation
-        video_context = {}
-        if metadata:
-            video_context = {'duration': metadata.get('duration', 0)}
-        else:
-            try:
-                # Try to get video duration for validation
-                metadata_result = extract_enhanced_metadata(video_url)
-                if metadata_result['success']:
-                    video_context = {'duration': metadata_result['metadata'].get('duration', 0)}
-            except:
-                pass  # Use default context if metadata extraction fails
-            
-        quality_metrics = calculate_quality_score(transcript_lines, video_context)
-        quality_metrics["deduplication_effectiveness"] = round(dedup_effectiveness, 1)
-        quality_metrics["format_used"] = actual_format
+            cues = deduplicate_vtt_cues(cues, aggressive=settings.aggressive_dedup, rolling=settings.rolling_dedup)
         
-        return {
+        available_languages = bundle['available_languages']
+        
+        # Quality metrics are stored with the cached result and versioned
+        quality_metrics = score_transcript(cues, metadata, original_count, actual_format)
+        
+        # Later stages (aggressive dedup, plain text) are computed once and memoized
+        pipeline = TranscriptPipeline(cues)
+        
+        result = {
             'method': 'yt-dlp',
             'success': True,
             'video_id': video_id,
             'language': language,
             'format': actual_format,  # Report actual format used
-            'lines': transcript_lines,
-            'line_count': len(transcript_lines),
+            'cues': pipeline.raw,
+            'lines': pipeline.lines(),
+            'pipeline': pipeline,
+            'line_count': len(cues),
             'original_line_count': original_count,
             'quality_metrics': quality_metrics,
-            'available_languages': list(set(available_languages)) if available_languages else ['en (auto)']
+            'metadata': metadata,
+            'available_languages': available_languages or ['en (auto)']
         }
         
+        # Cache the result; the lines are stored once as the transcript text
+        transcript, details = split_lines_result(result)
+        add_to_cache(video_id, transcript, language, "best", dedup_mode, result=details, pipeline=pipeline)
+        return result
+        
     except subprocess.TimeoutExpired:
         return {
             'method': 'yt-dlp',
@@ -483,17 +357,44 @@ def extract_transcript_ytdlp(video_url: str, language: str = "en", metadata: Opt
             'lines': [],
             'available_languages': []
         }
-    finally:
-        # Clean up temporary directory
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass  # Ignore cleanup errors
-
-def extract_enhanced_metadata(video_url: str) -> Dict[str, Any]:
+
+def score_transcript(cues: List[Cue], metadata: Dict[str, Any], original_count: int, actual_format: str) -> Dict[str, Any]:
+    """Quality metrics of an extracted transcript, tagged with the scoring version."""
+    # Calculate deduplication effectiveness
+    dedup_effectiveness = ((original_count - len(cues)) / original_count * 100) if original_count > 0 else 0
+    
+    # Calculate quality metrics with video context for enhanced validation
+    video_context = {'duration': metadata.get('duration', 0)}
+    quality_metrics = calculate_quality_score(cues, video_context)
+    quality_metrics["deduplication_effectiveness"] = round(dedup_effectiveness, 1)
+    quality_metrics["format_used"] = actual_format
+    return stamp_quality_version(quality_metrics)
+
+def build_enhanced_metadata(info: Dict[str, Any], video_url: str) -> Dict[str, Any]:
+    """Extract the key metadata fields from a yt-dlp info dict."""
+    return {
+        'video_id': extract_video_id(video_url),
+        'title': info.get('title', 'Unknown Title'),
+        'description': info.get('description', ''),
+        'duration': info.get('duration', 0),
+        'view_count': info.get('view_count', 0),
+        'like_count': info.get('like_count', 0),
+        'channel': info.get('uploader', 'Unknown Channel'),
+        'channel_id': info.get('uploader_id', ''),
+        'upload_date': info.get('upload_date', ''),
+        'tags': info.get('tags', []),
+        'categories': info.get('categories', []),
+        'thumbnail': info.get('thumbnail', ''),
+        'webpage_url': info.get('webpage_url', video_url),
+        'language': info.get('language', 'en'),
+        'automatic_captions': list(info.get('automatic_captions', {}).keys()),
+        'subtitles': list(info.get('subtitles', {}).keys())
+    }
+
+async def extract_enhanced_metadata(video_url: str) -> Dict[str, Any]:
     """Extract comprehensive video metadata using yt-dlp."""
-    if not check_ytdlp_available():
+    engine = get_engine()
+    if not await engine.available():
         return {
             'success': False,
             'error': 'yt-dlp not available',
@@ -503,43 +404,17 @@ def extract_enhanced_metadata(video_url: str) -> Dict[str, Any]:
     try:
         video_id = extract_video_id(video_url)
         
-        cmd = [
-            'yt-dlp',
-            '--dump-json',
-            '--no-download',
-            video_url
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
+        # Transcript extractions cache the metadata they fetched alongside the subtitles
+        entry = _transcript_cache.find(video_id, lambda data: bool(data.get("result", {}).get("metadata")))
+        if entry is not None:
             return {
-                'success': False,
-                'error': f"Failed to extract metadata: {result.stderr}",
-                'metadata': {}
+                'success': True,
+                'video_id': video_id,
+                'metadata': entry["result"]["metadata"]
             }
         
-        metadata = json.loads(result.stdout)
-        
-        # Extract key information
-        enhanced_metadata = {
-            'video_id': video_id,
-            'title': metadata.get('title', 'Unknown Title'),
-            'description': metadata.get('description', ''),
-            'duration': metadata.get('duration', 0),
-            'view_count': metadata.get('view_count', 0),
-            'like_count': metadata.get('like_count', 0),
-            'channel': metadata.get('uploader', 'Unknown Channel'),
-            'channel_id': metadata.get('uploader_id', ''),
-            'upload_date': metadata.get('upload_date', ''),
-            'tags': metadata.get('tags', []),
-            'categories': metadata.get('categories', []),
-            'thumbnail': metadata.get('thumbnail', ''),
-            'webpage_url': metadata.get('webpage_url', video_url),
-            'language': metadata.get('language', 'en'),
-            'automatic_captions': list(metadata.get('automatic_captions', {}).keys()),
-            'subtitles': list(metadata.get('subtitles', {}).keys())
-        }
+        metadata = await engine.extract_info(video_url)
+        enhanced_metadata = build_enhanced_metadata(metadata, video_url)
         
         return {
             'success': True,
@@ -562,32 +437,39 @@ def extract_enhanced_metadata(video_url: str) -> Dict[str, Any]:
     except Exception as e:
         return {
             'success': False,
-            'error': str(e),
+            'error': f"Failed to extract metadata: {e}",
             'metadata': {}
         }
 
-def create_plain_text_transcript(lines: List[str], aggressive_dedup: bool = True) -> str:
-    """Create clean plain text transcript optimized for AI analysis."""
+def create_plain_text_transcript(lines: Union[TranscriptPipeline, List[Cue]], aggressive_dedup: bool = True) -> str:
+    """Create clean plain text transcript optimized for AI analysis.
+    
+    Accepts a transcript pipeline, cues or rendered lines; with a pipeline the
+    deduplication stage and the text itself are computed once and memoized.
+    """
     if not lines:
         return ""
     
-    # Apply aggressive deduplication if requested
-    if aggressive_dedup:
-        lines = deduplicate_transcript_lines(lines, aggressive=True)
+    pipeline = as_pipeline(lines)
     
-    # Extract text without timestamps
-    plain_text_lines = []
-    for line in lines:
-        if line.startswith('[') and ']' in line:
-            # Extract text after timestamp
-            text = line[line.find(']') + 1:].strip()
-            if text and text not in ['[Music]', '[Applause]', '[Laughter]']:
+    def build() -> str:
+        # Apply aggressive deduplication if requested
+        cues = pipeline.stage(AGGRESSIVE if aggressive_dedup else RAW)
+        
+        # Extract text without timestamps
+        plain_text_lines = []
+        for cue in cues:
+            text = cue.text
+            if cue.start_ms is None:
+                if text:
+                    plain_text_lines.append(text)
+            elif text and text not in ['[Music]', '[Applause]', '[Laughter]']:
                 plain_text_lines.append(text)
-        elif line.strip():
-            plain_text_lines.append(line.strip())
+        
+        # Join with appropriate spacing
+        return ' '.join(plain_text_lines)
     
-    # Join with appropriate spacing
-    return ' '.join(plain_text_lines)
+    return pipeline.derive(("plain_text", aggressive_dedup), build)
 
 # ============================================================================
 # MCP RESOURCE MANAGEMENT LAYER
@@ -602,15 +484,16 @@ def get_resource_path(video_id: str) -> Path:
     ensure_resource_directory()
     return settings.resource_dir / f"{video_id}.md"
 
-def create_resource_content(video_id: str, transcript_lines: List[str], metadata: Dict[str, Any], quality_metrics: Dict[str, Any]) -> str:
+def create_resource_content(video_id: str, transcript_lines: Union[TranscriptPipeline, List[Cue]], metadata: Dict[str, Any], quality_metrics: Dict[str, Any]) -> str:
     """Create comprehensive MCP resource content."""
     timestamp = datetime.now().isoformat()
+    pipeline = as_pipeline(transcript_lines)
     
     # Create plain text version
-    plain_text = create_plain_text_transcript(transcript_lines, aggressive_dedup=True)
+    plain_text = create_plain_text_transcript(pipeline, aggressive_dedup=True)
     
     # Format timestamped transcript
-    timestamped_transcript = '\n'.join(transcript_lines)
+    timestamped_transcript = '\n'.join(pipeline.lines())
     
     content = f"""# YouTube Video Transcript - {metadata.get('title', 'Unknown Title')}
 
@@ -655,11 +538,13 @@ def create_resource_content(video_id: str, transcript_lines: List[str], metadata
     return content
 
 def save_resource_file(video_id: str, content: str) -> bool:
-    """Save resource content to file."""
+    """Save resource content to file and record it in the resource catalog and search index."""
     try:
         resource_path = get_resource_path(video_id)
         with open(resource_path, 'w', encoding='utf-8') as f:
             f.write(content)
+        get_resource_catalog().update(resource_path, content)
+        get_library_index().update(resource_path, content)
         return True
     except Exception:
         return False
@@ -675,229 +560,27 @@ def load_resource_file(video_id: str) -> Optional[str]:
     except Exception:
         return None
 
-def list_available_resources() -> List[Dict[str, Any]]:
-    """List all available transcript resources."""
-    resources = []
-    
-    if not settings.resource_dir.exists():
-        return resources
-    
-    for resource_file in settings.resource_dir.glob("*.md"):
-        try:
-            video_id = resource_file.stem
-            content = resource_file.read_text(encoding='utf-8')
-            
-            # Extract basic info from content
-            lines = content.split('\n')
-            title = "Unknown Title"
-            channel = "Unknown Channel"
-            
-            for line in lines:
-                # Handle both formats: "- **Title**:" (manual) and "- **Title**" (MCP server)
-                if line.startswith('- **Title**:'):
-                    title = line.replace('- **Title**:', '').strip()
-                elif line.startswith('- **Title**'):
-                    title = line.replace('- **Title**', '').strip().lstrip(':').strip()
-                elif line.startswith('- **Channel**:'):
-                    channel = line.replace('- **Channel**:', '').strip()
-                elif line.startswith('- **Channel**'):
-                    channel = line.replace('- **Channel**', '').strip().lstrip(':').strip()
-            
-            resources.append({
-                'video_id': video_id,
-                'title': title,
-                'channel': channel,
-                'file_size': resource_file.stat().st_size,
-                'created': datetime.fromtimestamp(resource_file.stat().st_ctime).isoformat()
-            })
-            
-        except Exception:
-            continue
-    
-    return sorted(resources, key=lambda x: x['created'], reverse=True)
+_resource_catalog: Optional[ResourceCatalog] = None
 
-# ============================================================================
-# SUBTITLE FORMAT PARSERS
-# ============================================================================
+def get_resource_catalog() -> ResourceCatalog:
+    """Get the catalog index of the resource directory (rebuilt if RESOURCE_DIR changes)."""
+    global _resource_catalog
+    if _resource_catalog is None or _resource_catalog.directory != settings.resource_dir:
+        _resource_catalog = ResourceCatalog(settings.resource_dir)
+    return _resource_catalog
 
-def parse_srv1_content(srv1_file_path: str) -> List[str]:
-    """Parse SRV1 (XML) subtitle file and return timestamped transcript lines."""
-    import xml.etree.ElementTree as ET
-    
-    with open(srv1_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    transcript_lines = []
-    
-    try:
-        root = ET.fromstring(content)
-        for text_elem in root.findall('text'):
-            start_time = float(text_elem.get('start', 0))
-            text = text_elem.text
-            
-            if text and text.strip():
-                # Format timestamp
-                timestamp = format_timestamp(start_time)
-                
-                # Clean and format text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    except ET.ParseError as e:
-        print(f"Error parsing SRV1 XML content: {e}")
-    
-    return transcript_lines
-
-
-def parse_json3_content(json3_file_path: str) -> List[str]:
-    """Parse JSON3 subtitle file and return timestamped transcript lines."""
-    with open(json3_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    transcript_lines = []
-    
-    for event in data.get('events', []):
-        if 'segs' in event:
-            start_time = event.get('tStartMs', 0) / 1000
-            text_parts = []
-            
-            for seg in event['segs']:
-                if 'utf8' in seg and seg['utf8'] != '\n':
-                    text_parts.append(seg['utf8'])
-            
-            text = ''.join(text_parts).strip()
-            if text:
-                # Format timestamp
-                timestamp = format_timestamp(start_time)
-                
-                # Clean text
-                clean_text = re.sub(r'<[^>]+>', '', text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{timestamp} {clean_text}")
-    
-    return transcript_lines
+_library_index: Optional[LibraryIndex] = None
 
+def get_library_index() -> LibraryIndex:
+    """Get the full-text index of the resource directory (rebuilt if RESOURCE_DIR changes)."""
+    global _library_index
+    if _library_index is None or _library_index.directory != settings.resource_dir:
+        _library_index = LibraryIndex(settings.resource_dir)
+    return _library_index
 
-def download_subtitles_with_fallback(video_url: str, language: str = "en", temp_dir: Optional[str] = None) -> tuple[str, str]:
-    """Download subtitles with format fallback chain: srv1 → json3 → ttml → vtt."""
-    formats = ['srv1', 'json3', 'ttml', 'vtt']  # Order by quality
-    
-    for fmt in formats:
-        cmd = [
-            'yt-dlp',
-            '--write-auto-subs',
-            '--write-subs', 
-            '--sub-lang', language,
-            '--sub-format', fmt,
-            '--skip-download',
-            '--output', f'{temp_dir}/%(title)s.%(ext)s',
-            video_url
-        ]
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                # Check if files were actually created
-                subtitle_files = glob.glob(f'{temp_dir}/*.{language}.{fmt}') or glob.glob(f'{temp_dir}/*.en.{fmt}')
-                if subtitle_files:
-                    return subtitle_files[0], fmt
-        except subprocess.TimeoutExpired:
-            continue
-        except Exception:
-            continue
-    
-    raise Exception("No subtitle formats available")
-
-
-def parse_subtitle_file(file_path: str, format_type: str) -> List[str]:
-    """Parse subtitle file based on format type."""
-    if format_type == 'srv1':
-        return parse_srv1_content(file_path)
-    elif format_type == 'json3':
-        return parse_json3_content(file_path)
-    elif format_type == 'ttml':
-        # For now, fallback to VTT parsing logic for TTML
-        return parse_vtt_content_legacy(file_path)
-    elif format_type == 'vtt':
-        return parse_vtt_content_legacy(file_path)
-    else:
-        raise ValueError(f"Unsupported subtitle format: {format_type}")
-
-
-def parse_vtt_content_legacy(vtt_file_path: str) -> List[str]:
-    """Legacy VTT parser for fallback compatibility."""
-    with open(vtt_file_path, 'r', encoding='utf-8') as f:
-        vtt_content = f.read()
-    
-    lines = vtt_content.split('\n')
-    transcript_lines = []
-    
-    current_timestamp = None
-    current_text_lines = []
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Skip empty lines and VTT headers
-        if not line or line.startswith('WEBVTT') or line.startswith('Kind:') or line.startswith('Language:'):
-            if not line and current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-                current_timestamp = None
-                current_text_lines = []
-            continue
-        
-        # Check if line contains timestamp
-        if '-->' in line:
-            if current_timestamp and current_text_lines:
-                combined_text = ' '.join(current_text_lines)
-                clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-                # Decode HTML entities
-                clean_text = html.unescape(clean_text)
-                if clean_text:
-                    transcript_lines.append(f"{current_timestamp} {clean_text}")
-            
-            # Extract start time
-            time_parts = line.split(' --> ')[0]
-            try:
-                time_clean = time_parts.split('.')[0].split(':')
-                if len(time_clean) >= 3:
-                    hours = int(time_clean[0])
-                    minutes = int(time_clean[1]) + (hours * 60)
-                    seconds = int(time_clean[2])
-                    current_timestamp = f"[{minutes:02d}:{seconds:02d}]"
-                else:
-                    current_timestamp = "[00:00]"
-            except (ValueError, IndexError):
-                current_timestamp = "[00:00]"
-            
-            current_text_lines = []
-            continue
-        
-        # Accumulate text lines
-        if current_timestamp:
-            current_text_lines.append(line)
-    
-    # Process final cue
-    if current_timestamp and current_text_lines:
-        combined_text = ' '.join(current_text_lines)
-        clean_text = re.sub(r'<[^>]+>', '', combined_text).strip()
-        # Decode HTML entities
-        clean_text = html.unescape(clean_text)
-        if clean_text:
-            transcript_lines.append(f"{current_timestamp} {clean_text}")
-    
-    return transcript_lines
+def list_available_resources() -> List[Dict[str, Any]]:
+    """List all available transcript resources, newest first, from the catalog index."""
+    return get_resource_catalog().entries()
 
 # ============================================================================
 # MCP TOOLS - 16 ESSENTIAL TOOLS (Complete Implementations)
@@ -912,21 +595,15 @@ async def get_youtube_transcript(video_url: str, language: str = "en") -> str:
         language: Language code (e.g., 'en', 'es'). Defaults to 'en'
     """
     try:
-        # Get metadata for enhanced quality analysis
-        metadata_result = extract_enhanced_metadata(video_url)
-        metadata = metadata_result.get('metadata', {}) if metadata_result['success'] else {}
-        
         # Extract using yt-dlp (our primary method)
-        result = extract_transcript_ytdlp(video_url, language, metadata)
+        result = await extract_transcript_ytdlp(video_url, language)
         
         if not result['success']:
             add_analysis_to_history("get_youtube_transcript", video_url, f"Failed: {result['error']}")
             return f"❌ Failed to extract transcript: {result['error']}"
         
-        # Add to cache
         video_id = result['video_id']
         transcript_text = '\n'.join(result['lines'])
-        add_to_cache(video_id, transcript_text, language)
         
         # Add to analysis history
         add_analysis_to_history("get_youtube_transcript", video_url, f"Success: {result['line_count']} lines")
@@ -962,20 +639,14 @@ async def get_youtube_transcript_ytdlp(video_url: str, language: str = "en") ->
         language: Language code (e.g., 'en', 'es'). Defaults to 'en'
     """
     try:
-        # Get metadata for enhanced quality analysis
-        metadata_result = extract_enhanced_metadata(video_url)
-        metadata = metadata_result.get('metadata', {}) if metadata_result['success'] else {}
-        
-        result = extract_transcript_ytdlp(video_url, language, metadata)
+        result = await extract_transcript_ytdlp(video_url, language)
         
         if not result['success']:
             add_analysis_to_history("get_youtube_transcript_ytdlp", video_url, f"Failed: {result['error']}")
             return f"❌ yt-dlp extraction failed: {result['error']}"
         
-        # Add to cache
         video_id = result['video_id']
         transcript_text = '\n'.join(result['lines'])
-        add_to_cache(video_id, transcript_text, language)
         
         # Add to analysis history
         add_analysis_to_history("get_youtube_transcript_ytdlp", video_url, f"Success: {result['line_count']} lines")
@@ -1017,22 +688,21 @@ async def get_plain_text_transcript(video_url: str, aggressive_dedup: bool = Tru
         aggressive_dedup: Use aggressive deduplication for cleaner text
     """
     try:
-        # Get metadata for enhanced quality analysis
-        metadata_result = extract_enhanced_metadata(video_url)
-        metadata = metadata_result.get('metadata', {}) if metadata_result['success'] else {}
-        
-        result = extract_transcript_ytdlp(video_url, "en", metadata)
+        result = await extract_transcript_ytdlp(video_url, "en")
         
         if not result['success']:
             add_analysis_to_history("get_plain_text_transcript", video_url, f"Failed: {result['error']}")
             return f"❌ Failed to extract transcript: {result['error']}"
         
-        # Create plain text version
-        plain_text = create_plain_text_transcript(result['lines'], aggressive_dedup)
-        
-        # Add to cache
+        # Create plain text version (cached per dedup mode)
         video_id = result['video_id']
-        add_to_cache(video_id, plain_text, "en")
+        plain_mode = get_dedup_mode(aggressive_dedup)
+        cached = _transcript_cache.lookup(cache_key(video_id, "en", "plain_text", plain_mode))
+        if cached is not None:
+            plain_text = cached["transcript"]
+        else:
+            plain_text = create_plain_text_transcript(pipeline_for(result), aggressive_dedup)
+            add_to_cache(video_id, plain_text, "en", "plain_text", plain_mode)
         
         # Add to analysis history
         add_analysis_to_history("get_plain_text_transcript", video_url, f"Success: {len(plain_text)} chars")
@@ -1064,7 +734,7 @@ async def get_enhanced_video_metadata(video_url: str) -> str:
         video_url: YouTube video URL
     """
     try:
-        result = extract_enhanced_metadata(video_url)
+        result = await extract_enhanced_metadata(video_url)
         
         if not result['success']:
             add_analysis_to_history("get_enhanced_video_metadata", video_url, f"Failed: {result['error']}")
@@ -1122,18 +792,19 @@ async def get_transcript_quality_analysis(video_url: str) -> str:
         video_url: YouTube video URL
     """
     try:
-        # Get metadata for enhanced quality analysis
-        metadata_result = extract_enhanced_metadata(video_url)
-        metadata = metadata_result.get('metadata', {}) if metadata_result['success'] else {}
-        
-        result = extract_transcript_ytdlp(video_url, "en", metadata)
-        
-        if not result['success']:
-            add_analysis_to_history("get_transcript_quality_analysis", video_url, f"Failed: {result['error']}")
-            return f"❌ Failed to extract transcript for analysis: {result['error']}"
+        # Already-fetched videos are answered from the stored report
+        report = get_stored_quality_report(extract_video_id(video_url))
+        if report is None:
+            result = await extract_transcript_ytdlp(video_url, "en")
+            
+            if not result['success']:
+                add_analysis_to_history("get_transcript_quality_analysis", video_url, f"Failed: {result['error']}")
+                return f"❌ Failed to extract transcript for analysis: {result['error']}"
+            
+            report = build_quality_report(result)
         
-        quality = result['quality_metrics']
-        video_id = result['video_id']
+        quality = report['quality_metrics']
+        video_id = report['video_id']
         
         # Add to analysis history
         add_analysis_to_history("get_transcript_quality_analysis", video_url, f"Score: {quality['quality_score']}%")
@@ -1161,8 +832,8 @@ async def get_transcript_quality_analysis(video_url: str) -> str:
 
 ### Content Analysis
 - **Total Lines:** {quality['line_count']}
-- **Original Lines:** {result.get('original_line_count', quality['line_count'])}
-- **Duplicates Removed:** {result.get('original_line_count', quality['line_count']) - quality['line_count']}
+- **Original Lines:** {report['original_line_count']}
+- **Duplicates Removed:** {report['original_line_count'] - quality['line_count']}
 - **Deduplication Effectiveness:** {quality['deduplication_effectiveness']}%
 
 ### Text Quality
@@ -1209,15 +880,34 @@ async def get_transcript_quality_analysis(video_url: str) -> str:
 # ============================================================================
 
 @mcp.tool()
-async def list_transcript_resources() -> str:
-    """List all available transcript resources in the system.
+async def list_transcript_resources(cursor: str = "", limit: int = 20, sort_by: str = "created",
+                                    descending: bool = True, channel: str = "", created_after: str = "",
+                                    created_before: str = "", min_quality: Optional[float] = None,
+                                    max_quality: Optional[float] = None) -> str:
+    """List available transcript resources in the system, one page at a time.
     
     This tool provides access to stored transcript files that can be loaded without tokens.
+    
+    Args:
+        cursor: Cursor from the previous page (empty for the first page)
+        limit: Resources per page (max 100)
+        sort_by: Sort key - "created", "size" or "channel"
+        descending: Sort direction (newest/largest/Z first by default)
+        channel: Only resources whose channel contains this text
+        created_after: Only resources created on or after this ISO date
+        created_before: Only resources created on or before this ISO date
+        min_quality: Lowest quality score (0-100)
+        max_quality: Highest quality score (0-100)
     """
     try:
-        resources = list_available_resources()
+        page = get_resource_catalog().query(
+            sort_by=sort_by, descending=descending, cursor=cursor or None, limit=limit,
+            channel=channel or None, created_after=created_after or None, created_before=created_before or None,
+            min_quality=min_quality, max_quality=max_quality
+        )
+        resources = page['resources']
         
-        if not resources:
+        if not resources and not cursor and not len(get_resource_catalog()):
             return """# 📁 Transcript Resources
 
 No transcript resources found. Create new resources using:
@@ -1228,20 +918,35 @@ Resources are stored in: `resources/transcripts/`"""
         
         output = f"""# 📁 Available Transcript Resources
 
-**Total Resources:** {len(resources)}
+**Total Resources:** {page['total']}
+**Showing:** {len(resources)} (sorted by {sort_by}, {'descending' if descending else 'ascending'})
 
 ## Available Transcripts
 
 """
         
         for i, resource in enumerate(resources, 1):
+            quality_score = resource.get('quality_score')
             output += f"""### {i}. {resource['title'][:60]}{'...' if len(resource['title']) > 60 else ''}
 - **Video ID:** `{resource['video_id']}`
 - **Channel:** {resource['channel']}
 - **File Size:** {resource['file_size']:,} bytes
 - **Created:** {resource['created'][:19].replace('T', ' ')}
+- **Quality Score:** {f"{quality_score:g}%" if quality_score is not None else 'N/A'}
 - **Access:** Use `load_transcript_resource("{resource['video_id']}")` or resource `transcripts://content/{resource['video_id']}`
 
+"""
+        
+        if not resources:
+            output += "No resources match these filters.\n\n"
+        
+        if page['next_cursor']:
+            output += f"""## Next Page
+```
+list_transcript_resources(cursor="{page['next_cursor']}")
+```
+Pass the same sort and filter arguments, or read resource `transcripts://available/page/{page['next_cursor']}`.
+
 """
         
         output += f"""## Usage Instructions
@@ -1266,6 +971,8 @@ create_mcp_resource_from_transcript_v2("https://youtube.com/watch?v=VIDEO_ID")
         
         return output
         
+    except ValueError as e:
+        return f"❌ Invalid listing request: {str(e)}"
     except Exception as e:
         return f"❌ Error listing transcript resources: {str(e)}"
 
@@ -1280,8 +987,7 @@ async def load_transcript_resource(video_id: str) -> str:
         content = load_resource_file(video_id)
         
         if content is None:
-            available_resources = list_available_resources()
-            available_ids = [r['video_id'] for r in available_resources]
+            available_ids = get_resource_catalog().ids()
             
             return f"""❌ Transcript resource not found for video ID: `{video_id}`
 
@@ -1296,6 +1002,45 @@ Use `list_transcript_resources()` to see all available resources."""
     except Exception as e:
         return f"❌ Error loading transcript resource: {str(e)}"
 
+@mcp.tool()
+async def search_library(query: str, limit: int = 20) -> str:
+    """Search every saved transcript resource for a word or phrase.
+    
+    Uses the persistent full-text index of the resource directory, so no
+    resource file is loaded. Hits are ranked by relevance.
+    
+    Args:
+        query: Words to find (all must match; words match as prefixes) - quote exact phrases
+        limit: Maximum number of hits (max 100)
+    """
+    try:
+        hits = get_library_index().search(query, limit)
+        
+        if not hits:
+            return f"""# 🔎 Library Search: "{query}"
+
+No saved transcript lines match this query.
+
+Use `list_transcript_resources()` to see what is in the library."""
+        
+        output = f"""# 🔎 Library Search: "{query}"
+
+**Hits:** {len(hits)} (best first)
+
+"""
+        for i, hit in enumerate(hits, 1):
+            output += f"""### {i}. {hit['title'][:60]}{'...' if len(hit['title']) > 60 else ''} {hit['timestamp']}
+- **Video ID:** `{hit['video_id']}`
+- **Match:** {hit['snippet']}
+- **Jump To:** https://youtube.com/watch?v={hit['video_id']}&t={(hit['start_ms'] or 0) // 1000}s
+- **Resource:** `transcripts://content/{hit['resource']}`
+
+"""
+        return output
+        
+    except Exception as e:
+        return f"❌ Error searching transcript library: {str(e)}"
+
 @mcp.tool()
 async def create_mcp_resource_from_transcript_v2(video_url: str, resource_name: str = "") -> str:
     """Create a persistent MCP resource from a YouTube video transcript.
@@ -1308,23 +1053,18 @@ async def create_mcp_resource_from_transcript_v2(video_url: str, resource_name:
         resource_name: Optional custom name for the resource (auto-generated if empty)
     """
     try:
-        # Extract video metadata for resource creation
-        metadata_result = extract_enhanced_metadata(video_url)
-        if not metadata_result['success']:
-            return f"❌ Failed to extract video metadata: {metadata_result['error']}"
-        
-        metadata = metadata_result['metadata']
-        video_id = metadata['video_id']
-        
-        # Extract transcript
-        transcript_result = extract_transcript_ytdlp(video_url, "en", metadata)
+        # Extract transcript and video metadata in a single pass
+        transcript_result = await extract_transcript_ytdlp(video_url, "en")
         if not transcript_result['success']:
             return f"❌ Failed to extract transcript: {transcript_result['error']}"
         
+        metadata = transcript_result['metadata']
+        video_id = metadata['video_id']
+        
         # Create resource content
         resource_content = create_resource_content(
             video_id, 
-            transcript_result['lines'], 
+            pipeline_for(transcript_result), 
             metadata, 
             transcript_result['quality_metrics']
         )
@@ -1334,9 +1074,9 @@ async def create_mcp_resource_from_transcript_v2(video_url: str, resource_name:
         if not success:
             return f"❌ Failed to save resource file for video {video_id}"
         
-        # Add to cache
-        transcript_text = '\n'.join(transcript_result['lines'])
-        add_to_cache(video_id, transcript_text, "en")
+        # Store the quality report next to it so quality lookups don't need the transcript
+        save_quality_sidecar(quality_sidecar_path(settings.resource_dir, video_id, QUALITY_REPORT_SCHEMA),
+                             build_quality_report(transcript_result), QUALITY_REPORT_SCHEMA)
         
         # Add to analysis history
         add_analysis_to_history("create_mcp_resource_from_transcript_v2", video_url, f"Created: {video_id}")
@@ -1382,26 +1122,46 @@ The resource is now available for zero-token access via MCP resources!"""
 # MCP RESOURCES - 6 SMART RESOURCES (Zero-Token Data Access)
 # ============================================================================
 
+def available_resources_page(cursor: Optional[str] = None) -> dict:
+    """One page of the resource listing served by the ``transcripts://available`` resources."""
+    page = get_resource_catalog().query(cursor=cursor)
+    next_cursor = page['next_cursor']
+    return {
+        "description": "Available transcript resources for zero-token access",
+        "mimeType": "application/json",
+        "text": json.dumps({
+            "total_resources": page['total'],
+            "page_size": page['limit'],
+            "resources": page['resources'],
+            "next_cursor": next_cursor,
+            "next_page": f"transcripts://available/page/{next_cursor}" if next_cursor else None,
+            "last_updated": datetime.now().isoformat(),
+            "usage_instructions": {
+                "load_resource": "Use load_transcript_resource(video_id) tool",
+                "direct_access": "Use transcripts://content/{video_id} resource",
+                "next_page": "Read next_page, or call list_transcript_resources(cursor=...) to sort and filter",
+                "create_new": "Use create_mcp_resource_from_transcript_v2() tool"
+            }
+        }, indent=2)
+    }
+
 @mcp.resource("transcripts://available")
 async def get_available_transcripts_resource() -> dict:
-    """List all available transcript resources (CRITICAL for zero-token browsing)."""
+    """First page of available transcript resources (CRITICAL for zero-token browsing)."""
     try:
-        resources = list_available_resources()
-        
+        return available_resources_page()
+    except Exception as e:
         return {
-            "description": "Available transcript resources for zero-token access",
-            "mimeType": "application/json",
-            "text": json.dumps({
-                "total_resources": len(resources),
-                "resources": resources,
-                "last_updated": datetime.now().isoformat(),
-                "usage_instructions": {
-                    "load_resource": "Use load_transcript_resource(video_id) tool",
-                    "direct_access": "Use transcripts://content/{video_id} resource",
-                    "create_new": "Use create_mcp_resource_from_transcript_v2() tool"
-                }
-            }, indent=2)
+            "description": "Error loading available transcripts",
+            "mimeType": "text/plain", 
+            "text": f"Error: {str(e)}"
         }
+
+@mcp.resource("transcripts://available/page/{cursor}")
+async def get_available_transcripts_page_resource(cursor: str) -> dict:
+    """Later pages of available transcript resources, addressed by ``next_cursor``."""
+    try:
+        return available_resources_page(cursor)
     except Exception as e:
         return {
             "description": "Error loading available transcripts",
@@ -1435,6 +1195,27 @@ async def get_transcript_content_resource(video_id: str) -> dict:
             "text": f"Error loading resource: {str(e)}"
         }
 
+@mcp.resource("transcripts://search/{query}")
+async def get_library_search_resource(query: str) -> dict:
+    """Ranked hits for a query across all saved transcript resources."""
+    try:
+        hits = get_library_index().search(query)
+        return {
+            "description": f"Library search results for: {query}",
+            "mimeType": "application/json",
+            "text": json.dumps({
+                "query": query,
+                "total_hits": len(hits),
+                "hits": hits
+            }, indent=2)
+        }
+    except Exception as e:
+        return {
+            "description": f"Error searching library for {query}",
+            "mimeType": "text/plain",
+            "text": f"Error: {str(e)}"
+        }
+
 @mcp.resource("transcripts://cached")
 async def get_cached_transcripts_resource() -> dict:
     """Get information about in-memory cached transcripts."""
@@ -1447,13 +1228,16 @@ async def get_cached_transcripts_resource() -> dict:
                 "video_cache_entries": len(_video_cache),
                 "analysis_history_entries": len(_analysis_history)
             },
+            "cache_stats": _transcript_cache.stats(),
             "last_updated": datetime.now().isoformat()
         }
         
-        for video_id, data in _transcript_cache.items():
+        for (video_id, language, fmt, dedup_mode), data in _transcript_cache.items():
             cached_data["cached_videos"].append({
                 "video_id": video_id,
-                "language": data.get("language", "unknown"),
+                "language": data.get("language", language),
+                "format": fmt,
+                "dedup_mode": dedup_mode,
                 "cached_at": data.get("cached_at", ""),
                 "transcript_length": data.get("length", 0)
             })
@@ -1549,15 +1333,20 @@ async def get_system_status_resource() -> dict:
         status_data = {
             "server_info": settings.server_info,
             "system_health": {
-                "ytdlp_available": check_ytdlp_available(),
+                "ytdlp_available": await get_engine().available(),
+                "extraction_engine": get_engine().name,
                 "resource_directory_exists": settings.resource_dir.exists(),
                 "resource_directory_writable": os.access(settings.resource_dir, os.W_OK) if settings.resource_dir.exists() else False
             },
             "statistics": {
                 "cached_transcripts": len(_transcript_cache),
+                "transcript_cache": _transcript_cache.stats(),
+                "extractions": extraction_flights.stats(),
                 "cached_videos": len(_video_cache),
                 "analysis_history": len(_analysis_history),
-                "available_resources": len(list_available_resources())
+                "available_resources": len(get_resource_catalog()),
+                "resource_catalog": get_resource_catalog().stats(),
+                "library_index": get_library_index().stats()
             },
             "status_timestamp": datetime.now().isoformat()
         }
@@ -1861,7 +1650,9 @@ def main():
     print(f"🚀 Starting {settings.server_name} v{settings.version}")
     print(f"📁 Resource directory: {settings.resource_dir}")
     print(f"🔧 yt-dlp available: {'✅' if check_ytdlp_available() else '❌'}")
+    print(f"⚙️  Extraction engine: {get_engine().name}")
     print(f"💾 Cache size: {settings.cache_size}")
+    print(f"💽 Disk cache: {'✅ ' + str(_transcript_cache.disk.path) if _transcript_cache.disk else '❌'}")
     print(f"🎯 Aggressive deduplication: {'✅' if settings.aggressive_dedup else '❌'}")
     
     # Ensure resource directory exists
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test the non-blocking yt-dlp execution layer
+"""
+
+import asyncio
+import subprocess
+import sys
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server import ytdlp_runner
+
+
+def _fake_ytdlp(script: str):
+    """Replace the yt-dlp binary with a small Python script."""
+    real_exec = asyncio.create_subprocess_exec
+
+    async def fake_exec(*cmd, **kwargs):
+        return await real_exec(sys.executable, '-c', script, *cmd[1:], **kwargs)
+
+    return patch('asyncio.create_subprocess_exec', fake_exec)
+
+
+class TestYtdlpRunner:
+    """Test the asyncio based yt-dlp runner."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_completed_process(self):
+        """Test that output is decoded like subprocess.run."""
+        with _fake_ytdlp("import sys; print('ok', *sys.argv[1:])"):
+            result = await ytdlp_runner.run_ytdlp(['--version'], timeout=10)
+
+        assert isinstance(result, subprocess.CompletedProcess)
+        assert result.returncode == 0
+        assert result.stdout.strip() == "ok --version"
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_timeout_expired(self):
+        """Test that slow processes are killed with the legacy exception type."""
+        with _fake_ytdlp("import time; time.sleep(30)"):
+            with pytest.raises(subprocess.TimeoutExpired):
+                await ytdlp_runner.run_ytdlp(['--dump-json'], timeout=0.5)
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Test that concurrent extractions overlap instead of serializing."""
+        with _fake_ytdlp("import time; time.sleep(0.5)"):
+            started = time.perf_counter()
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while time.perf_counter() - started < 0.4:
+                    ticks += 1
+                    await asyncio.sleep(0.05)
+
+            await asyncio.gather(
+                ytdlp_runner.run_ytdlp(['a'], timeout=10),
+                ytdlp_runner.run_ytdlp(['b'], timeout=10),
+                ticker()
+            )
+            elapsed = time.perf_counter() - started
+
+        assert ticks >= 4
+        assert elapsed < 0.95
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test concurrent batch extraction
+"""
+
+import sys
+import os
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.batch import iter_batch, parse_batch_urls
+
+
+class TestIterBatch:
+    """Test the bounded-concurrency batch runner."""
+
+    @pytest.mark.asyncio
+    async def test_results_arrive_in_completion_order(self):
+        """Test that fast items are yielded before slow ones."""
+        delays = {'slow': 0.05, 'fast': 0.0, 'medium': 0.02}
+
+        async def worker(item):
+            await asyncio.sleep(delays[item])
+            return item.upper()
+
+        outcomes = [outcome async for outcome in iter_batch(list(delays), worker, max_workers=3, timeout=5)]
+
+        assert [outcome['item'] for outcome in outcomes] == ['fast', 'medium', 'slow']
+        assert [outcome['index'] for outcome in outcomes] == [1, 2, 0]
+        assert outcomes[0]['result'] == 'FAST'
+
+    @pytest.mark.asyncio
+    async def test_worker_limit(self):
+        """Test that no more than max_workers items run at once."""
+        running, peak = 0, 0
+
+        async def worker(item):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        outcomes = [outcome async for outcome in iter_batch(range(8), worker, max_workers=2, timeout=5)]
+
+        assert len(outcomes) == 8
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_takes_time_of_slowest_item(self):
+        """Test that items overlap instead of running back to back."""
+        async def worker(item):
+            await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        outcomes = [outcome async for outcome in iter_batch(range(10), worker, max_workers=10, timeout=5)]
+
+        assert all(outcome['success'] for outcome in outcomes)
+        assert time.perf_counter() - started < 0.3
+
+    @pytest.mark.asyncio
+    async def test_per_item_timeout_and_errors(self):
+        """Test that a stuck or failing item doesn't sink the batch."""
+        async def worker(item):
+            if item == 'stuck':
+                await asyncio.sleep(10)
+            if item == 'broken':
+                raise ValueError("Could not extract video ID")
+            return item
+
+        outcomes = {o['item']: o async for o in iter_batch(['ok', 'stuck', 'broken'], worker, max_workers=3, timeout=0.05)}
+
+        assert outcomes['ok']['success'] is True
+        assert outcomes['stuck']['error'] == "Timed out after 0.05s"
+        assert outcomes['broken']['error'] == "Could not extract video ID"
+
+
+class TestBatchTool:
+    """Test the batch MCP tool."""
+
+    def test_parse_batch_urls(self):
+        """Test splitting, trimming and de-duplicating the URL list."""
+        assert parse_batch_urls(" a, b ,,a ") == ['a', 'b']
+
+    @pytest.mark.asyncio
+    async def test_batch_runs_videos_concurrently(self):
+        """Test that the tool overlaps extractions and reports every video."""
+        import enhanced_server
+
+        async def fake_transcript(video_url, language="en"):
+            await asyncio.sleep(0.05)
+            return f"Transcript for {video_url}:\n\n[00:01] Hello"
+
+        urls = ",".join(f"https://www.youtube.com/watch?v=abcdefghij{i}" for i in range(6))
+        with patch.object(enhanced_server, 'get_youtube_transcript', fake_transcript), \
+             patch.object(enhanced_server.settings, 'batch_max_workers', 6):
+            started = time.perf_counter()
+            summary = await enhanced_server.batch_extract_transcripts(urls, output_format="markdown")
+
+        assert time.perf_counter() - started < 0.25
+        assert "6/6 successful" in summary
+        assert summary.count("Extracted successfully") == 6
+
+    @pytest.mark.asyncio
+    async def test_url_limit_is_configurable(self):
+        """Test the BATCH_MAX_URLS cap."""
+        import enhanced_server
+
+        with patch.object(enhanced_server.settings, 'batch_max_urls', 2):
+            summary = await enhanced_server.batch_extract_transcripts("a,b,c")
+
+        assert summary == "❌ Maximum of 2 videos allowed per batch"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
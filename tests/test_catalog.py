@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test the resource catalog index
+"""
+
+import sys
+import os
+import json
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.catalog import ResourceCatalog, encode_cursor, parse_resource_header
+
+
+def resource_text(title, channel="Channel", score=87):
+    return f"""# YouTube Video Transcript - {title}
+
+## Video Information
+- **Title**: {title}
+- **Channel**: {channel}
+
+## Quality Metrics
+- **Quality Score**: {score}%
+
+## Plain Text Transcript (AI-Optimized)
+```
+- **Title**: not a header field
+```
+"""
+
+
+class TestHeaderParsing:
+    """Test parsing of resource headers."""
+
+    def test_both_title_formats(self):
+        """Test manual and server-generated header formats."""
+        assert parse_resource_header(resource_text("Talk"))['title'] == "Talk"
+        parsed = parse_resource_header("- **Title** Other\n- **Channel** Someone\n")
+        assert parsed == {'title': "Other", 'channel': "Someone", 'quality_score': None}
+
+    def test_quality_score(self):
+        """Test that the quality score is indexed for filtering."""
+        assert parse_resource_header(resource_text("Talk", score=42.5))['quality_score'] == 42.5
+
+
+class TestResourceCatalog:
+    """Test incremental maintenance of the catalog."""
+
+    def test_update_uses_written_content(self, tmp_path):
+        """Test that saved resources are indexed without re-reading them."""
+        catalog = ResourceCatalog(tmp_path)
+        path = tmp_path / "abc123.md"
+        path.write_text(resource_text("Talk"), encoding='utf-8')
+        catalog.update(path, resource_text("Talk"))
+
+        entry = catalog.get("abc123")
+        assert entry['title'] == "Talk"
+        assert entry['channel'] == "Channel"
+        assert entry['file_size'] == path.stat().st_size
+        assert (tmp_path / "catalog.json").exists()
+
+    def test_refresh_is_incremental(self, tmp_path):
+        """Test that only new or changed files are parsed."""
+        for video_id in ("a", "b", "c"):
+            (tmp_path / f"{video_id}.md").write_text(resource_text(video_id), encoding='utf-8')
+        catalog = ResourceCatalog(tmp_path)
+        assert len(catalog) == 3
+        assert catalog.parsed == 3
+
+        # Unchanged directory: no rescan at all
+        scans = catalog.scans
+        catalog.entries()
+        assert catalog.scans == scans
+
+        (tmp_path / "d.md").write_text(resource_text("d"), encoding='utf-8')
+        (tmp_path / "a.md").unlink()
+        assert sorted(catalog.ids()) == ["b", "c", "d"]
+        assert catalog.parsed == 4
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        """Test that a rewritten file is picked up by its size and mtime."""
+        path = tmp_path / "abc123.md"
+        path.write_text(resource_text("Old"), encoding='utf-8')
+        catalog = ResourceCatalog(tmp_path)
+        assert catalog.get("abc123")['title'] == "Old"
+
+        path.write_text(resource_text("A much longer new title"), encoding='utf-8')
+        (tmp_path / "touch.md").write_text("", encoding='utf-8')
+        assert catalog.get("abc123")['title'] == "A much longer new title"
+
+    def test_in_place_overwrite_is_reparsed(self, tmp_path):
+        """Test that a file rewritten in place (directory mtime unchanged) is picked up."""
+        path = tmp_path / "abc123.md"
+        path.write_text(resource_text("Old"), encoding='utf-8')
+        catalog = ResourceCatalog(tmp_path)
+        assert catalog.get("abc123")['title'] == "Old"
+
+        directory_mtime = tmp_path.stat().st_mtime_ns
+        path.write_text(resource_text("New"), encoding='utf-8')
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10 ** 9))
+        assert tmp_path.stat().st_mtime_ns == directory_mtime
+
+        scans = catalog.scans
+        assert catalog.get("abc123")['title'] == "New"
+        assert catalog.scans == scans
+        assert catalog.parsed == 2
+
+    def test_manifest_survives_restart(self, tmp_path):
+        """Test that a new catalog loads the manifest instead of parsing every file."""
+        for video_id in ("a", "b"):
+            (tmp_path / f"{video_id}.md").write_text(resource_text(video_id), encoding='utf-8')
+        assert len(ResourceCatalog(tmp_path)) == 2
+
+        restarted = ResourceCatalog(tmp_path)
+        assert sorted(restarted.ids()) == ["a", "b"]
+        assert restarted.parsed == 0
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing resource directory is an empty catalog."""
+        catalog = ResourceCatalog(tmp_path / "missing")
+        assert catalog.entries() == []
+        assert not (tmp_path / "missing").exists()
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Catalog of 25 resources with known sizes, channels, dates and scores."""
+    catalog = ResourceCatalog(tmp_path)
+    catalog.refresh()
+    for index in range(25):
+        video_id = f"video{index:02d}"
+        content = resource_text(f"Talk {index}", channel=f"Channel {index % 3}", score=index * 4) + "x" * index
+        path = tmp_path / f"{video_id}.md"
+        path.write_text(content, encoding='utf-8')
+        catalog.update(path, content)
+        catalog._entries[video_id]['created'] = f"2025-01-{index + 1:02d}T12:00:00"
+    catalog._views.clear()
+    return catalog
+
+
+class TestCatalogQuery:
+    """Test paginated, sorted and filtered listings."""
+
+    def test_pages_cover_everything_once(self, library):
+        """Test that following cursors lists each resource exactly once, in order."""
+        seen = []
+        cursor = None
+        while True:
+            page = library.query(limit=10, cursor=cursor)
+            assert len(page['resources']) <= 10
+            assert page['total'] == 25
+            seen.extend(entry['video_id'] for entry in page['resources'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert seen == [f"video{index:02d}" for index in reversed(range(25))]
+
+    def test_cursor_is_stable_when_resources_are_added(self, library, tmp_path):
+        """Test that new resources don't shift later pages (keyset pagination)."""
+        first = library.query(sort_by="size", descending=False, limit=5)
+        path = tmp_path / "tiny.md"
+        path.write_text("- **Title**: Tiny", encoding='utf-8')
+        library.update(path)
+
+        second = library.query(sort_by="size", descending=False, limit=5, cursor=first['next_cursor'])
+        sizes = [entry['file_size'] for entry in first['resources'] + second['resources']]
+        assert sizes == sorted(sizes)
+        assert "tiny" not in [entry['video_id'] for entry in second['resources']]
+
+    def test_filters(self, library):
+        """Test channel, date range and quality filters."""
+        page = library.query(channel="channel 1", created_after="2025-01-05", created_before="2025-01-14",
+                             min_quality=20, limit=100)
+        ids = [entry['video_id'] for entry in page['resources']]
+        assert ids == ["video13", "video10", "video07"]
+        assert page['total'] == 3
+        assert page['next_cursor'] is None
+
+    def test_sort_by_channel(self, library):
+        """Test that channel sorting groups resources by channel."""
+        page = library.query(sort_by="channel", descending=False, limit=100)
+        channels = [entry['channel'] for entry in page['resources']]
+        assert channels == sorted(channels)
+
+    def test_invalid_requests(self, library):
+        """Test unknown sort keys and mismatched or malformed cursors."""
+        with pytest.raises(ValueError, match="Unknown sort key"):
+            library.query(sort_by="views")
+        with pytest.raises(ValueError, match="does not match"):
+            library.query(sort_by="size", cursor=encode_cursor("created", True, ("2025", "x")))
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            library.query(cursor="not-a-cursor")
+
+    def test_page_size_is_capped(self, library):
+        """Test that a page never exceeds MAX_PAGE_SIZE."""
+        assert library.query(limit=10 ** 6)['limit'] == 100
+
+
+class TestStreamlinedCatalog:
+    """Test the streamlined server's use of the catalog."""
+
+    def test_saved_resources_are_listed(self, tmp_path, monkeypatch):
+        """Test that save_resource_file keeps the listing current."""
+        import streamlined_server
+
+        monkeypatch.setattr(streamlined_server.settings, 'resource_dir', tmp_path)
+        assert streamlined_server.save_resource_file("abc123", resource_text("Talk"))
+        assert streamlined_server.save_resource_file("def456", resource_text("Other", channel="Them"))
+
+        listed = {entry['video_id']: entry for entry in streamlined_server.list_available_resources()}
+        assert listed["def456"]['channel'] == "Them"
+        assert listed["abc123"]['title'] == "Talk"
+        assert streamlined_server.get_resource_catalog().parsed == 2
+
+    def test_paginated_resources(self, tmp_path, monkeypatch):
+        """Test that the listing resource links to the next page."""
+        import streamlined_server
+
+        monkeypatch.setattr(streamlined_server.settings, 'resource_dir', tmp_path)
+        for index in range(25):
+            streamlined_server.save_resource_file(f"video{index:02d}", resource_text(f"Talk {index}"))
+
+        first = json.loads(asyncio.run(streamlined_server.get_available_transcripts_resource())['text'])
+        assert first['total_resources'] == 25
+        assert len(first['resources']) == 20
+        second = json.loads(asyncio.run(
+            streamlined_server.get_available_transcripts_page_resource(first['next_cursor']))['text'])
+        assert len(second['resources']) == 5
+        assert second['next_page'] is None
+
+        listing = asyncio.run(streamlined_server.list_transcript_resources(limit=10, sort_by="size"))
+        assert "**Showing:** 10" in listing
+        assert "## Next Page" in listing
+        assert asyncio.run(streamlined_server.list_transcript_resources(sort_by="views")).startswith("❌")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
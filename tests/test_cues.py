@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the structured cue model shared by the parsers and processing stages
+"""
+
+import sys
+import os
+import json
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.cues import Cue, as_cues, cues_from_lines, pack_timings, render_lines
+from src.youtube_transcript_server.parsers import parse_subtitle_cues
+from src.youtube_transcript_server.dedup import deduplicate_cues, deduplicate_transcript_lines
+from src.youtube_transcript_server.cache import split_lines_result, rebuild_lines_result
+
+
+class TestCue:
+    """Test the cue object itself."""
+
+    def test_slots_and_render(self):
+        """Test that cues are compact and render as transcript lines."""
+        cue = Cue(3725200, 3726200, "Hello")
+        assert not hasattr(cue, '__dict__')
+        assert cue.start == 3725.2
+        assert cue.render() == "[01:02:05] Hello"
+        assert Cue(None, None, "untimed").render() == "untimed"
+
+    def test_end_defaults_to_start(self):
+        """Test that a cue without an end time ends where it starts."""
+        assert Cue(1500, None, "x").end_ms == 1500
+
+    def test_as_cues_accepts_rendered_lines(self):
+        """Test that rendered lines round-trip through as_cues."""
+        lines = ["[00:05] first", "[01:02:03] second", "plain"]
+        cues = as_cues(lines)
+        assert [cue.start_ms for cue in cues] == [5000, 3723000, None]
+        assert render_lines(cues) == lines
+
+
+class TestParsedTimings:
+    """Test that parsers keep precise start and end times."""
+
+    def test_srv1_end_from_duration(self):
+        """Test SRV1 end times come from the duration attribute."""
+        content = '<transcript><text start="1.25" dur="2.5">Hi</text></transcript>'
+        assert parse_subtitle_cues(content, 'srv1') == [Cue(1250, 3750, "Hi")]
+
+    def test_json3_end_from_duration(self):
+        """Test JSON3 end times come from dDurationMs."""
+        content = json.dumps({'events': [{'tStartMs': 1200, 'dDurationMs': 800, 'segs': [{'utf8': 'Hi'}]}]})
+        assert parse_subtitle_cues(content, 'json3') == [Cue(1200, 2000, "Hi")]
+
+    def test_vtt_end_from_cue_timing(self):
+        """Test VTT end times come from the cue timing line."""
+        content = "WEBVTT\n\n00:00:01.250 --> 00:00:03.500 align:start\nHi\n"
+        assert parse_subtitle_cues(content, 'vtt') == [Cue(1250, 3500, "Hi")]
+
+
+class TestCachedCues:
+    """Test that cached results keep sub-second timings."""
+
+    def test_split_and_rebuild(self):
+        """Test that cues survive a JSON round-trip through the cache format."""
+        cues = [Cue(1250, 3750, "first"), Cue(4000, 4500, "second")]
+        text, details = split_lines_result({'format': 'srv1', 'cues': cues, 'lines': render_lines(cues)})
+
+        assert text == "[00:01] first\n[00:04] second"
+        assert details == {'format': 'srv1', 'cue_timings': [[1250, 3750], [4000, 4500]]}
+
+        rebuilt = rebuild_lines_result(json.loads(json.dumps({'transcript': text, 'result': details})))
+        assert rebuilt['cues'] == cues
+        assert rebuilt['lines'] == render_lines(cues)
+        assert 'cue_timings' not in rebuilt
+
+    def test_mismatched_timings_are_ignored(self):
+        """Test that stale timings fall back to the rendered timestamps."""
+        cues = cues_from_lines(["[00:01] a", "[00:02] b"], timings=[[1250, 1500]])
+        assert pack_timings(cues) == [[1000, 1000], [2000, 2000]]
+
+
+class TestCueDeduplication:
+    """Test deduplication on cues."""
+
+    def test_same_kind_returned(self):
+        """Test that dedup returns cues for cues and strings for strings."""
+        cues = [Cue(1000, 2000, "hello"), Cue(2000, 3000, "hello"), Cue(3000, 4000, "world")]
+        assert deduplicate_cues(cues) == [cues[0], cues[2]]
+        assert deduplicate_transcript_lines(cues) == [cues[0], cues[2]]
+        assert deduplicate_transcript_lines(render_lines(cues)) == ["[00:01] hello", "[00:03] world"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
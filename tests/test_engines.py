@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Test the yt-dlp extraction engines
+"""
+
+import sys
+import os
+import subprocess
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server import engines
+from src.youtube_transcript_server import extraction
+
+
+SRV1_CONTENT = """<?xml version="1.0" encoding="utf-8" ?>
+<transcript>
+<text start="0.5" dur="2.0">Hello world</text>
+<text start="65.0" dur="3.0">Second line</text>
+</transcript>"""
+
+INFO = {
+    'id': 'dQw4w9WgXcQ',
+    'title': 'Test Video',
+    'subtitles': {
+        'de': [{'ext': 'vtt', 'url': 'https://example.com/de.vtt'}]
+    },
+    'automatic_captions': {
+        'en': [
+            {'ext': 'json3', 'url': 'https://example.com/en.json3'},
+            {'ext': 'srv1', 'url': 'https://example.com/en.srv1'},
+            {'ext': 'vtt', 'url': 'https://example.com/en.vtt'}
+        ]
+    }
+}
+
+
+class TestSubtitleTrackSelection:
+    """Test picking a subtitle track from an info dict."""
+
+    def test_prefers_srv1(self):
+        """Test that the format preference order is honoured."""
+        track = engines.select_subtitle_track(INFO, 'en')
+        assert track == {'url': 'https://example.com/en.srv1', 'format': 'srv1', 'language': 'en', 'automatic': True}
+
+    def test_requested_language_wins_for_same_format(self):
+        """Test that manual subtitles in the requested language are used."""
+        track = engines.select_subtitle_track(INFO, 'de', formats=['vtt'])
+        assert track['language'] == 'de'
+        assert track['automatic'] is False
+
+    def test_falls_back_to_english(self):
+        """Test English fallback when the language is missing."""
+        track = engines.select_subtitle_track(INFO, 'fr')
+        assert track['language'] == 'en'
+        assert track['format'] == 'srv1'
+
+    def test_requested_language_beats_english_fallback(self):
+        """Test that any track in the requested language beats a preferred format in English."""
+        info = {
+            'subtitles': {
+                'en': [{'ext': 'srv1', 'url': 'https://example.com/en.srv1'}],
+                'de': [{'ext': 'vtt', 'url': 'https://example.com/de.vtt'}]
+            },
+            'automatic_captions': {
+                'de': [{'ext': 'json3', 'url': 'https://example.com/de.json3'}]
+            }
+        }
+        track = engines.select_subtitle_track(info, 'de')
+        assert track == {'url': 'https://example.com/de.vtt', 'format': 'vtt', 'language': 'de', 'automatic': False}
+
+        del info['subtitles']['de']
+        track = engines.select_subtitle_track(info, 'de')
+        assert (track['language'], track['format'], track['automatic']) == ('de', 'json3', True)
+
+    def test_no_tracks(self):
+        """Test that videos without subtitles yield no track."""
+        assert engines.select_subtitle_track({'id': 'x'}, 'en') is None
+
+
+class TestLibraryEngine:
+    """Test the in-process yt_dlp engine."""
+
+    @pytest.mark.asyncio
+    async def test_single_extract_info_call(self):
+        """Test that metadata and subtitles come from one extract_info call."""
+        engine = engines.LibraryEngine()
+        calls = []
+
+        def fake_extract(url):
+            calls.append(url)
+            return INFO
+
+        with patch.object(engine, '_extract_info_sync', fake_extract), \
+             patch.object(engine, '_fetch_url_sync', lambda url: SRV1_CONTENT):
+            info = await engine.extract_info('https://youtu.be/dQw4w9WgXcQ')
+            subtitles = await engine.fetch_subtitles('https://youtu.be/dQw4w9WgXcQ', 'en', info=info)
+
+        assert len(calls) == 1
+        assert subtitles['format'] == 'srv1'
+        assert extraction.parse_subtitle_content(subtitles['content'], subtitles['format']) == [
+            '[00:00] Hello world',
+            '[01:05] Second line'
+        ]
+
+    @pytest.mark.asyncio
+    async def test_missing_subtitles_raise(self):
+        """Test the error raised when no track matches."""
+        engine = engines.LibraryEngine()
+        with patch.object(engine, '_extract_info_sync', lambda url: {'id': 'x'}):
+            with pytest.raises(Exception, match="No subtitle formats available"):
+                await engine.fetch_subtitles('https://youtu.be/dQw4w9WgXcQ')
+
+    @pytest.mark.asyncio
+    async def test_availability_does_not_spawn(self):
+        """Test that the availability check never starts a process."""
+        engine = engines.LibraryEngine()
+        with patch('asyncio.create_subprocess_exec') as spawn:
+            assert await engine.available() is True
+        spawn.assert_not_called()
+
+
+class TestVideoBundle:
+    """Test single-pass metadata and subtitle extraction."""
+
+    @pytest.mark.asyncio
+    async def test_bundle_resolves_video_once(self):
+        """Test that the bundle makes one info lookup and one track download."""
+        engine = engines.LibraryEngine()
+        info_calls, fetched = [], []
+
+        def fake_extract(url):
+            info_calls.append(url)
+            return INFO
+
+        def fake_fetch(url):
+            fetched.append(url)
+            return SRV1_CONTENT
+
+        with patch.object(engines, 'get_engine', lambda name=None: engine), \
+             patch.object(engine, '_extract_info_sync', fake_extract), \
+             patch.object(engine, '_fetch_url_sync', fake_fetch):
+            bundle = await engines.fetch_video_bundle('https://youtu.be/dQw4w9WgXcQ', 'fr')
+
+        assert info_calls == ['https://youtu.be/dQw4w9WgXcQ']
+        assert fetched == ['https://example.com/en.srv1']
+        assert bundle['info']['title'] == 'Test Video'
+        assert bundle['available_languages'] == ['de', 'en (auto)']
+
+    @pytest.mark.asyncio
+    async def test_subprocess_engine_uses_info_urls(self):
+        """Test that the CLI engine downloads the chosen track without --write-subs."""
+        engine = engines.SubprocessEngine()
+
+        with patch.object(engines, '_fetch_url', lambda url: SRV1_CONTENT), \
+             patch.object(engines, 'download_subtitles_with_fallback') as download:
+            subtitles = await engine.fetch_subtitles('https://youtu.be/dQw4w9WgXcQ', 'en', info=INFO)
+
+        download.assert_not_called()
+        assert subtitles['format'] == 'srv1'
+        assert subtitles['content'] == SRV1_CONTENT
+
+
+class TestSubtitleDownloadFallback:
+    """Test the --write-subs download used when track URLs are unavailable."""
+
+    def setup_method(self):
+        engines._known_formats.clear()
+
+    @pytest.mark.asyncio
+    async def test_single_invocation_detects_format(self, tmp_path):
+        """Test that all formats are requested at once and the winner is detected."""
+        calls = []
+
+        async def fake_run(args, timeout=60):
+            calls.append(args)
+            (tmp_path / "Test Video.en.json3").write_text("{}")
+            return subprocess.CompletedProcess(args, 0, "", "")
+
+        with patch.object(engines, 'run_ytdlp', fake_run):
+            subtitle_file, fmt = await engines.download_subtitles_with_fallback(
+                'https://youtu.be/dQw4w9WgXcQ', 'en', str(tmp_path)
+            )
+
+        assert len(calls) == 1
+        assert calls[0][calls[0].index('--sub-format') + 1] == 'srv1/json3/ttml/vtt'
+        assert fmt == 'json3'
+        assert subtitle_file.endswith('Test Video.en.json3')
+        assert engines.known_subtitle_format('https://www.youtube.com/watch?v=dQw4w9WgXcQ', 'en') == 'json3'
+
+    @pytest.mark.asyncio
+    async def test_known_format_is_requested_first(self, tmp_path):
+        """Test that a remembered format leads the preference list."""
+        engines.remember_subtitle_format('https://youtu.be/dQw4w9WgXcQ', 'de', 'vtt')
+        calls = []
+
+        async def fake_run(args, timeout=60):
+            calls.append(args)
+            (tmp_path / "Test Video.de.vtt").write_text("WEBVTT")
+            return subprocess.CompletedProcess(args, 0, "", "")
+
+        with patch.object(engines, 'run_ytdlp', fake_run):
+            _, fmt = await engines.download_subtitles_with_fallback('https://youtu.be/dQw4w9WgXcQ', 'de', str(tmp_path))
+
+        assert fmt == 'vtt'
+        assert calls[0][calls[0].index('--sub-format') + 1] == 'vtt/srv1/json3/ttml'
+        assert calls[0][calls[0].index('--sub-lang') + 1] == 'de,en'
+
+    def test_requested_language_file_beats_english(self, tmp_path):
+        """Test that a downloaded file in the requested language wins over a better English format."""
+        (tmp_path / "Test Video.en.srv1").write_text("<transcript/>")
+        (tmp_path / "Test Video.de.vtt").write_text("WEBVTT")
+        subtitle_file, fmt = engines.find_subtitle_file(str(tmp_path), ['de', 'en'], engines.SUBTITLE_FORMATS)
+        assert (os.path.basename(subtitle_file), fmt) == ("Test Video.de.vtt", 'vtt')
+
+    @pytest.mark.asyncio
+    async def test_no_files_raise(self, tmp_path):
+        """Test the error when yt-dlp wrote no subtitles."""
+        async def fake_run(args, timeout=60):
+            return subprocess.CompletedProcess(args, 0, "", "")
+
+        with patch.object(engines, 'run_ytdlp', fake_run):
+            with pytest.raises(Exception, match="No subtitle formats available"):
+                await engines.download_subtitles_with_fallback('https://youtu.be/dQw4w9WgXcQ', 'en', str(tmp_path))
+
+
+class TestEngineSelection:
+    """Test choosing an engine."""
+
+    def test_engines_are_shared(self):
+        """Test that get_engine returns long-lived instances."""
+        assert engines.get_engine('library') is engines.get_engine('library')
+        assert engines.get_engine('subprocess').name == 'subprocess'
+
+    def test_unknown_engine(self):
+        """Test that invalid engine names are rejected."""
+        with pytest.raises(ValueError):
+            engines.get_engine('browser')
+
+    def test_library_falls_back_without_yt_dlp(self):
+        """Test the subprocess fallback when yt_dlp cannot be imported."""
+        with patch.object(engines.LibraryEngine, 'is_installed', staticmethod(lambda: False)):
+            assert engines.get_engine('library').name == 'subprocess'
+
+
+class TestVideoMetadata:
+    """Test the metadata helper used by the tools."""
+
+    @pytest.mark.asyncio
+    async def test_failure_is_reported_on_stderr(self, capsys):
+        """Test that failures stay off stdout, which carries the stdio protocol."""
+        class FailingEngine:
+            async def available(self):
+                return True
+
+            async def extract_info(self, video_url):
+                raise RuntimeError("video unavailable")
+
+        with patch.object(extraction, 'get_engine', lambda: FailingEngine()):
+            assert await extraction.get_video_metadata('https://youtu.be/dQw4w9WgXcQ') == {}
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "Could not get video metadata: video unavailable" in captured.err
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test full-text search across saved transcript resources
+"""
+
+import sys
+import os
+import json
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.library import LibraryIndex, extract_segments, fts_query
+
+
+def resource_text(video_id, title, lines):
+    timestamped = '\n'.join(lines)
+    return f"""# YouTube Video Transcript - {title}
+
+## Video Information
+- **Video ID**: {video_id}
+- **Title**: {title}
+
+## Plain Text Transcript (AI-Optimized)
+```
+{' '.join(line.split('] ', 1)[1] for line in lines)}
+```
+
+## Timestamped Transcript
+```
+{timestamped}
+```
+"""
+
+
+PYTHON_TALK = resource_text("py123", "Python Talk", [
+    "[00:00] Welcome to the talk.",
+    "[00:05] Decorators wrap functions in Python.",
+    "[01:02:03] A list comprehension builds a list.",
+])
+COOKING_SHOW = resource_text("cook456", "Cooking Show", [
+    "[00:10] Today we bake bread.",
+    "[00:20] Python is also the name of a snake, not a recipe.",
+])
+
+
+class TestSegments:
+    """Test what is indexed from a resource file."""
+
+    def test_timestamped_lines_only(self):
+        """Test that only timestamped transcript lines are indexed, with their start times."""
+        assert extract_segments(PYTHON_TALK) == [
+            (0, "Welcome to the talk."),
+            (5000, "Decorators wrap functions in Python."),
+            (3723000, "A list comprehension builds a list.")
+        ]
+
+    def test_query_translation(self):
+        """Test that words become prefix terms and quoted text phrases."""
+        assert fts_query('decor "list comprehension"') == '"decor"* AND "list comprehension"'
+        assert fts_query("?!") is None
+
+
+class TestLibraryIndex:
+    """Test indexing and ranked search."""
+
+    def write(self, directory, name, content):
+        path = directory / f"{name}.md"
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def test_ranked_hits_with_timestamps(self, tmp_path):
+        """Test that hits carry the video ID and timestamp, best match first."""
+        index = LibraryIndex(tmp_path)
+        index.update(self.write(tmp_path, "py123", PYTHON_TALK), PYTHON_TALK)
+        index.update(self.write(tmp_path, "cook456", COOKING_SHOW), COOKING_SHOW)
+
+        hits = index.search("python")
+        assert [hit['video_id'] for hit in hits] == ["py123", "cook456"]
+        assert hits[0]['timestamp'] == "[00:05]"
+        assert hits[0]['title'] == "Python Talk"
+        assert "**Python**" in hits[0]['snippet']
+        assert hits[0]['score'] >= hits[1]['score']
+
+        hit, = index.search('"list comprehension"')
+        assert (hit['video_id'], hit['timestamp'], hit['start_ms']) == ("py123", "[01:02:03]", 3723000)
+        assert index.search("decor") and not index.search("python bread")
+
+    def test_reindex_replaces_old_lines(self, tmp_path):
+        """Test that saving a resource again drops its previous lines."""
+        index = LibraryIndex(tmp_path)
+        index.update(self.write(tmp_path, "py123", PYTHON_TALK), PYTHON_TALK)
+        index.update(self.write(tmp_path, "cook456", COOKING_SHOW), COOKING_SHOW)
+        updated = resource_text("py123", "Python Talk", ["[00:01] Generators yield values."])
+        index.update(self.write(tmp_path, "py123", updated), updated)
+
+        assert index.search("decorators") == []
+        assert [hit['timestamp'] for hit in index.search("generators")] == ["[00:01]"]
+        assert [hit['video_id'] for hit in index.search("bread")] == ["cook456"]
+        assert index.stats()['segments'] == 3
+
+    def test_refresh_picks_up_external_changes(self, tmp_path):
+        """Test that files written or deleted by other tools are reconciled incrementally."""
+        self.write(tmp_path, "py123", PYTHON_TALK)
+        index = LibraryIndex(tmp_path)
+        assert [hit['video_id'] for hit in index.search("python")] == ["py123"]
+        assert index.indexed == 1
+
+        # Unchanged directory: no rescan
+        scans = index.scans
+        index.search("python")
+        assert index.scans == scans
+
+        self.write(tmp_path, "cook456", COOKING_SHOW)
+        (tmp_path / "py123.md").unlink()
+        assert [hit['video_id'] for hit in index.search("python")] == ["cook456"]
+        assert index.indexed == 2
+
+    def test_in_place_overwrite_is_reindexed(self, tmp_path):
+        """Test that a file rewritten in place (directory mtime unchanged) is re-indexed."""
+        path = self.write(tmp_path, "py123", resource_text("py123", "Talk", ["[00:01] alpha release notes"]))
+        index = LibraryIndex(tmp_path)
+        assert [hit['video_id'] for hit in index.search("alpha")] == ["py123"]
+
+        directory_mtime = tmp_path.stat().st_mtime_ns
+        path.write_text(resource_text("py123", "Talk", ["[00:02] beta release notes"]), encoding='utf-8')
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10 ** 9))
+        assert tmp_path.stat().st_mtime_ns == directory_mtime
+
+        scans = index.scans
+        assert [hit['timestamp'] for hit in index.search("beta")] == ["[00:02]"]
+        assert index.search("alpha") == []
+        assert index.scans == scans
+
+    def test_index_survives_restart(self, tmp_path):
+        """Test that a new index reuses the database instead of re-reading files."""
+        self.write(tmp_path, "py123", PYTHON_TALK)
+        assert LibraryIndex(tmp_path).search("python")
+
+        restarted = LibraryIndex(tmp_path)
+        assert restarted.search("python")
+        assert restarted.indexed == 0
+
+    def test_missing_directory(self, tmp_path):
+        """Test that searching a missing resource directory creates nothing."""
+        index = LibraryIndex(tmp_path / "missing")
+        assert index.search("python") == []
+        assert index.stats()['documents'] == 0
+        assert not (tmp_path / "missing").exists()
+
+
+class TestStreamlinedLibrarySearch:
+    """Test the streamlined server's library search tool and resource."""
+
+    def test_saved_resources_are_searchable(self, tmp_path, monkeypatch):
+        """Test that save_resource_file keeps the index current for the tool and resource."""
+        import streamlined_server
+
+        monkeypatch.setattr(streamlined_server.settings, 'resource_dir', tmp_path)
+        assert streamlined_server.save_resource_file("py123", PYTHON_TALK)
+        assert streamlined_server.save_resource_file("cook456", COOKING_SHOW)
+        assert streamlined_server.get_library_index().indexed == 2
+
+        output = asyncio.run(streamlined_server.search_library("decorators"))
+        assert "**Hits:** 1" in output
+        assert "`py123`" in output
+        assert "watch?v=py123&t=5s" in output
+
+        resource = asyncio.run(streamlined_server.get_library_search_resource("bread"))
+        payload = json.loads(resource['text'])
+        assert payload['total_hits'] == 1
+        assert payload['hits'][0]['video_id'] == "cook456"
+        assert payload['hits'][0]['timestamp'] == "[00:10]"
+
+        assert "No saved transcript lines match" in asyncio.run(streamlined_server.search_library("violin"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Test the shared subtitle parsers and deduplication
+"""
+
+import sys
+import os
+import io
+import json
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server import parsers
+from src.youtube_transcript_server.parsers import (
+    parse_subtitle_content, parse_subtitle_cues, iter_subtitle_cues, iter_subtitle_file, register_parser, get_parser
+)
+from src.youtube_transcript_server.dedup import deduplicate_transcript_lines, deduplicate_rolling_cues, deduplicate_vtt_cues
+from src.youtube_transcript_server.cues import Cue
+
+
+class TestParsers:
+    """Test the built-in format parsers."""
+
+    def test_srv1(self):
+        """Test SRV1 parsing with entity decoding."""
+        content = '<transcript><text start="3725.2" dur="1">Tom &amp;amp; Jerry</text></transcript>'
+        assert parse_subtitle_content(content, 'srv1') == ['[01:02:05] Tom & Jerry']
+
+    def test_json3(self):
+        """Test JSON3 parsing joins segments and skips newline-only ones."""
+        content = json.dumps({'events': [
+            {'tStartMs': 65000, 'segs': [{'utf8': 'Hello '}, {'utf8': '\n'}, {'utf8': '<b>world</b>'}]},
+            {'tStartMs': 70000}
+        ]})
+        assert parse_subtitle_content(content, 'json3') == ['[01:05] Hello world']
+
+    def test_vtt(self):
+        """Test VTT parsing joins multi-line cues and handles MM:SS timestamps."""
+        content = (
+            "WEBVTT\nKind: captions\nLanguage: en\n\n"
+            "00:00:01.000 --> 00:00:03.000 align:start\nHello\n<c>world</c>\n\n"
+            "01:04.500 --> 01:06.000\nSecond line\n"
+        )
+        assert parse_subtitle_content(content, 'vtt') == ['[00:01] Hello world', '[01:04] Second line']
+
+    def test_ttml(self):
+        """Test TTML parsing with namespaces, nested spans and line breaks."""
+        content = (
+            '<?xml version="1.0" encoding="utf-8" ?>'
+            '<tt xmlns="http://www.w3.org/ns/ttml" xmlns:tts="http://www.w3.org/ns/ttml#styling"><body><div>'
+            '<p begin="00:00:01.250" end="00:00:03.000">Hello <span tts:color="white">big</span><br/>world</p>'
+            '<p begin="65s" dur="1500ms">Tom &amp;amp; Jerry</p>'
+            '<p begin="00:01:10.000" end="00:01:11.000"> </p>'
+            '</div></body></tt>'
+        )
+        assert parse_subtitle_cues(content, 'ttml') == [
+            Cue(1250, 3000, 'Hello big world'),
+            Cue(65000, 66500, 'Tom & Jerry')
+        ]
+        assert parse_subtitle_content(content, 'ttml') == ['[00:01] Hello big world', '[01:05] Tom & Jerry']
+
+    def test_ttml_frames_and_ticks(self):
+        """Test TTML frame-based clock times and tick offsets."""
+        content = (
+            '<tt xmlns="http://www.w3.org/ns/ttml" xmlns:ttp="http://www.w3.org/ns/ttml#parameter" '
+            'ttp:frameRate="25" ttp:tickRate="10000000"><body><div>'
+            '<p begin="00:00:02:05" end="25000000t">Frames</p>'
+            '</div></body></tt>'
+        )
+        assert parse_subtitle_cues(content, 'ttml') == [Cue(2200, 2500, 'Frames')]
+
+    def test_unknown_format(self):
+        """Test that unregistered formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported subtitle format"):
+            parse_subtitle_content("", 'sbv')
+
+
+class TestStreamingParsers:
+    """Test that the parsers read their source incrementally."""
+
+    SAMPLES = {
+        'srv1': '<?xml version="1.0" encoding="utf-8" ?><transcript>'
+                '<text start="1" dur="1">one</text><text start="2" dur="1">two &amp;amp; three</text></transcript>',
+        'json3': json.dumps({'wireMagic': 'pb3', 'pens': [{}], 'events': [
+            {'tStartMs': 1000, 'dDurationMs': 1000, 'segs': [{'utf8': 'one'}]},
+            {'tStartMs': 2000, 'dDurationMs': 1000, 'segs': [{'utf8': 'two & three'}]}
+        ]}, indent=2),
+        'ttml': '<tt xmlns="http://www.w3.org/ns/ttml"><body><div>'
+                '<p begin="1s" end="2s">one</p><p begin="2s" end="3s"><span>two &amp;amp; three</span></p></div></body></tt>',
+        'vtt': "WEBVTT\n\n00:00:01.000 --> 00:00:02.000\none\n\n00:00:02.000 --> 00:00:03.000\ntwo &amp; three\n"
+    }
+
+    @pytest.mark.parametrize("format_type", ['srv1', 'json3', 'ttml', 'vtt'])
+    def test_tiny_chunks_match(self, format_type, monkeypatch):
+        """Test that results do not depend on where chunk boundaries fall."""
+        content = self.SAMPLES[format_type]
+        expected = parse_subtitle_content(content, format_type)
+        assert expected == ['[00:01] one', '[00:02] two & three']
+
+        monkeypatch.setattr(parsers, 'CHUNK_SIZE', 3)
+        assert parse_subtitle_content(content, format_type) == expected
+        assert parse_subtitle_content(io.StringIO(content), format_type) == expected
+
+    @pytest.mark.parametrize("format_type", ['srv1', 'json3', 'ttml', 'vtt'])
+    def test_subtitle_file(self, format_type, tmp_path):
+        """Test that files are streamed into cues."""
+        path = tmp_path / f"video.en.{format_type}"
+        path.write_text(self.SAMPLES[format_type], encoding='utf-8')
+        assert list(iter_subtitle_file(str(path), format_type)) == parse_subtitle_cues(self.SAMPLES[format_type], format_type)
+
+    def test_first_cue_before_end_of_input(self):
+        """Test that cues are yielded before the rest of the stream is read."""
+        class FailingStream:
+            def __init__(self, first):
+                self.chunks = [first]
+
+            def read(self, size=-1):
+                if self.chunks:
+                    return self.chunks.pop()
+                raise AssertionError("read past the first cue")
+
+        content = json.dumps(json.loads(self.SAMPLES['json3']))
+        first = content[:content.index('}]}') + 3]
+        cues = iter_subtitle_cues(FailingStream(first), 'json3')
+        assert next(cues).text == 'one'
+
+
+class TestCaptionCleaning:
+    """Test the shared cue text cleaning stage."""
+
+    def test_plain_text_fast_path(self):
+        """Test that plain text only has its whitespace normalised."""
+        assert parsers.clean_caption_text("  so today\n we  talk ") == "so today we talk"
+
+    def test_markup_and_entities(self):
+        """Test that tags are stripped before entities are decoded."""
+        assert parsers.clean_caption_text("<c.colorE5E5E5>a &amp; b</c> &lt;i&gt;") == "a & b <i>"
+
+
+class TestParserRegistry:
+    """Test plugging in parsers."""
+
+    def test_register_parser(self):
+        """Test that a registered parser is used for its format."""
+        @register_parser('upper')
+        def parse_upper(content):
+            return [f"[00:00] {content.upper()}"]
+
+        try:
+            assert parse_subtitle_content("hi", 'upper') == ["[00:00] HI"]
+            assert get_parser('upper') is parse_upper
+            assert 'upper' in parsers.supported_formats()
+        finally:
+            parsers._PARSERS.pop('upper')
+
+    def test_servers_share_the_core(self):
+        """Test that both servers use the same parser and dedup functions."""
+        import enhanced_server
+        import streamlined_server
+        from src.youtube_transcript_server import extraction
+
+        assert streamlined_server.parse_subtitle_content is enhanced_server.parse_subtitle_content
+        assert extraction.parse_subtitle_content is parsers.parse_subtitle_content
+        assert streamlined_server.deduplicate_transcript_lines is enhanced_server.deduplicate_transcript_lines
+
+
+class TestDeduplication:
+    """Test consecutive duplicate removal."""
+
+    def test_exact_and_extended_duplicates(self):
+        """Test that repeats are dropped and extensions replace the shorter line."""
+        lines = [
+            '[00:01] hello there',
+            '[00:02] hello there',
+            '[00:03] hello there my good friend',
+            '[00:04] [Music]',
+            '[00:05] something new'
+        ]
+        assert deduplicate_transcript_lines(lines) == [
+            '[00:03] hello there my good friend',
+            '[00:05] something new'
+        ]
+
+    def test_aggressive_word_overlap(self):
+        """Test that aggressive mode drops lines with mostly the same words."""
+        lines = [
+            '[00:01] we are going to talk about captions',
+            '[00:02] going to talk about captions we are'
+        ]
+        assert len(deduplicate_transcript_lines(lines)) == 2
+        assert deduplicate_transcript_lines(lines, aggressive=True) == lines[:1]
+
+
+
+class TestRollingDeduplication:
+    """Test word-stream reconstruction for rolling auto-captions."""
+
+    def test_rolling_window(self):
+        """Test that each cue keeps only the words it adds, with its own timing."""
+        cues = [
+            Cue(0, 1000, "so today we"),
+            Cue(1000, 2000, "so today we are going"),
+            Cue(2000, 3000, "We are going to talk."),
+            Cue(3000, 3010, "going to talk"),
+            Cue(3010, 4000, "[Music]"),
+            Cue(4000, 5000, "about captions")
+        ]
+        assert deduplicate_rolling_cues(cues) == [
+            Cue(0, 1000, "so today we"),
+            Cue(1000, 2000, "are going"),
+            Cue(2000, 3000, "to talk."),
+            Cue(4000, 5000, "about captions")
+        ]
+
+    def test_single_word_overlap_is_kept(self):
+        """Test that one shared word at a boundary is treated as real speech."""
+        cues = [Cue(0, 1000, "and I"), Cue(1000, 2000, "I think so")]
+        assert [cue.text for cue in deduplicate_rolling_cues(cues)] == ["and I", "I think so"]
+
+    def test_vtt_mode_switch(self):
+        """Test that the consecutive-cue deduplicator is used when rolling mode is off."""
+        cues = [Cue(0, 1000, "hello there"), Cue(1000, 2000, "hello there friend of mine")]
+        assert [cue.text for cue in deduplicate_vtt_cues(cues, rolling=True)] == ["hello there", "friend of mine"]
+        assert [cue.text for cue in deduplicate_vtt_cues(cues, rolling=False)] == ["hello there friend of mine"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test the staged transcript pipeline and its memoization
+"""
+
+import sys
+import os
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server import extraction, resources
+from src.youtube_transcript_server import pipeline as pipeline_module
+from src.youtube_transcript_server.cache import DiskCache, TranscriptCache, cache_key, rebuild_lines_result, split_lines_result
+from src.youtube_transcript_server.cues import Cue, render_lines
+from src.youtube_transcript_server.dedup import deduplicate_cues
+from src.youtube_transcript_server.extraction import analyze_transcript_quality, create_plain_text_script
+from src.youtube_transcript_server.pipeline import AGGRESSIVE, DEDUPLICATED, RAW, TranscriptPipeline, pipeline_for
+
+CUES = [
+    Cue(1000, 2000, "we are going to talk about captions today."),
+    Cue(2000, 3000, "we are going to talk about captions today."),
+    Cue(3000, 4000, "going to talk about captions today we are."),
+    Cue(4000, 5000, "and then we look at the pipeline that builds the text once."),
+]
+
+
+class TestStages:
+    """Test stage computation."""
+
+    def test_stages_match_the_deduplicator(self):
+        """Test that each stage equals a standalone dedup pass."""
+        pipeline = TranscriptPipeline(CUES)
+        assert pipeline.stage(RAW) == CUES
+        assert pipeline.stage(DEDUPLICATED) == deduplicate_cues(CUES)
+        assert pipeline.stage(AGGRESSIVE) == deduplicate_cues(CUES, aggressive=True)
+        assert pipeline.lines(AGGRESSIVE) == render_lines(deduplicate_cues(CUES, aggressive=True))
+
+    def test_stages_are_lazy_and_computed_once(self, monkeypatch):
+        """Test that a stage is only computed when first requested."""
+        calls = []
+
+        def counting_dedup(cues, aggressive=False):
+            calls.append(aggressive)
+            return deduplicate_cues(cues, aggressive)
+
+        monkeypatch.setattr(pipeline_module, 'deduplicate_cues', counting_dedup)
+        pipeline = TranscriptPipeline(CUES)
+        assert pipeline.computed() == [RAW]
+
+        pipeline.stage(AGGRESSIVE)
+        pipeline.lines(AGGRESSIVE)
+        create_plain_text_script(pipeline, remove_duplicates=True, aggressive_dedup=True)
+        analyze_transcript_quality(pipeline)
+        assert calls == [True]
+
+    def test_unknown_stage(self):
+        """Test that unknown stage names are rejected."""
+        with pytest.raises(ValueError, match="Unknown transcript stage"):
+            TranscriptPipeline(CUES).stage("bogus")
+
+
+class TestDerivedOutputs:
+    """Test memoized outputs built from the stages."""
+
+    def test_plain_text_is_memoized(self):
+        """Test that the plain text script is built once and matches the cue-based result."""
+        pipeline = TranscriptPipeline(CUES)
+        first = create_plain_text_script(pipeline, remove_duplicates=True, aggressive_dedup=True)
+        assert first == create_plain_text_script(CUES, remove_duplicates=True, aggressive_dedup=True)
+        assert create_plain_text_script(pipeline, remove_duplicates=True, aggressive_dedup=True) is first
+
+    def test_pipeline_for_attaches_once(self):
+        """Test that results without a pipeline get one built from their cues."""
+        result = {'lines': render_lines(CUES), 'cues': CUES}
+        pipeline = pipeline_for(result)
+        assert result['pipeline'] is pipeline
+        assert pipeline_for(result) is pipeline
+        assert pipeline.lines() is result['lines']
+
+
+class TestCachedPipeline:
+    """Test that pipelines live on in-memory cache entries only."""
+
+    def test_entry_reuses_pipeline(self):
+        """Test that repeated cache hits share one pipeline."""
+        transcript, details = split_lines_result({'format': 'srv1', 'cues': CUES, 'lines': render_lines(CUES),
+                                                  'pipeline': TranscriptPipeline(CUES)})
+        assert 'pipeline' not in details
+
+        entry = {'transcript': transcript, 'result': details}
+        first = rebuild_lines_result(entry)
+        second = rebuild_lines_result(entry)
+        assert first['pipeline'] is second['pipeline'] is entry['pipeline']
+        assert second['cues'] == CUES
+
+    def test_pipeline_not_persisted(self, tmp_path):
+        """Test that the disk cache stores entries without their pipeline."""
+        disk = DiskCache(tmp_path / "cache.sqlite3")
+        key = ("abc", "en", "best", "standard")
+        disk.put(key, {'transcript': "x", 'result': {}, 'pipeline': TranscriptPipeline(CUES)})
+        assert disk.get(key) == {'transcript': "x", 'result': {}}
+
+
+class TestEnhancedResultCache:
+    """Test that the enhanced resources are served from the shared transcript store."""
+
+    VIDEO_ID = "dQw4w9WgXcQ"
+
+    @pytest.fixture
+    def extractions(self, tmp_path, monkeypatch):
+        """Count extractions against a fresh memory + disk cache."""
+        calls = []
+
+        async def fake_metadata(video_url):
+            calls.append(video_url)
+            return {'title': "Captions", 'uploader': "Channel", 'duration': 5, 'view_count': 10,
+                    'formats': [{'url': "https://example.invalid/" + "x" * 500}] * 20,
+                    'automatic_captions': {'en': [{'ext': 'srv1', 'url': "https://example.invalid/en"}]}}
+
+        async def fake_transcript(video_url, language="en", info=None):
+            return {'success': True, 'method': 'yt-dlp', 'format': 'srv1', 'language': language,
+                    'cues': CUES, 'lines': render_lines(CUES), 'line_count': len(CUES)}
+
+        cache = TranscriptCache(10, disk=DiskCache(tmp_path / "cache.sqlite3"))
+        monkeypatch.setattr(resources, '_transcript_cache', cache)
+        monkeypatch.setattr(extraction, 'get_video_metadata', fake_metadata)
+        monkeypatch.setattr(extraction, 'extract_transcript_ytdlp', fake_transcript)
+        return calls, cache
+
+    def test_resource_views_extract_once(self, extractions):
+        """Test that browsing all views of a video runs the extraction once."""
+        import enhanced_server
+        calls, cache = extractions
+
+        async def browse():
+            return [await view(self.VIDEO_ID) for view in (
+                enhanced_server.get_comprehensive_transcript_resource,
+                enhanced_server.get_transcript_quality_resource,
+                enhanced_server.get_plain_text_resource,
+                enhanced_server.get_rich_metadata_resource
+            )]
+
+        comprehensive, quality, plain, rich = asyncio.run(browse())
+        assert len(calls) == 1
+        assert plain['plain_text'] == comprehensive['content']['plain_text']
+        assert quality['quality_analysis']['total_lines'] == len(CUES)
+        assert rich['content_info']['automatic_captions'] == {'en': ['srv1']}
+
+    def test_rebuilt_from_disk(self, extractions):
+        """Test that a restart rebuilds the same views from the compact disk entry."""
+        calls, cache = extractions
+        url = f"https://www.youtube.com/watch?v={self.VIDEO_ID}"
+        first = asyncio.run(extraction.extract_enhanced_transcript(url))
+
+        stored = cache.disk.get(cache_key(self.VIDEO_ID, "en", "enhanced", "aggressive"))
+        assert not set(extraction.DERIVED_ENHANCED_KEYS) & set(stored['result'])
+        assert 'formats' not in stored['result']['metadata']
+
+        cache.clear()
+        second = asyncio.run(extraction.extract_enhanced_transcript(url))
+        assert len(calls) == 1
+        for key in ('raw_lines', 'deduplicated_lines', 'plain_text', 'quality_metrics', 'deduplicated_count'):
+            assert second[key] == first[key]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
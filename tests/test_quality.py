@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test that single-pass quality scoring matches the previous implementation
+"""
+
+import sys
+import os
+import random
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.benchmark_quality import legacy_calculate_quality_score, legacy_count_duplicates, synthetic_cues
+from src.youtube_transcript_server import quality, resources
+from src.youtube_transcript_server.cache import TranscriptCache, cache_key, split_lines_result
+from src.youtube_transcript_server.cues import Cue, render_lines
+from src.youtube_transcript_server.extraction import get_stored_quality_report
+from src.youtube_transcript_server.quality import (
+    QUALITY_SCORING_VERSION, calculate_quality_score, count_duplicates, count_punctuation,
+    load_quality_sidecar, quality_sidecar_path, save_quality_sidecar
+)
+
+
+class TestQualityScore:
+    """Test calculate_quality_score against the multi-pass version."""
+
+    @pytest.mark.parametrize("video_info", [None, {'duration': 10}, {'duration': 100000}])
+    def test_synthetic_transcript(self, video_info):
+        """Test a long transcript with hour-long timestamps."""
+        cues = synthetic_cues(2000)
+        assert cues[-1].start_ms > 3600 * 1000
+        assert calculate_quality_score(cues, video_info) == legacy_calculate_quality_score(cues, video_info)
+
+    def test_edge_cases(self):
+        """Test untimed, empty, garbled and non-English cues."""
+        cases = [
+            [],
+            [Cue(None, None, "untimed line."), Cue(0, 0, ""), Cue(3599999, 3600000, "edge")],
+            [Cue(i * 1000, None, "§§ ¶¶ ___ ## İstanbul ΣΑΣ") for i in range(30)],
+            [Cue(i * 1000, None, f"der die das wort{i} und {i}") for i in range(30)],
+            [Cue(i * 1000, None, "uh uh uh um the") for i in range(30)],
+        ]
+        for cues in cases:
+            assert calculate_quality_score(cues, {'duration': 60}) == legacy_calculate_quality_score(cues, {'duration': 60})
+
+    def test_rendered_lines(self):
+        """Test that rendered lines score the same as their cues."""
+        cues = synthetic_cues(50)
+        lines = [cue.render() for cue in cues]
+        assert calculate_quality_score(lines) == calculate_quality_score(cues)
+
+    def test_count_punctuation(self):
+        """Test punctuation counting."""
+        assert count_punctuation("a, b. c! d? e; f: g - h") == 6
+
+
+class TestDuplicateCounting:
+    """Test count_duplicates against the quadratic scan."""
+
+    def test_random_texts(self):
+        """Test heavily overlapping random texts (many containments)."""
+        rng = random.Random(7)
+        texts = [' '.join(rng.choice("ab c dé") for _ in range(rng.randint(0, 8))) for _ in range(400)]
+        assert count_duplicates(texts) == legacy_count_duplicates(texts)
+
+    def test_containment_both_ways(self):
+        """Test that shorter and longer overlapping texts are partial duplicates."""
+        texts = ["hello world", "Hello  World", "world", "say hello world again", "unrelated"]
+        assert count_duplicates(texts) == (1, 2)
+
+
+class TestStoredQualityReports:
+    """Test that quality reports are stored, versioned and read back without extraction."""
+
+    def test_sidecar_round_trip(self, tmp_path):
+        """Test that a sidecar is read back while its scoring version is current."""
+        path = quality_sidecar_path(tmp_path, "abc123")
+        assert save_quality_sidecar(path, {'video_id': "abc123", 'quality_metrics': {'quality_score': 80}})
+
+        report = load_quality_sidecar(path)
+        assert report['scoring_version'] == QUALITY_SCORING_VERSION
+        assert report['quality_metrics'] == {'quality_score': 80}
+        assert load_quality_sidecar(tmp_path / "missing.quality.json") is None
+
+    def test_sidecar_path_per_schema(self, tmp_path):
+        """Test that each report layout gets its own sidecar file."""
+        assert quality_sidecar_path(tmp_path, "abc123").name == "abc123.quality.json"
+        assert quality_sidecar_path(tmp_path, "abc123", "enhanced").name == "abc123.enhanced.quality.json"
+        assert quality_sidecar_path(tmp_path, "abc123", "streamlined") != quality_sidecar_path(tmp_path, "abc123", "enhanced")
+
+    def test_sidecar_schema_and_keys_checked(self, tmp_path):
+        """Test that sidecars of another schema, or missing a required key, are cache misses."""
+        path = quality_sidecar_path(tmp_path, "abc123")
+        save_quality_sidecar(path, {'video_id': "abc123"}, "streamlined")
+        assert load_quality_sidecar(path, "streamlined")['video_id'] == "abc123"
+        assert load_quality_sidecar(path, "enhanced") is None
+        assert load_quality_sidecar(path, "streamlined", ('video_id', 'quality_metrics')) is None
+
+    def test_stale_sidecar_ignored(self, tmp_path, monkeypatch):
+        """Test that reports written by another scoring version are not served."""
+        path = quality_sidecar_path(tmp_path, "abc123")
+        save_quality_sidecar(path, {'video_id': "abc123"})
+        monkeypatch.setattr(quality, 'QUALITY_SCORING_VERSION', QUALITY_SCORING_VERSION + 1)
+        assert load_quality_sidecar(path) is None
+
+    def test_streamlined_quality_tool_reads_sidecar(self, tmp_path, monkeypatch):
+        """Test that quality analysis of a saved resource does not extract the video again."""
+        import streamlined_server
+
+        async def no_extraction(*args, **kwargs):
+            raise AssertionError("transcript was extracted again")
+
+        metrics = quality.stamp_quality_version(calculate_quality_score(synthetic_cues(50)))
+        metrics.update(deduplication_effectiveness=0, format_used='srv1')
+        monkeypatch.setattr(streamlined_server.settings, 'resource_dir', tmp_path)
+        monkeypatch.setattr(streamlined_server, '_transcript_cache', TranscriptCache(10))
+        monkeypatch.setattr(streamlined_server, 'extract_transcript_ytdlp', no_extraction)
+        save_quality_sidecar(quality_sidecar_path(tmp_path, "dQw4w9WgXcQ", streamlined_server.QUALITY_REPORT_SCHEMA), {
+            'video_id': "dQw4w9WgXcQ", 'language': "en", 'format': 'srv1',
+            'line_count': 50, 'original_line_count': 50, 'quality_metrics': metrics
+        }, streamlined_server.QUALITY_REPORT_SCHEMA)
+
+        output = asyncio.run(streamlined_server.get_transcript_quality_analysis("https://youtu.be/dQw4w9WgXcQ"))
+        assert f"**Quality Score:** {metrics['quality_score']}%" in output
+
+    def test_streamlined_stale_cache_is_rescored(self, monkeypatch):
+        """Test that cached results from an older scoring version are rescored from their cues."""
+        import streamlined_server
+
+        cache = TranscriptCache(10)
+        monkeypatch.setattr(streamlined_server, '_transcript_cache', cache)
+        cues = synthetic_cues(40)
+        transcript, details = split_lines_result({
+            'method': 'yt-dlp', 'success': True, 'video_id': "abc123", 'language': "en", 'format': 'srv1',
+            'cues': cues, 'lines': render_lines(cues), 'line_count': 40, 'original_line_count': 40,
+            'quality_metrics': {'quality_score': 1}, 'metadata': {'duration': 120}
+        })
+        cache[cache_key("abc123", "en", "best", "standard")] = {'transcript': transcript, 'result': details}
+
+        result = streamlined_server.get_cached_extraction("abc123", "en", "standard")
+        expected = calculate_quality_score(cues, {'duration': 120})
+        assert result['quality_metrics']['quality_score'] == expected['quality_score']
+        assert result['quality_metrics']['scoring_version'] == QUALITY_SCORING_VERSION
+        assert details['quality_metrics'] is result['quality_metrics']
+
+    def test_enhanced_report_from_cached_result(self, tmp_path, monkeypatch):
+        """Test that the enhanced report comes from the cached result and ignores stale metrics."""
+        monkeypatch.setattr(resources, '_transcript_cache', TranscriptCache(10))
+        monkeypatch.setattr(resources.settings, 'resource_dir', tmp_path)
+        result = {
+            'success': True, 'video_id': "abc123", 'video_url': "https://youtu.be/abc123", 'method': 'yt-dlp',
+            'language': "en", 'plain_text_length': 11, 'metadata': {'title': "Talk"},
+            'line_count': 2, 'deduplicated_count': 2, 'raw_lines': ["[00:01] hello", "[00:02] world"],
+            'quality_metrics': {'quality_score': 90.0}
+        }
+        resources.add_to_cache("abc123", "hello world", "en", "enhanced", "aggressive", result=result)
+        assert get_stored_quality_report("abc123") is None
+
+        quality.stamp_quality_version(result['quality_metrics'])
+        report = get_stored_quality_report("abc123")
+        assert report['title'] == "Talk"
+        assert report['plain_text_length'] == len("hello world")
+        assert report['quality_metrics']['quality_score'] == 90.0
+
+
+    def test_sidecars_not_shared_between_servers(self, tmp_path, monkeypatch):
+        """Test that each server keeps its own sidecar for a video and ignores the other one."""
+        import enhanced_server
+        import streamlined_server
+        from src.youtube_transcript_server import extraction
+
+        async def enhanced_offline(*args, **kwargs):
+            return {'success': False, 'error': "offline"}
+
+        async def streamlined_offline(*args, **kwargs):
+            return {'success': False, 'error': "offline"}
+
+        monkeypatch.setattr(resources, '_transcript_cache', TranscriptCache(10))
+        monkeypatch.setattr(streamlined_server, '_transcript_cache', TranscriptCache(10))
+        monkeypatch.setattr(extraction.settings, 'resource_dir', tmp_path)
+        monkeypatch.setattr(streamlined_server.settings, 'resource_dir', tmp_path)
+        monkeypatch.setattr(extraction, 'extract_enhanced_transcript', enhanced_offline)
+        monkeypatch.setattr(streamlined_server, 'extract_transcript_ytdlp', streamlined_offline)
+
+        video_id = "dQw4w9WgXcQ"
+        url = f"https://youtu.be/{video_id}"
+        metrics = quality.stamp_quality_version(calculate_quality_score(synthetic_cues(50)))
+        metrics.update(quality_score=77, deduplication_effectiveness=0, format_used='srv1')
+
+        # Written by the streamlined server, ignored by the enhanced tool and resource
+        save_quality_sidecar(quality_sidecar_path(tmp_path, video_id, streamlined_server.QUALITY_REPORT_SCHEMA),
+                             streamlined_server.build_quality_report({
+                                 'video_id': video_id, 'language': "en", 'format': 'srv1', 'line_count': 50,
+                                 'quality_metrics': metrics
+                             }), streamlined_server.QUALITY_REPORT_SCHEMA)
+        assert asyncio.run(enhanced_server.get_transcript_quality_analysis(url)) == \
+            "❌ Quality analysis failed: offline"
+        resource = asyncio.run(enhanced_server.get_transcript_quality_resource(video_id))
+        assert resource['error'] == "Failed to analyze transcript quality: offline"
+        assert "**Quality Score:** 77%" in asyncio.run(streamlined_server.get_transcript_quality_analysis(url))
+
+        # Written by the enhanced server for the same video: both reports are kept
+        save_quality_sidecar(quality_sidecar_path(tmp_path, video_id, extraction.QUALITY_REPORT_SCHEMA),
+                             extraction.build_quality_report({
+                                 'video_id': video_id, 'video_url': url, 'method': 'yt-dlp', 'language': "en",
+                                 'line_count': 50, 'deduplicated_count': 48, 'plain_text_length': 900,
+                                 'quality_metrics': {**metrics, 'quality_score': 66}
+                             }), extraction.QUALITY_REPORT_SCHEMA)
+        assert "66%" in asyncio.run(enhanced_server.get_transcript_quality_analysis(url))
+        assert "**Quality Score:** 77%" in asyncio.run(streamlined_server.get_transcript_quality_analysis(url))
+        assert sorted(path.name for path in tmp_path.glob("*.quality.json")) == [
+            f"{video_id}.enhanced.quality.json", f"{video_id}.streamlined.quality.json"
+        ]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test searching within transcripts
+"""
+
+import sys
+import os
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server import resources
+from src.youtube_transcript_server.cache import TranscriptCache
+from src.youtube_transcript_server.cues import Cue, render_lines
+from src.youtube_transcript_server.pipeline import TranscriptPipeline
+from src.youtube_transcript_server.search import (
+    TranscriptIndex, bounded_edit_distance, highlight_pattern, merge_windows, parse_query, rank_passages,
+    search_cues, transcript_index, trigrams
+)
+
+CUES = [
+    Cue(0, 2000, "Welcome to this video about Python programming."),
+    Cue(2000, 4000, "Python is a versatile language, and a list"),
+    Cue(4000, 6000, "comprehension builds a list in one line."),
+    Cue(6000, 8000, "Decorators wrap functions in Python."),
+    Cue(8000, 9000, "?!"),
+]
+
+
+class TestQueryParsing:
+    """Test the query syntax."""
+
+    def test_terms_and_phrases(self):
+        """Test that quoted text becomes phrases and the rest AND terms."""
+        assert parse_query('python "list comprehension" Python') == (["python"], [["list", "comprehension"]])
+        assert parse_query('"python"') == (["python"], [])
+
+
+class TestTranscriptIndex:
+    """Test the per-transcript token index."""
+
+    def test_single_term_matches_substrings(self):
+        """Test that a word still matches inside longer words, like the substring search did."""
+        index = TranscriptIndex(CUES)
+        assert index.search("python") == [0, 1, 3]
+        assert index.search("program") == [0]
+
+    def test_and_query(self):
+        """Test that every term must occur in the cue."""
+        assert TranscriptIndex(CUES).search("python decorators") == [3]
+        assert TranscriptIndex(CUES).search("python missing") == []
+
+    def test_phrase_across_cues(self):
+        """Test that phrases can continue into the next cue and are reported where they start."""
+        index = TranscriptIndex(CUES)
+        assert index.search('"list comprehension"') == [1]
+        assert index.search('"comprehension list"') == []
+
+    def test_punctuation_only_query_falls_back(self):
+        """Test that queries without words use a plain substring scan."""
+        pipeline = TranscriptPipeline(CUES)
+        assert transcript_index(pipeline).search("?!") is None
+        assert search_cues(pipeline, "?!") == [4]
+
+    def test_index_memoized_on_pipeline(self):
+        """Test that the index is built once per transcript."""
+        pipeline = TranscriptPipeline(CUES)
+        assert transcript_index(pipeline) is transcript_index(pipeline)
+        assert search_cues(pipeline, "python") is search_cues(pipeline, "python")
+
+    def test_highlight_preserves_case(self):
+        """Test that highlighting matches case-insensitively and keeps the original text."""
+        pattern = highlight_pattern('python "list comprehension"')
+        assert pattern.sub(lambda m: f"**{m.group(0)}**", "Python: a List  comprehension") == \
+            "**Python**: a **List  comprehension**"
+
+
+class TestRankedPassages:
+    """Test BM25 ranking and merging of context windows."""
+
+    def test_overlapping_windows_merge(self):
+        """Test that overlapping or touching windows become one passage with every match."""
+        passages = merge_windows([1, 2, 6, 20], [1.0, 3.0, 2.0, 0.5], context_lines=2, cue_count=22)
+        assert [(p['start'], p['end'], p['matches'], p['score']) for p in passages] == [
+            (0, 9, [1, 2, 6], 3.0), (18, 22, [20], 0.5)
+        ]
+
+    def test_rarer_and_denser_terms_rank_first(self):
+        """Test that windows with more occurrences of rare terms rank above common-term windows."""
+        cues = [Cue(i * 1000, i * 1000 + 1000, "filler words about python") for i in range(30)]
+        cues[12] = Cue(12000, 13000, "python decorators and more decorators")
+        cues[25] = Cue(25000, 26000, "one decorators mention in python")
+        pipeline = TranscriptPipeline(cues)
+
+        count, passages = rank_passages(pipeline, "python decorators", context_lines=0)
+        assert count == 2
+        assert [p['matches'] for p in passages] == [[12], [25]]
+        assert passages[0]['score'] > passages[1]['score']
+
+    def test_top_k_limits_passages(self):
+        """Test that a frequent term yields at most top_k merged passages."""
+        cues = [Cue(i * 1000, i * 1000 + 1000, f"python line {i}") for i in range(200)]
+        count, passages = rank_passages(TranscriptPipeline(cues), "python", context_lines=2, top_k=3)
+        assert count == 200
+        # Every window touches the next one: the whole transcript is one passage
+        assert len(passages) == 1 and (passages[0]['start'], passages[0]['end']) == (0, 200)
+
+        spaced = [Cue(i * 1000, i * 1000 + 1000, "python" if i % 10 == 0 else "other") for i in range(200)]
+        count, passages = rank_passages(TranscriptPipeline(spaced), "python", context_lines=1, top_k=3)
+        assert count == 20
+        assert len(passages) == 3
+
+    def test_substring_fallback_keeps_transcript_order(self):
+        """Test that queries without words are returned unranked, in order."""
+        count, passages = rank_passages(TranscriptPipeline(CUES), "?!", context_lines=0)
+        assert count == 1
+        assert passages[0]['matches'] == [4] and passages[0]['score'] == 0.0
+
+
+CAPTION_CUES = [
+    Cue(0, 2000, "today we deploy to kubernetes"),
+    Cue(2000, 4000, "the kubernetis cluster runs"),
+    Cue(4000, 6000, "a cubernetes operator"),
+    Cue(6000, 8000, "nothing related here"),
+]
+
+
+class TestFuzzySearch:
+    """Test approximate matching of misspelled captions."""
+
+    def test_bounded_edit_distance(self):
+        """Test the distance and the early exit past the limit."""
+        assert bounded_edit_distance("kubernetes", "kubernetis", 2) == 1
+        assert bounded_edit_distance("kubernetes", "cubernetis", 2) == 2
+        assert bounded_edit_distance("kubernetes", "kettle", 2) is None
+        assert trigrams("ab") == {"^ab", "ab$"}
+
+    def test_near_matches_with_similarity(self):
+        """Test that misspellings match with lower similarity than the exact word."""
+        index = TranscriptIndex(CAPTION_CUES)
+        assert index.search("kubernetes") == [0]
+
+        matches, similarities = index.fuzzy_search("kubernetes")
+        assert matches == [0, 1, 2]
+        assert similarities[0] == 1.0
+        assert similarities[1] == similarities[2] == 0.9
+
+    def test_short_words_stay_exact(self):
+        """Test that short words are not fuzzed (and max_edits can widen or disable matching)."""
+        index = TranscriptIndex(CAPTION_CUES)
+        assert index.fuzzy_tokens("the") == {"the": 1.0}
+        assert "kubernetis" not in index.fuzzy_tokens("kubernetes", max_edits=0)
+
+    def test_fuzzy_passages_ranked_by_similarity(self):
+        """Test that fuzzy passages carry similarity scores, best first."""
+        cues = CAPTION_CUES[1:] + [Cue(8000, 10000, "kubernetes again")]
+        count, passages = rank_passages(TranscriptPipeline(cues), "kubernetes cluster", context_lines=0, fuzzy=True)
+        assert count == 1
+        assert passages[0]['matches'] == [0] and passages[0]['score'] == 0.95
+
+        count, passages = rank_passages(TranscriptPipeline(cues), "kubernetes", context_lines=0, fuzzy=True)
+        # Adjacent misspellings form one passage, below the exact match
+        assert [p['matches'] for p in passages] == [[3], [0, 1]]
+
+
+class TestSearchTool:
+    """Test the enhanced server's search_transcript tool."""
+
+    def test_cached_transcript_is_searched_without_extraction(self, monkeypatch):
+        """Test that a cached transcript is searched without running yt-dlp."""
+        import enhanced_server
+
+        async def no_extraction(*args, **kwargs):
+            raise AssertionError("transcript was extracted again")
+
+        monkeypatch.setattr(resources, '_transcript_cache', TranscriptCache(10))
+        monkeypatch.setattr(enhanced_server, 'extract_transcript_ytdlp', no_extraction)
+        resources.cache_transcript_lines("dQw4w9WgXcQ", {
+            'method': 'yt-dlp', 'success': True, 'language': "en", 'format': 'srv1',
+            'cues': CUES, 'lines': render_lines(CUES), 'line_count': len(CUES)
+        }, "en", "best", "standard")
+
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        result = asyncio.run(enhanced_server.search_transcript(url, "python decorators", context_lines=0))
+        assert result.startswith("Found 1 matches")
+        assert "[00:06] **Decorators** wrap functions in **Python**." in result
+
+        result = asyncio.run(enhanced_server.search_transcript(url, "python", context_lines=1, top_k=5))
+        assert result.startswith("Found 3 matches")
+        # Matches 0, 1 and 3 have overlapping windows: one passage with every match highlighted
+        assert "(top 1 passage by relevance)" in result
+        assert "3 matches)" in result
+        assert "**Python** is a versatile language" in result
+
+    def test_fuzzy_mode(self, monkeypatch):
+        """Test that fuzzy searches highlight the misspelled words and report similarity."""
+        import enhanced_server
+
+        async def no_extraction(*args, **kwargs):
+            raise AssertionError("transcript was extracted again")
+
+        monkeypatch.setattr(resources, '_transcript_cache', TranscriptCache(10))
+        monkeypatch.setattr(enhanced_server, 'extract_transcript_ytdlp', no_extraction)
+        resources.cache_transcript_lines("dQw4w9WgXcQ", {
+            'method': 'yt-dlp', 'success': True, 'language': "en", 'format': 'srv1',
+            'cues': CAPTION_CUES, 'lines': render_lines(CAPTION_CUES), 'line_count': len(CAPTION_CUES)
+        }, "en", "best", "standard")
+
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        assert "Try fuzzy=True" in asyncio.run(enhanced_server.search_transcript(url, "kubernetez"))
+        result = asyncio.run(enhanced_server.search_transcript(url, "kubernetes", context_lines=0, fuzzy=True))
+        assert result.startswith("Found 3 matches")
+        assert "by similarity" in result
+        assert "[00:02] the **kubernetis** cluster runs _(similarity 0.90)_" in result
+        assert "[00:00] today we deploy to **kubernetes** _(similarity 1.00)_" in result
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
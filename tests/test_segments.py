@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test time-range slicing of transcripts
+"""
+
+import sys
+import os
+import asyncio
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server import resources
+from src.youtube_transcript_server.cache import TranscriptCache
+from src.youtube_transcript_server.cues import Cue, format_seconds, parse_time, render_lines
+from src.youtube_transcript_server.pipeline import TranscriptPipeline, cues_in_range
+
+# One 4-second cue every 5 seconds, for 10 minutes
+CUES = [Cue(i * 5000, i * 5000 + 4000, f"line {i}") for i in range(120)]
+
+VIDEO_ID = "dQw4w9WgXcQ"
+URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+class TestParseTime:
+    """Test the accepted time formats."""
+
+    def test_formats(self):
+        """Test seconds, MM:SS and HH:MM:SS offsets."""
+        assert parse_time("90") == 90
+        assert parse_time("90.5") == 90.5
+        assert parse_time("1:30") == 90
+        assert parse_time("[01:02:03]") == 3723
+        assert parse_time(15) == 15
+
+    def test_invalid(self):
+        """Test that malformed, negative and non-finite times are rejected."""
+        for value in ("", "1::30", "a:b", "1:2:3:4", "-5", "inf", "-inf", "nan", "1e308:00", float('inf')):
+            with pytest.raises(ValueError, match="Invalid time"):
+                parse_time(value)
+
+
+    def test_format_seconds_round_trips(self):
+        """Test that formatted offsets keep millisecond precision and parse back."""
+        assert format_seconds(90.0) == "90"
+        assert format_seconds(0.1 + 0.2) == "0.3"
+        assert format_seconds(1000010.25) == "1000010.25"
+        for seconds in (0.001, 75.5, 3723.25, 1234567.125):
+            assert parse_time(format_seconds(seconds)) == seconds
+
+
+class TestCuesInRange:
+    """Test binary-search slicing of cached cues."""
+
+    def test_exact_slice(self):
+        """Test that cues overlapping the range are returned, including one still running at its start."""
+        pipeline = TranscriptPipeline(CUES)
+        assert [cue.text for cue in cues_in_range(pipeline, 60000, 75000)] == ["line 12", "line 13", "line 14"]
+        # 62s falls inside line 12 (60-64s); 64.5s falls in the gap after it
+        assert cues_in_range(pipeline, 62000, 66000)[0].text == "line 12"
+        assert [cue.text for cue in cues_in_range(pipeline, 64500, 66000)] == ["line 13"]
+
+    def test_edges(self):
+        """Test ranges before, after and around the whole transcript."""
+        pipeline = TranscriptPipeline(CUES)
+        assert len(cues_in_range(pipeline, 0, 10 ** 9)) == 120
+        assert cues_in_range(pipeline, 700000, 800000) == []
+
+    def test_start_times_memoized(self):
+        """Test that start times are collected once per transcript."""
+        pipeline = TranscriptPipeline(CUES)
+        cues_in_range(pipeline, 0, 1000)
+        starts = pipeline.derive("start_times", lambda: None)
+        cues_in_range(pipeline, 5000, 9000)
+        assert pipeline.derive("start_times", lambda: None) is starts
+
+    def test_untimed_transcript(self):
+        """Test that transcripts without timestamps cannot be sliced."""
+        with pytest.raises(ValueError, match="no timestamps"):
+            cues_in_range(TranscriptPipeline([Cue(None, None, "text")]), 0, 1000)
+
+
+@pytest.fixture
+def cached_transcript(monkeypatch):
+    """Cache CUES for VIDEO_ID and fail the test if yt-dlp would run."""
+    import enhanced_server
+
+    async def no_extraction(*args, **kwargs):
+        raise AssertionError("transcript was extracted again")
+
+    monkeypatch.setattr(resources, '_transcript_cache', TranscriptCache(10))
+    monkeypatch.setattr(enhanced_server, 'extract_transcript_ytdlp', no_extraction)
+    resources.cache_transcript_lines(VIDEO_ID, {
+        'method': 'yt-dlp', 'success': True, 'language': "en", 'format': 'vtt',
+        'cues': CUES, 'lines': render_lines(CUES), 'line_count': len(CUES)
+    }, "en", "vtt", "standard")
+    return enhanced_server
+
+
+class TestSegmentTool:
+    """Test the enhanced server's segment tool and range resource."""
+
+    def test_tool_serves_cached_slice(self, cached_transcript):
+        """Test that the tool returns only the requested lines and the next slice."""
+        result = asyncio.run(cached_transcript.get_transcript_segment(URL, "1:00", "1:15"))
+        assert result.startswith(f"Transcript segment [01:00]-[01:15] of {URL} (3 of 120 lines)")
+        assert "[01:00] line 12\n[01:05] line 13\n[01:10] line 14" in result
+        assert "line 15" not in result
+        assert 'get_transcript_segment(video_url, "75", "90")' in result
+
+    def test_tool_reports_invalid_and_empty_ranges(self, cached_transcript):
+        """Test the messages for reversed, malformed and out-of-transcript ranges."""
+        assert asyncio.run(cached_transcript.get_transcript_segment(URL, "90", "60")).startswith("❌")
+        assert "Invalid time" in asyncio.run(cached_transcript.get_transcript_segment(URL, "soon", "60"))
+        assert "Invalid time" in asyncio.run(cached_transcript.get_transcript_segment(URL, "0", "inf"))
+        resource = asyncio.run(cached_transcript.get_transcript_range_resource(VIDEO_ID, "nan", "60"))
+        assert "Invalid time" in resource['error']
+        result = asyncio.run(cached_transcript.get_transcript_segment(URL, "20:00", "21:00"))
+        assert "no lines in this range (the transcript ends at [09:59])" in result
+
+    def test_range_resource(self, cached_transcript):
+        """Test the range resource through its URI template."""
+        async def read():
+            return await cached_transcript.mcp.read_resource(f"transcripts://{VIDEO_ID}/range/590-600")
+
+        contents = asyncio.run(read())
+        text = contents[0].content
+        assert '"[09:50] line 118"' in text
+        assert '"next_range": null' in text
+
+        segment = asyncio.run(cached_transcript.get_transcript_range_resource(VIDEO_ID, "0", "10"))
+        assert segment['lines'] == ["[00:00] line 0", "[00:05] line 1"]
+        assert segment['next_range'] == f"transcripts://{VIDEO_ID}/range/10-20"
+
+    def test_next_range_keeps_precision(self, cached_transcript):
+        """Test that the next-range hints of long transcripts are exact, not rounded to six digits."""
+        long_id = "LongVideo01"
+        cues = CUES + [Cue(2000000000, 2000004000, "much later")]
+        resources.cache_transcript_lines(long_id, {
+            'method': 'yt-dlp', 'success': True, 'language': "en", 'format': 'vtt',
+            'cues': cues, 'lines': render_lines(cues), 'line_count': len(cues)
+        }, "en", "vtt", "standard")
+
+        segment = asyncio.run(cached_transcript.get_transcript_range_resource(long_id, "1000000.5", "1000010.25"))
+        assert segment['next_range'] == f"transcripts://{long_id}/range/1000010.25-1000020"
+        result = asyncio.run(cached_transcript.get_transcript_segment(
+            f"https://www.youtube.com/watch?v={long_id}", "1000000", "2000000.5"))
+        assert 'get_transcript_segment(video_url, "2000000.5", "3000001")' in result
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test request coalescing for concurrent extractions
+"""
+
+import sys
+import os
+import asyncio
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.singleflight import SingleFlight
+from src.youtube_transcript_server import resources
+
+VTT_CONTENT = """WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+Hello world
+"""
+
+
+class TestSingleFlight:
+    """Test the single-flight primitive."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        """Test that callers with the same key await one task."""
+        flights = SingleFlight()
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return {"value": value}
+
+        results = await asyncio.gather(*(flights.run("vid", work, i) for i in range(5)))
+
+        assert calls == [0]
+        assert all(result is results[0] for result in results)
+        assert flights.stats() == {"in_flight": 0, "coalesced_requests": 4}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that distinct keys are not coalesced."""
+        flights = SingleFlight()
+
+        async def work(value):
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(flights.run("a", work, 1), flights.run("b", work, 2)) == [1, 2]
+        assert flights.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test that a failed extraction is reported to all waiters and not remembered."""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flights.run("vid", fail), flights.run("vid", fail), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        async def succeed():
+            return "ok"
+
+        assert await flights.run("vid", succeed) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that the shared task survives a cancelled waiter."""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(flights.run("vid", work))
+        second = asyncio.ensure_future(flights.run("vid", work))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+
+
+class TestCoalescedTools:
+    """Test that parallel tools for one URL trigger a single extraction."""
+
+    def setup_method(self):
+        resources.cached_transcripts.clear()
+        self._disk = resources.cached_transcripts.disk
+        resources.cached_transcripts.disk = None
+
+    def teardown_method(self):
+        resources.cached_transcripts.disk = self._disk
+
+    @pytest.mark.asyncio
+    async def test_parallel_analysis_tools(self):
+        """Test summary, quotes and study notes fired together."""
+        from enhanced_server import analyze_video_comprehensive, extract_key_quotes, create_study_notes
+
+        calls = []
+
+        async def fake_bundle(video_url, language="en", formats=None):
+            calls.append(video_url)
+            await asyncio.sleep(0.01)
+            return {
+                'info': {'title': 'Test Video'},
+                'subtitles': {'content': VTT_CONTENT, 'format': 'vtt', 'language': 'en', 'automatic': True},
+                'available_languages': ['en (auto)']
+            }
+
+        url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
+        with patch('enhanced_server.fetch_video_bundle', fake_bundle):
+            results = await asyncio.gather(
+                analyze_video_comprehensive(url),
+                extract_key_quotes(url, "greetings"),
+                create_study_notes(url)
+            )
+
+        assert len(calls) == 1
+        assert all("Hello world" in result for result in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
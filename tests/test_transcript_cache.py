@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Test the bounded LRU transcript cache
+"""
+
+import sys
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.youtube_transcript_server.cache import (
+    TranscriptCache, DiskCache, cache_key, rebuild_lines_result, split_lines_result
+)
+from src.youtube_transcript_server.cues import Cue, render_lines
+from src.youtube_transcript_server.search import transcript_index
+from src.youtube_transcript_server import resources
+
+VTT_CONTENT = """WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+Hello world
+
+00:00:04.000 --> 00:00:06.000
+Second line
+"""
+
+
+class TestTranscriptCache:
+    """Test LRU eviction and counters."""
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test eviction by entry count honours recent reads."""
+        cache = TranscriptCache(max_entries=2)
+        cache[cache_key("a")] = {"transcript": "A"}
+        cache[cache_key("b")] = {"transcript": "B"}
+
+        assert cache.lookup(cache_key("a")) is not None
+        cache[cache_key("c")] = {"transcript": "C"}
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.evictions == 1
+
+    def test_evicts_by_total_bytes(self):
+        """Test eviction when the byte budget is exceeded."""
+        cache = TranscriptCache(max_entries=10, max_bytes=2500)
+        cache["a"] = {"transcript": "A" * 1000}
+        cache["b"] = {"transcript": "B" * 1000}
+        cache["c"] = {"transcript": "C" * 1000}
+
+        assert list(cache) == [cache_key("b"), cache_key("c")]
+        assert cache.total_bytes == 2000
+
+    def test_oversized_entry_is_kept(self):
+        """Test that the newest entry survives even above the byte budget."""
+        cache = TranscriptCache(max_entries=10, max_bytes=100)
+        cache["a"] = {"transcript": "A" * 50}
+        cache["b"] = {"transcript": "B" * 500}
+
+        assert list(cache) == [cache_key("b")]
+
+    def test_variants_are_separate_entries(self):
+        """Test that language, format and dedup mode are part of the key."""
+        cache = TranscriptCache()
+        cache[cache_key("vid", "en", "best", "aggressive")] = {"transcript": "x"}
+        cache[cache_key("vid", "en", "plain_text", "aggressive")] = {"transcript": "y"}
+
+        assert len(cache) == 2
+        assert cache.find("vid")["transcript"] == "y"
+
+    def test_stats(self):
+        """Test hit, miss and size counters."""
+        cache = TranscriptCache()
+        cache["a"] = {"transcript": "abcd"}
+        cache.lookup("a")
+        cache.lookup("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["size_bytes"] == 4
+
+    def test_replacing_entry_updates_size(self):
+        """Test that overwriting a key doesn't leak byte accounting."""
+        cache = TranscriptCache()
+        cache["a"] = {"transcript": "A" * 10}
+        cache["a"] = {"transcript": "A" * 3}
+        del cache["a"]
+
+        assert cache.total_bytes == 0
+        assert len(cache) == 0
+
+
+def lines_entry(count=200):
+    """A cache entry as stored by ``cache_transcript_lines``."""
+    cues = [Cue(i * 1000, i * 1000 + 900, f"speaker {i} explains topic {i * 7}") for i in range(count)]
+    transcript, details = split_lines_result({'cues': cues, 'lines': render_lines(cues), 'format': 'vtt'})
+    return {"transcript": transcript, "result": details}
+
+
+class TestPipelineAccounting:
+    """Test that memoized pipelines count toward the byte budget."""
+
+    def test_pipeline_and_search_index_are_counted(self):
+        """Test that stages, the search index and its trigrams raise the cache size."""
+        cache = TranscriptCache()
+        entry = lines_entry()
+        cache["a"] = entry
+        payload = cache.total_bytes
+
+        pipeline = rebuild_lines_result(entry, cache)['pipeline']
+        assert cache.total_bytes == payload + pipeline.size_bytes > payload
+
+        sizes = [cache.total_bytes]
+        pipeline.stage("deduplicated")
+        sizes.append(cache.total_bytes)
+        index = transcript_index(pipeline)
+        sizes.append(cache.total_bytes)
+        assert "explains" in index.fuzzy_tokens("explanes")
+        sizes.append(cache.total_bytes)
+        assert sizes == sorted(set(sizes))
+
+    def test_pipeline_evicts_older_entries(self):
+        """Test that attaching a pipeline to an entry evicts older entries once over budget."""
+        cache = TranscriptCache(max_entries=10)
+        cache["a"] = lines_entry()
+        cache["b"] = lines_entry()
+        # Room for both payloads, but not for a pipeline on top
+        cache.max_bytes = cache.total_bytes + 1000
+
+        rebuild_lines_result(cache.lookup("b"), cache)
+        assert list(cache) == [cache_key("b")]
+        assert cache.evictions == 1
+
+    def test_search_index_evicts_older_entries(self):
+        """Test that building the search index and its trigrams keeps the cache within budget."""
+        cache = TranscriptCache(max_entries=10)
+        cache["a"] = lines_entry()
+        pipeline = rebuild_lines_result(cache.lookup("a"), cache)['pipeline']
+        cache["b"] = lines_entry()
+        cache.max_bytes = cache.total_bytes + 1000
+
+        # The entry in use stays; the least recently used one goes
+        index = transcript_index(pipeline)
+        assert list(cache) == [cache_key("a")]
+
+        cache.max_bytes = 10 ** 9
+        cache["b"] = lines_entry()
+        cache.max_bytes = cache.total_bytes + 1000
+        index.fuzzy_tokens("explanes")
+        assert list(cache) == [cache_key("a")]
+        assert cache.evictions == 2
+
+    def test_shared_pipeline_counted_once(self):
+        """Test that variants sharing a pipeline don't double its size."""
+        entry = lines_entry()
+        cache = TranscriptCache()
+        pipeline = rebuild_lines_result(entry)['pipeline']
+        cache["a"] = {"transcript": "x", "pipeline": pipeline}
+        cache["b"] = {"transcript": "y", "pipeline": pipeline}
+        assert cache.total_bytes == 2 + pipeline.size_bytes
+
+
+class TestDiskCache:
+    """Test the persistent SQLite cache layer."""
+
+    def test_survives_restart(self, tmp_path):
+        """Test that a fresh in-memory cache is warmed from disk."""
+        key = cache_key("vid", "en", "best", "aggressive")
+        entry = {"transcript": "[00:01] Hello", "result": {"format": "srv1", "quality_metrics": {"quality_score": 90}}}
+
+        first = TranscriptCache(disk=DiskCache(tmp_path / "cache.sqlite3"))
+        first.put(key, entry, persist=True)
+
+        restarted = TranscriptCache(disk=DiskCache(tmp_path / "cache.sqlite3"))
+        assert restarted.lookup(key) == entry
+        assert restarted.disk_hits == 1
+        assert key in restarted
+
+    def test_memory_only_entries_are_not_persisted(self, tmp_path):
+        """Test that plain dict writes stay in memory."""
+        disk = DiskCache(tmp_path / "cache.sqlite3")
+        cache = TranscriptCache(disk=disk)
+        cache["vid"] = {"transcript": "text"}
+
+        assert disk.get(cache_key("vid")) is None
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        """Test the TTL."""
+        disk = DiskCache(tmp_path / "cache.sqlite3", ttl_seconds=60)
+        key = cache_key("vid")
+        disk.put(key, {"transcript": "old"})
+
+        with patch("time.time", return_value=time.time() + 120):
+            assert disk.get(key) is None
+        assert disk.stats()["entries"] == 0
+
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """Test that the size cap drops the least recently read rows."""
+        disk = DiskCache(tmp_path / "cache.sqlite3", max_bytes=250)
+        disk.put(cache_key("a"), {"transcript": "A" * 100})
+        disk.put(cache_key("b"), {"transcript": "B" * 100})
+        disk.get(cache_key("a"))
+        disk.put(cache_key("c"), {"transcript": "C" * 100})
+
+        assert disk.get(cache_key("a")) is not None
+        assert disk.get(cache_key("b")) is None
+        assert disk.get(cache_key("c")) is not None
+
+    def test_stats_do_not_create_database(self, tmp_path):
+        """Test that status reporting doesn't create the cache file."""
+        disk = DiskCache(tmp_path / "cache.sqlite3")
+        assert disk.stats()["entries"] == 0
+        assert not (tmp_path / "cache.sqlite3").exists()
+
+
+class TestCacheServesReads:
+    """Test that tools skip extraction on cache hits."""
+
+    def setup_method(self):
+        resources.cached_transcripts.clear()
+        self._disk = resources.cached_transcripts.disk
+        resources.cached_transcripts.disk = None
+
+    def teardown_method(self):
+        resources.cached_transcripts.disk = self._disk
+
+    @pytest.mark.asyncio
+    async def test_repeated_transcript_request_hits_cache(self):
+        """Test that a repeated request doesn't run yt-dlp again."""
+        from enhanced_server import get_youtube_transcript
+
+        calls = []
+
+        async def fake_bundle(video_url, language="en", formats=None):
+            calls.append(video_url)
+            return {
+                'info': {'title': 'Test Video'},
+                'subtitles': {'content': VTT_CONTENT, 'format': 'vtt', 'language': 'en', 'automatic': True},
+                'available_languages': ['en (auto)']
+            }
+
+        url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
+        with patch('enhanced_server.fetch_video_bundle', fake_bundle):
+            first = await get_youtube_transcript(url)
+            second = await get_youtube_transcript(url)
+
+        assert len(calls) == 1
+        assert first == second
+        assert "[00:01] Hello world" in second
+        assert resources.cached_transcripts.stats()["hits"] >= 1
+
+        cached = await resources.get_cached_transcripts()
+        assert cached["cached_transcripts"][0]["video_id"] == "jNQXAC9IVRw"
+        assert cached["cached_transcripts"][0]["format"] == "vtt"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])